@@ -0,0 +1,111 @@
+import argparse
+import datetime as dt
+import random
+import time
+
+import wallet_watcher.core as core
+from wallet_watcher._types import Expense, ExpenseField
+from wallet_watcher.constants import FIELD_MAP
+from wallet_watcher.store import ExpenseStore
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent", "Travel", "General"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = generate_expenses(args.rows)
+    store = ExpenseStore.from_expenses(data)
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        core.filter_by_range(ExpenseField.DATE, dt.date(2020, 1, 1), None),
+        core.filter_by_range(ExpenseField.AMOUNT, 500, 8000),
+    )
+    legacy_strategy = legacy_combine_filters_all(
+        legacy_filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        legacy_filter_by_range(ExpenseField.DATE, dt.date(2020, 1, 1), dt.date.max),
+        legacy_filter_by_range(ExpenseField.AMOUNT, 500, 8000),
+    )
+    predicate = core.compile_filter(strategy)
+
+    cases = {
+        "legacy closures": lambda: [e for e in data if legacy_strategy(e)],
+        "closures": lambda: [e for e in data if strategy(e)],
+        "compiled predicate": lambda: [e for e in data if predicate(e)],
+        "store select_indices": lambda: core.select_indices(store, strategy),
+    }
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    for name, case in cases.items():
+        elapsed, matches = measure(case, args.repeat)
+        print(
+            f"{name:<22} {elapsed * 1e9 / args.rows:8.1f} ns/row"
+            f"  ({elapsed:.3f}s, {matches:,} matches)"
+        )
+
+
+def measure(case, repeat):
+    best = float("inf")
+    matches = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = len(case())
+        best = min(best, time.perf_counter() - start)
+
+    return best, matches
+
+
+def generate_expenses(rows):
+    rng = random.Random(0)
+    start = dt.date(2015, 1, 1).toordinal()
+
+    return [
+        Expense(
+            id,
+            dt.date.fromordinal(start + rng.randrange(3650)),
+            rng.choice(CATEGORIES),
+            "N/A",
+            rng.randrange(1, 20000),
+        )
+        for id in range(1, rows + 1)
+    ]
+
+
+def legacy_filter_by_matching(field, *values):
+    value_set = set(values)
+
+    def strategy(expense):
+        return getattr(expense, FIELD_MAP[field]) in value_set
+
+    return strategy
+
+
+def legacy_filter_by_range(field, start_value, end_value):
+    def minimum(expense):
+        return getattr(expense, FIELD_MAP[field]) >= start_value
+
+    def maximum(expense):
+        return getattr(expense, FIELD_MAP[field]) <= end_value
+
+    return legacy_combine_filters_all(minimum, maximum)
+
+
+def legacy_combine_filters_all(*filters):
+    def strategy(expense):
+        results = []
+        for filter_strategy in filters:
+            if not filter_strategy(expense):
+                results.append(False)
+            else:
+                results.append(True)
+
+        return all(results)
+
+    return strategy
+
+
+if __name__ == "__main__":
+    main()
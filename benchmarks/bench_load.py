@@ -0,0 +1,99 @@
+import argparse
+import csv
+import datetime as dt
+import os
+import random
+import tempfile
+import time
+from decimal import Decimal
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.storage as storage
+from wallet_watcher._types import Expense
+from wallet_watcher.constants import FIELD_NAMES
+from wallet_watcher.store import ExpenseStore
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent", "Travel", "General"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "finances.csv")
+        write_ledger(filepath, args.rows)
+
+        cases = {
+            "DictReader + strptime": lambda: legacy_load(filepath),
+            "DictReader + adapter": lambda: adapter.convert_csv_to_expenses(
+                storage.load_csv(filepath)
+            ),
+            "csv.reader -> Expense": lambda: list(
+                map(
+                    adapter.convert_csv_record_to_expense, storage.iter_fields(filepath)
+                )
+            ),
+            "csv.reader -> store": lambda: ExpenseStore.from_records(
+                storage.iter_fields(filepath)
+            ),
+        }
+
+        print(f"{args.rows:,} rows, best of {args.repeat}")
+        for name, case in cases.items():
+            elapsed, loaded = measure(case, args.repeat)
+            print(
+                f"{name:<24} {loaded / elapsed:12,.0f} rows/s"
+                f"  ({elapsed:.3f}s, {loaded:,} rows)"
+            )
+
+
+def measure(case, repeat):
+    best = float("inf")
+    loaded = 0
+    for _ in range(repeat):
+        adapter.parse_date.cache_clear()
+        adapter.parse_day.cache_clear()
+        start = time.perf_counter()
+        loaded = len(case())
+        best = min(best, time.perf_counter() - start)
+
+    return best, loaded
+
+
+def write_ledger(filepath, rows):
+    rng = random.Random(0)
+    start = dt.date(2015, 1, 1).toordinal()
+
+    with open(filepath, "w", newline="") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(FIELD_NAMES)
+        for id in range(1, rows + 1):
+            csv_writer.writerow(
+                [
+                    id,
+                    dt.date.fromordinal(start + rng.randrange(3650)).isoformat(),
+                    rng.choice(CATEGORIES),
+                    "N/A",
+                    f"{rng.randrange(1, 20000) / 100:.2f}",
+                ]
+            )
+
+
+def legacy_load(filepath):
+    return [
+        Expense(
+            int(row["id"]),
+            dt.datetime.strptime(row["date"], "%Y-%m-%d").date(),
+            row["category"],
+            row["description"],
+            Decimal(row["amount"]),
+        )
+        for row in storage.load_csv(filepath)
+    ]
+
+
+if __name__ == "__main__":
+    main()
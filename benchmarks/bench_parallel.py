@@ -0,0 +1,102 @@
+import argparse
+import csv
+import datetime as dt
+import os
+import random
+import tempfile
+import time
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.core as core
+import wallet_watcher.parallel as parallel
+import wallet_watcher.storage as storage
+from wallet_watcher._types import ExpenseField, SortKey
+from wallet_watcher.constants import FIELD_NAMES
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent", "Travel", "General"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare sequential and parallel CSV scans by worker count."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        core.filter_by_range(ExpenseField.AMOUNT, 500, 8000),
+    )
+    sort_key = SortKey(ExpenseField.AMOUNT, True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "finances.csv")
+        write_ledger(filepath, args.rows)
+
+        print(f"{args.rows:,} rows on {os.cpu_count()} cores, best of {args.repeat}")
+        baseline = measure(lambda: scan_sequential(filepath, strategy), args.repeat)
+        print(f"{'sequential':<12} {baseline:8.3f}s")
+
+        for workers in args.workers:
+            for name, keep in (("totals", 0), ("top 20", 20)):
+                elapsed = measure(
+                    lambda: parallel.scan_csv(
+                        filepath, strategy.spec, {}, sort_key, keep, workers
+                    ),
+                    args.repeat,
+                )
+                print(
+                    f"{workers:>2} workers  {name:<8} {elapsed:8.3f}s"
+                    f"  {baseline / elapsed:5.2f}x"
+                )
+
+
+def scan_sequential(filepath, strategy):
+    totals = core.create_totals()
+    expenses = map(adapter.convert_csv_record_to_expense, storage.iter_fields(filepath))
+    matched = filter(core.compile_filter(strategy), expenses)
+    for _ in core.accumulate_totals(matched, totals):
+        pass
+
+    return totals
+
+
+def measure(case, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        adapter.parse_date.cache_clear()
+        start = time.perf_counter()
+        case()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def write_ledger(filepath, rows):
+    rng = random.Random(0)
+    start = dt.date(2015, 1, 1).toordinal()
+
+    with open(filepath, "w", newline="") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(FIELD_NAMES)
+        for id in range(1, rows + 1):
+            csv_writer.writerow(
+                [
+                    id,
+                    dt.date.fromordinal(start + rng.randrange(3650)).isoformat(),
+                    rng.choice(CATEGORIES),
+                    "N/A",
+                    f"{rng.randrange(1, 20000) / 100:.2f}",
+                ]
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import datetime as dt
+import itertools
+import random
+import time
+from decimal import Decimal
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.core as core
+from wallet_watcher._types import Expense
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent", "Travel", "General"]
+CHUNK_ROWS = 100_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunk = generate_expenses(min(args.rows, CHUNK_ROWS))
+    legacy_chunk = [
+        Expense(
+            expense.id,
+            expense.date,
+            expense.category,
+            expense.description,
+            adapter.cents_to_decimal(expense.amount),
+        )
+        for expense in chunk
+    ]
+
+    cases = {
+        "Decimal amounts": lambda: legacy_calculate_total(
+            replay(legacy_chunk, args.rows)
+        ),
+        "integer cents": lambda: core.calculate_total(replay(chunk, args.rows)),
+    }
+
+    print(f"{args.rows:,} rows, best of {args.repeat}")
+    results = {}
+    for name, case in cases.items():
+        elapsed, results[name] = measure(case, args.repeat)
+        print(f"{name:<16} {elapsed * 1e9 / args.rows:8.1f} ns/row  ({elapsed:.3f}s)")
+
+    legacy_totals, totals = results.values()
+    assert legacy_totals["total"] == adapter.cents_to_decimal(totals["total"])
+    assert legacy_totals["category"] == {
+        category: adapter.cents_to_decimal(cents)
+        for category, cents in totals["category"].items()
+    }
+    print(f"identical totals: ${legacy_totals['total']:,}")
+
+
+def measure(case, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = case()
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+
+def replay(chunk, rows):
+    repeats, remainder = divmod(rows, len(chunk))
+    return itertools.chain(
+        itertools.chain.from_iterable(itertools.repeat(chunk, repeats)),
+        chunk[:remainder],
+    )
+
+
+def generate_expenses(rows):
+    rng = random.Random(0)
+    start = dt.date(2015, 1, 1).toordinal()
+
+    return [
+        Expense(
+            id,
+            dt.date.fromordinal(start + rng.randrange(3650)),
+            rng.choice(CATEGORIES),
+            "N/A",
+            rng.randrange(1, 20000),
+        )
+        for id in range(1, rows + 1)
+    ]
+
+
+def legacy_calculate_total(data):
+    totals = {"total": 0, "category": {}}
+
+    for expense in data:
+        totals["total"] += expense.amount
+        totals["category"][expense.category] = (
+            totals["category"].get(expense.category, Decimal(0)) + expense.amount
+        )
+
+    return totals
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import datetime as dt
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.daemon as daemon
+from wallet_watcher._types import Expense, ExpenseField
+from wallet_watcher.ledger import CsvLedger
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent", "Travel", "General"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Drive a wallet daemon with concurrent add and list clients."
+    )
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--add-ratio", type=float, default=0.5)
+    parser.add_argument(
+        "--socket", help="Use an already running daemon instead of starting one"
+    )
+    args = parser.parse_args()
+
+    if args.socket:
+        run_load(args.socket, args)
+        return
+
+    with tempfile.TemporaryDirectory() as data_home:
+        directory = os.path.join(data_home, const.APP_DIRECTORY_NAME)
+        os.makedirs(directory)
+        CsvLedger.create(
+            os.path.join(directory, const.USER_DATA_FILENAME),
+            generate_expenses(args.rows),
+        )
+
+        socket_path = os.path.join(directory, const.SOCKET_FILENAME)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "wallet_watcher.cli", "--plain", "serve"],
+            env={**os.environ, const.ENV_XDG_DATA_HOME: data_home},
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_daemon(socket_path)
+            run_load(socket_path, args)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def run_load(socket_path: str, args) -> None:
+    latencies = []
+    barrier = threading.Barrier(args.clients)
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(socket_path, args, seed, barrier, latencies),
+        )
+        for seed in range(args.clients)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    remote = daemon.connect(socket_path)
+    stats = remote.stats()
+    remote.close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.clients} clients x {args.requests} requests in {elapsed:.2f}s")
+    print(f"throughput       {total / elapsed:10,.0f} req/s")
+    print(f"client p50       {1000 * latencies[total // 2]:10.2f} ms")
+    print(f"client p99       {1000 * latencies[int(total * 0.99)]:10.2f} ms")
+    print(f"server batches   {stats['batches']:10,}")
+    for method, summary in sorted(stats["requests"].items()):
+        print(
+            f"  {method:<16} {summary['count']:8,} calls"
+            f"  p50 {summary['p50_ms']:7.2f} ms  p99 {summary['p99_ms']:7.2f} ms"
+        )
+
+
+def run_client(socket_path, args, seed, barrier, latencies) -> None:
+    rng = random.Random(seed)
+    remote = daemon.connect(socket_path)
+    timings = []
+    barrier.wait()
+
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        if rng.random() < args.add_ratio:
+            remote.add(
+                Expense(
+                    1,
+                    dt.date.today(),
+                    rng.choice(CATEGORIES),
+                    "Load",
+                    rng.randrange(1, 20000),
+                )
+            )
+        else:
+            remote.list_expenses(
+                core.filter_by_matching(ExpenseField.CATEGORY, rng.choice(CATEGORIES)),
+                ExpenseField.AMOUNT,
+                True,
+                20,
+            )
+        timings.append(time.perf_counter() - start)
+
+    remote.close()
+    latencies.extend(timings)
+
+
+def wait_for_daemon(socket_path: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while (remote := daemon.connect(socket_path)) is None:
+        if time.monotonic() > deadline:
+            raise TimeoutError("The wallet daemon did not start")
+        time.sleep(0.05)
+    remote.close()
+
+
+def generate_expenses(rows):
+    rng = random.Random(0)
+    start = dt.date(2015, 1, 1).toordinal()
+
+    return [
+        Expense(
+            id,
+            dt.date.fromordinal(start + rng.randrange(3650)),
+            rng.choice(CATEGORIES),
+            "N/A",
+            rng.randrange(1, 20000),
+        )
+        for id in range(1, rows + 1)
+    ]
+
+
+if __name__ == "__main__":
+    main()
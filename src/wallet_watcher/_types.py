@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal
-from typing import TypeAlias
+from typing import Any, Tuple, TypeAlias
 from collections.abc import Callable
 from enum import Enum
 
@@ -12,7 +11,7 @@ class Expense:
     date: date
     category: str
     description: str
-    amount: Decimal
+    amount: int
 
 
 class Comparator(Enum):
@@ -31,4 +30,33 @@ class ExpenseField(Enum):
     DESCRIPTION = 5
 
 
+class Period(Enum):
+    DAY = 1
+    WEEK = 2
+    MONTH = 3
+    YEAR = 4
+
+
+class FilterKind(Enum):
+    MATCHING = 1
+    COMPARISON = 2
+    ALL = 3
+    ANY = 4
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    kind: FilterKind
+    field: ExpenseField | None = None
+    comparator: Comparator | None = None
+    values: Tuple[Any, ...] = ()
+    children: Tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True)
+class SortKey:
+    field: ExpenseField
+    descending: bool = False
+
+
 FilterStrategy: TypeAlias = Callable[[Expense], bool]
@@ -1,18 +1,28 @@
 import datetime as dt
+from functools import cache
 from typing import Dict, List
-from decimal import Decimal
+from decimal import ROUND_HALF_EVEN, Decimal
 
 from wallet_watcher._types import Expense
 from wallet_watcher.constants import DATE_FORMAT_STRING
 
+CENT = Decimal(".01")
+
 
 def convert_csv_row_to_expense(row: Dict[str, str]) -> Expense:
     return Expense(
         int(row["id"]),
-        dt.datetime.strptime(row["date"], DATE_FORMAT_STRING).date(),
+        parse_date(row["date"]),
         row["category"],
         row["description"],
-        Decimal(row["amount"]),
+        parse_cents(row["amount"]),
+    )
+
+
+def convert_csv_record_to_expense(record: List[str]) -> Expense:
+    id, date, category, description, amount = record
+    return Expense(
+        int(id), parse_date(date), category, description, parse_cents(amount)
     )
 
 
@@ -27,16 +37,75 @@ def convert_csv_to_expenses(csv: List[Dict[str, str]]) -> List[Expense]:
 def convert_expense_to_csv_row(expense: Expense) -> Dict[str, str]:
     return {
         "id": str(expense.id),
-        "date": expense.date.strftime(DATE_FORMAT_STRING),
+        "date": expense.date.isoformat(),
         "category": expense.category,
         "description": expense.description,
-        "amount": f"{expense.amount:.2f}",
+        "amount": format_cents(expense.amount),
     }
 
 
+def convert_expense_to_csv_record(expense: Expense) -> List[str]:
+    return [
+        str(expense.id),
+        expense.date.isoformat(),
+        expense.category,
+        expense.description,
+        format_cents(expense.amount),
+    ]
+
+
 def convert_expenses_to_csv(expenses: List[Expense]) -> List[Dict[str, str]]:
     csv = []
     for expense in expenses:
         csv.append(convert_expense_to_csv_row(expense))
 
     return csv
+
+
+def decimal_to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(CENT, rounding=ROUND_HALF_EVEN).scaleb(2))
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents: int) -> str:
+    dollars, remainder = divmod(abs(cents), 100)
+    sign = "-" if cents < 0 else ""
+
+    return f"{sign}{dollars}.{remainder:02d}"
+
+
+@cache
+def parse_date(date: str) -> dt.date:
+    digits = date[:4] + date[5:7] + date[8:]
+    if (
+        len(date) == 10
+        and date[4] == "-"
+        and date[7] == "-"
+        and digits.isascii()
+        and digits.isdigit()
+    ):
+        try:
+            return dt.date(int(date[:4]), int(date[5:7]), int(date[8:]))
+        except ValueError:
+            pass
+
+    return dt.datetime.strptime(date, DATE_FORMAT_STRING).date()
+
+
+@cache
+def parse_day(date: str) -> int:
+    return parse_date(date).toordinal()
+
+
+def parse_cents(amount: str) -> int:
+    # Only the canonical "-?digits.dd" shape takes the integer fast path;
+    # anything else (whitespace, one decimal place, exponents) goes to Decimal.
+    if amount[-3:-2] == ".":
+        whole, fraction = amount[:-3], amount[-2:]
+        if fraction.isdecimal() and whole.removeprefix("-").isdecimal():
+            return int(whole + fraction)
+
+    return decimal_to_cents(Decimal(amount))
@@ -0,0 +1,158 @@
+import os
+import json
+from typing import Dict, Iterable, List, Set
+
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.storage as storage
+from wallet_watcher._types import (
+    Expense,
+    ExpenseField,
+    FilterKind,
+    FilterSpec,
+    Period,
+)
+
+AGGREGATES_VERSION = 2
+ROLLUP_PERIODS = {Period.MONTH, Period.YEAR}
+
+
+def get_aggregates_path(filepath: str) -> str:
+    return filepath + const.AGGREGATES_SUFFIX
+
+
+def create_aggregates() -> Dict:
+    return {"total": 0, "count": 0, "category": {}, "month": {}}
+
+
+def build_aggregates(expenses: Iterable[Expense]) -> Dict:
+    aggregates = create_aggregates()
+    apply_expenses(aggregates, expenses, 1)
+
+    return aggregates
+
+
+def apply_expenses(aggregates: Dict, expenses: Iterable[Expense], sign: int) -> None:
+    for expense in expenses:
+        cents = sign * expense.amount
+        month = core.get_period_key(expense.date, Period.MONTH)
+
+        aggregates["total"] += cents
+        aggregates["count"] += sign
+        _add_bucket(aggregates["category"], expense.category, cents, sign)
+
+        month_buckets = aggregates["month"].setdefault(month, {})
+        _add_bucket(month_buckets, expense.category, cents, sign)
+        if not month_buckets:
+            del aggregates["month"][month]
+
+
+def load_aggregates(filepath: str, signature: List) -> Dict | None:
+    try:
+        with open(get_aggregates_path(filepath), "r") as aggregates_file:
+            stored = json.load(aggregates_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(stored, dict) or stored.get("signature") != signature:
+        return None
+    if stored.get("version") != AGGREGATES_VERSION:
+        return None
+
+    return stored.get("aggregates")
+
+
+def write_aggregates(filepath: str, aggregates: Dict, signature: List) -> None:
+    aggregates_path = get_aggregates_path(filepath)
+    temp_path = storage.get_temp_path(aggregates_path)
+    with open(temp_path, "w") as aggregates_file:
+        json.dump(
+            {
+                "version": AGGREGATES_VERSION,
+                "signature": signature,
+                "aggregates": aggregates,
+            },
+            aggregates_file,
+        )
+    os.replace(temp_path, aggregates_path)
+
+
+def summarize(aggregates: Dict, categories: Set[str] | None = None) -> Dict:
+    if categories is None:
+        return {
+            "total": aggregates["total"],
+            "category": {
+                category: cents
+                for category, (cents, _) in aggregates["category"].items()
+            },
+            "count": aggregates["count"],
+        }
+
+    buckets = {
+        category: aggregates["category"][category]
+        for category in aggregates["category"]
+        if category in categories
+    }
+    return {
+        "total": sum(cents for cents, _ in buckets.values()),
+        "category": {category: cents for category, (cents, _) in buckets.items()},
+        "count": sum(count for _, count in buckets.values()),
+    }
+
+
+def rollup(
+    aggregates: Dict, period: Period, categories: Set[str] | None = None
+) -> Dict[str, Dict]:
+    groups: Dict[str, Dict] = {}
+    for month, buckets in aggregates["month"].items():
+        period_key = month if period == Period.MONTH else month[:4]
+        for category, (cents, count) in buckets.items():
+            if categories is not None and category not in categories:
+                continue
+
+            totals = groups.setdefault(period_key, core.create_totals())
+            totals["total"] += cents
+            totals["count"] += count
+            totals["category"][category] = totals["category"].get(category, 0) + cents
+
+    return groups
+
+
+def is_unfiltered(spec) -> bool:
+    return (
+        isinstance(spec, FilterSpec)
+        and spec.kind == FilterKind.ALL
+        and all(is_unfiltered(child) for child in spec.children)
+    )
+
+
+def find_matching_categories(spec) -> Set[str] | None:
+    if not isinstance(spec, FilterSpec):
+        return None
+
+    match spec.kind:
+        case FilterKind.MATCHING:
+            if spec.field == ExpenseField.CATEGORY:
+                return set(spec.values)
+        case FilterKind.ALL:
+            scopes = [
+                find_matching_categories(child)
+                for child in spec.children
+                if not is_unfiltered(child)
+            ]
+            if scopes and all(scope is not None for scope in scopes):
+                return set.intersection(*scopes)
+        case FilterKind.ANY:
+            scopes = [find_matching_categories(child) for child in spec.children]
+            if all(scope is not None for scope in scopes):
+                return set().union(*scopes)
+
+    return None
+
+
+def _add_bucket(buckets: Dict[str, List[int]], key: str, cents: int, sign: int):
+    bucket = buckets.setdefault(key, [0, 0])
+    bucket[0] += cents
+    bucket[1] += sign
+    if bucket[1] <= 0:
+        del buckets[key]
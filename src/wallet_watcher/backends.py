@@ -0,0 +1,69 @@
+import os
+import importlib
+from typing import Dict, Tuple, Type
+
+import wallet_watcher.constants as const
+import wallet_watcher.undo as undo
+from wallet_watcher.ledger import Ledger
+
+BACKENDS: Dict[str, Tuple[str, str]] = {
+    "csv": (const.USER_DATA_FILENAME, "wallet_watcher.ledger.CsvLedger"),
+    "binary": (const.BINARY_DATA_FILENAME, "wallet_watcher.binary.BinaryLedger"),
+    "sqlite": (const.SQLITE_DATA_FILENAME, "wallet_watcher.sqlite.SqliteLedger"),
+}
+
+
+def find_data_path(directory: str) -> str:
+    for filename, _ in BACKENDS.values():
+        filepath = os.path.join(directory, filename)
+        if os.path.exists(filepath):
+            return filepath
+
+    return os.path.join(directory, const.USER_DATA_FILENAME)
+
+
+def get_backend_name(filepath: str) -> str:
+    filename = os.path.basename(filepath)
+    for name, (backend_filename, _) in BACKENDS.items():
+        if filename == backend_filename:
+            return name
+
+    raise ValueError(f"Unknown ledger backend: {filepath}")
+
+
+def get_ledger_type(backend: str) -> Type[Ledger]:
+    _, qualified_name = BACKENDS[backend]
+    module_name, type_name = qualified_name.rsplit(".", 1)
+
+    return getattr(importlib.import_module(module_name), type_name)
+
+
+def open_ledger(filepath: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH) -> Ledger:
+    ledger_type = get_ledger_type(get_backend_name(filepath))
+    return ledger_type(filepath, undo_depth)
+
+
+def migrate_ledger(source: Ledger, backend: str) -> Ledger:
+    filename, _ = BACKENDS[backend]
+    ledger_type = get_ledger_type(backend)
+    target_path = os.path.join(os.path.dirname(source.filepath), filename)
+
+    with source.locked():
+        target = ledger_type.create(
+            target_path, source.iter_expenses(), source.next_id(), source.undo_depth
+        )
+        source.close()
+        source_undo_path = undo.get_undo_path(source.filepath)
+        if os.path.exists(source_undo_path):
+            os.replace(source_undo_path, undo.get_undo_path(target_path))
+        remove_ledger_files(source.filepath)
+
+    return target
+
+
+def remove_ledger_files(filepath: str) -> None:
+    for path in [filepath] + [filepath + suffix for suffix in const.LEDGER_SUFFIXES]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,435 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import datetime as dt
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.storage as storage
+from wallet_watcher._types import (
+    Expense,
+    ExpenseField,
+    FilterKind,
+    FilterSpec,
+    FilterStrategy,
+)
+from wallet_watcher.ledger import Ledger
+from wallet_watcher.store import ExpenseStore
+
+BINARY_HEADER = struct.Struct("<4sIqq")
+BINARY_MAGIC = b"WWB1"
+BINARY_RECORD = struct.Struct("<qqiIIB3x")
+RECORD_ID = struct.Struct("<q")
+STATUS_OFFSET = 28
+READ_CHUNK_RECORDS = 4096
+QUERY_CHUNK_RECORDS = 65536
+
+IDS_SORTED = 1
+LIVE = 0
+DELETED = 1
+
+
+class BinaryLedger(Ledger):
+    def __init__(
+        self, filepath: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+    ) -> None:
+        super().__init__(filepath, undo_depth)
+        self._strings: Tuple[List[str], List[str]] | None = None
+
+    @classmethod
+    def create(
+        cls,
+        filepath: str,
+        expenses: Iterable[Expense],
+        next_id: int = 1,
+        undo_depth: int = const.DEFAULT_UNDO_DEPTH,
+    ) -> "BinaryLedger":
+        write_binary(filepath, expenses, next_id)
+        return cls(filepath, undo_depth)
+
+    def iter_expenses(self) -> Iterator[Expense]:
+        for _, record in _iter_records(self.filepath):
+            if record[5] == LIVE:
+                yield self._to_expense(record)
+
+    def load_store(self) -> ExpenseStore:
+        store = self._create_store()
+        for chunk in _iter_chunks(self.filepath):
+            _append_live_records(store, chunk)
+
+        return store
+
+    def iter_query(self, filter_strategy: FilterStrategy) -> Iterator[Expense]:
+        spec = getattr(filter_strategy, "spec", None)
+        ids = _find_id_values(spec)
+        flags, _, _ = read_header(self.filepath)
+
+        if ids is None or not flags & IDS_SORTED:
+            return self._iter_matches(filter_strategy)
+
+        positions = self._find_positions(ids, LIVE)
+        expenses = [
+            self._to_expense(record)
+            for _, record in _read_positions(self.filepath, sorted(positions.values()))
+        ]
+        return filter(core.compile_filter(filter_strategy), expenses)
+
+    def count(self) -> int:
+        return read_header(self.filepath)[1]
+
+    def next_id(self) -> int:
+        return read_header(self.filepath)[2]
+
+    def _drop_caches(self) -> None:
+        self._strings = None
+
+    def _compact(self) -> None:
+        write_binary(self.filepath, self.load(), self.next_id())
+        self._strings = None
+
+    def _append_rows(self, rows: List[Dict[str, str]]) -> None:
+        if not rows:
+            return
+
+        flags, count, next_id = read_header(self.filepath)
+        records = self._encode_rows(rows)
+
+        with open(self.filepath, "r+b") as binary_file:
+            size = binary_file.seek(0, os.SEEK_END)
+            last_id = None
+            if size > BINARY_HEADER.size:
+                binary_file.seek(size - BINARY_RECORD.size)
+                last_id = RECORD_ID.unpack(binary_file.read(RECORD_ID.size))[0]
+                binary_file.seek(size)
+            for record in records:
+                if last_id is not None and record[0] <= last_id:
+                    flags &= ~IDS_SORTED
+                last_id = record[0]
+            binary_file.write(
+                b"".join(BINARY_RECORD.pack(*record) for record in records)
+            )
+
+            max_id = max(record[0] for record in records)
+            _write_header(
+                binary_file, flags, count + len(records), max(next_id, max_id + 1)
+            )
+
+    def _delete_rows(self, rows: List[Dict[str, str]]) -> None:
+        positions = self._find_positions([int(row["id"]) for row in rows], LIVE)
+        if not positions:
+            return
+
+        flags, count, next_id = read_header(self.filepath)
+        with open(self.filepath, "r+b") as binary_file:
+            for position in positions.values():
+                binary_file.seek(_get_record_offset(position) + STATUS_OFFSET)
+                binary_file.write(bytes([DELETED]))
+
+            _write_header(binary_file, flags, count - len(positions), next_id)
+
+    def _insert_rows(self, rows: List[Dict[str, str]]) -> None:
+        positions = self._find_positions([int(row["id"]) for row in rows], DELETED)
+        for row in rows:
+            position = positions.get(int(row["id"]))
+            if position is None:
+                self._append_rows([row])
+                continue
+
+            flags, count, next_id = read_header(self.filepath)
+            self._write_record(position, row)
+            with open(self.filepath, "r+b") as binary_file:
+                _write_header(binary_file, flags, count + 1, next_id)
+
+    def _save_edit(self, expense: Expense, changes: Dict) -> None:
+        position = self._find_positions([expense.id], LIVE).get(expense.id)
+        if position is not None:
+            self._write_record(position, adapter.convert_expense_to_csv_row(expense))
+
+    def _write_record(self, position: int, row: Dict[str, str]) -> None:
+        record = self._encode_rows([row])[0]
+        with open(self.filepath, "r+b") as binary_file:
+            binary_file.seek(_get_record_offset(position))
+            binary_file.write(BINARY_RECORD.pack(*record))
+
+    def _encode_rows(self, rows: List[Dict[str, str]]) -> List[Tuple]:
+        categories, descriptions = self._get_strings()
+        string_count = len(categories) + len(descriptions)
+        category_lookup = {category: code for code, category in enumerate(categories)}
+        description_lookup = {
+            description: code for code, description in enumerate(descriptions)
+        }
+        records = [
+            (
+                int(row["id"]),
+                adapter.parse_cents(row["amount"]),
+                adapter.parse_day(row["date"]),
+                _encode_string(categories, category_lookup, row["category"]),
+                _encode_string(descriptions, description_lookup, row["description"]),
+                LIVE,
+            )
+            for row in rows
+        ]
+        if len(categories) + len(descriptions) != string_count:
+            write_strings(self.filepath, categories, descriptions)
+
+        return records
+
+    def _create_store(self) -> ExpenseStore:
+        store = ExpenseStore()
+        categories, descriptions = self._get_strings()
+        for category in categories:
+            store.encode_category(category)
+        for description in descriptions:
+            store.encode_description(description)
+
+        return store
+
+    def _iter_matches(self, filter_strategy: FilterStrategy) -> Iterator[Expense]:
+        # Each chunk becomes a small store sharing the string tables, so the
+        # column filter runs without holding the whole ledger in memory.
+        strings = self._create_store()
+        for chunk in _iter_chunks(self.filepath, QUERY_CHUNK_RECORDS):
+            store = strings.take(())
+            _append_live_records(store, chunk)
+            for index in core.select_indices(store, filter_strategy):
+                yield store[index]
+
+    def _to_expense(self, record: Tuple) -> Expense:
+        categories, descriptions = self._get_strings()
+        id, cents, day, category_code, description_code, _ = record
+
+        return Expense(
+            id,
+            dt.date.fromordinal(day),
+            categories[category_code],
+            descriptions[description_code],
+            cents,
+        )
+
+    def _find_positions(self, ids: Iterable[int], status: int) -> Dict[int, int]:
+        wanted = set(ids)
+        positions: Dict[int, int] = {}
+        flags, _, _ = read_header(self.filepath)
+
+        if not flags & IDS_SORTED:
+            for position, record in _iter_records(self.filepath):
+                if record[0] in wanted and record[5] == status:
+                    positions[record[0]] = position
+            return positions
+
+        with open(self.filepath, "rb") as binary_file:
+            with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                record_ids = _RecordIds(view)
+                for id in wanted:
+                    position = bisect_left(record_ids, id)
+                    while position < len(record_ids) and record_ids[position] == id:
+                        offset = _get_record_offset(position)
+                        if view[offset + STATUS_OFFSET] == status:
+                            positions[id] = position
+                        position += 1
+
+        return positions
+
+    def _get_strings(self) -> Tuple[List[str], List[str]]:
+        if self._strings is None:
+            self._strings = read_strings(self.filepath)
+
+        return self._strings
+
+
+class _RecordIds:
+    def __init__(self, view: mmap.mmap) -> None:
+        self.view = view
+
+    def __len__(self) -> int:
+        return (len(self.view) - BINARY_HEADER.size) // BINARY_RECORD.size
+
+    def __getitem__(self, position: int) -> int:
+        return RECORD_ID.unpack_from(self.view, _get_record_offset(position))[0]
+
+
+def write_binary(filepath: str, expenses: Iterable[Expense], next_id: int = 1) -> int:
+    # Existing string codes keep their meaning, so the table written below
+    # still decodes the old data file if we stop before replacing it.
+    categories, descriptions = read_strings(filepath)
+    category_lookup = {category: code for code, category in enumerate(categories)}
+    description_lookup = {
+        description: code for code, description in enumerate(descriptions)
+    }
+    flags = IDS_SORTED
+    last_id = None
+    count = 0
+
+    temp_path = storage.get_temp_path(filepath)
+    with open(temp_path, "wb") as binary_file:
+        binary_file.write(BINARY_HEADER.pack(BINARY_MAGIC, 0, 0, 0))
+        for expense in expenses:
+            if last_id is not None and expense.id <= last_id:
+                flags &= ~IDS_SORTED
+            last_id = expense.id
+
+            binary_file.write(
+                BINARY_RECORD.pack(
+                    expense.id,
+                    expense.amount,
+                    expense.date.toordinal(),
+                    _encode_string(categories, category_lookup, expense.category),
+                    _encode_string(
+                        descriptions, description_lookup, expense.description
+                    ),
+                    LIVE,
+                )
+            )
+            next_id = max(next_id, expense.id + 1)
+            count += 1
+
+        _write_header(binary_file, flags, count, next_id)
+
+    write_strings(filepath, categories, descriptions)
+    os.replace(temp_path, filepath)
+
+    return count
+
+
+def read_header(filepath: str) -> Tuple[int, int, int]:
+    with open(filepath, "rb") as binary_file:
+        header = binary_file.read(BINARY_HEADER.size)
+
+    if len(header) != BINARY_HEADER.size:
+        raise ValueError(f"Not a wallet binary ledger: {filepath}")
+    magic, flags, count, next_id = BINARY_HEADER.unpack(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Not a wallet binary ledger: {filepath}")
+
+    return flags, count, next_id
+
+
+def get_strings_path(filepath: str) -> str:
+    return filepath + const.STRINGS_SUFFIX
+
+
+def read_strings(filepath: str) -> Tuple[List[str], List[str]]:
+    try:
+        with open(get_strings_path(filepath), "r") as strings_file:
+            strings = json.load(strings_file)
+    except (OSError, ValueError):
+        return [], []
+
+    return strings.get("categories", []), strings.get("descriptions", [])
+
+
+def write_strings(
+    filepath: str, categories: List[str], descriptions: List[str]
+) -> None:
+    strings_path = get_strings_path(filepath)
+    temp_path = storage.get_temp_path(strings_path)
+    with open(temp_path, "w") as strings_file:
+        json.dump(
+            {"categories": categories, "descriptions": descriptions}, strings_file
+        )
+    os.replace(temp_path, strings_path)
+
+
+def _write_header(binary_file, flags: int, count: int, next_id: int) -> None:
+    binary_file.seek(0)
+    binary_file.write(BINARY_HEADER.pack(BINARY_MAGIC, flags, count, next_id))
+
+
+def _iter_records(filepath: str) -> Iterator[Tuple[int, Tuple]]:
+    position = 0
+    for chunk in _iter_chunks(filepath):
+        yield from enumerate(BINARY_RECORD.iter_unpack(chunk), position)
+        position += len(chunk) // BINARY_RECORD.size
+
+
+def _iter_chunks(
+    filepath: str, chunk_records: int = READ_CHUNK_RECORDS
+) -> Iterator[bytes]:
+    with open(filepath, "rb") as binary_file:
+        size = os.fstat(binary_file.fileno()).st_size
+        record_count = (size - BINARY_HEADER.size) // BINARY_RECORD.size
+        if record_count <= 0:
+            return
+
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            for start in range(0, record_count, chunk_records):
+                end = min(start + chunk_records, record_count)
+                yield view[_get_record_offset(start) : _get_record_offset(end)]
+
+
+def _append_live_records(store: ExpenseStore, chunk: bytes) -> None:
+    statuses = chunk[STATUS_OFFSET :: BINARY_RECORD.size]
+    if DELETED in statuses or sys.byteorder != "little":
+        for (
+            id,
+            cents,
+            day,
+            category_code,
+            description_code,
+            status,
+        ) in BINARY_RECORD.iter_unpack(chunk):
+            if status == LIVE:
+                store.ids.append(id)
+                store.days.append(day)
+                store.cents.append(cents)
+                store.category_codes.append(category_code)
+                store.description_codes.append(description_code)
+        return
+
+    # Without tombstones every record is live, so each column is a strided
+    # copy of the chunk instead of a Python-level unpack per record.
+    words = memoryview(chunk).cast("q")
+    halves = memoryview(chunk).cast("I")
+    store.ids.frombytes(words[0::4].tobytes())
+    store.cents.frombytes(words[1::4].tobytes())
+    store.days.frombytes(halves[4::8].tobytes())
+    store.category_codes.frombytes(halves[5::8].tobytes())
+    store.description_codes.frombytes(halves[6::8].tobytes())
+
+
+def _read_positions(
+    filepath: str, positions: Iterable[int]
+) -> Iterator[Tuple[int, Tuple]]:
+    with open(filepath, "rb") as binary_file:
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            for position in positions:
+                yield position, BINARY_RECORD.unpack_from(
+                    view, _get_record_offset(position)
+                )
+
+
+def _get_record_offset(position: int) -> int:
+    return BINARY_HEADER.size + position * BINARY_RECORD.size
+
+
+def _encode_string(strings: List[str], lookup: Dict[str, int], value: str) -> int:
+    code = lookup.get(value)
+    if code is None:
+        code = lookup[value] = len(strings)
+        strings.append(value)
+
+    return code
+
+
+def _find_id_values(spec) -> Tuple | None:
+    if not isinstance(spec, FilterSpec):
+        return None
+
+    match spec.kind:
+        case FilterKind.MATCHING:
+            return spec.values if spec.field == ExpenseField.ID else None
+        case FilterKind.ALL:
+            for child in spec.children:
+                values = _find_id_values(child)
+                if values is not None:
+                    return values
+        case FilterKind.ANY:
+            if len(spec.children) == 1:
+                return _find_id_values(spec.children[0])
+
+    return None
@@ -1,25 +1,32 @@
 import os
 import sys
 import csv
+import json
+import time
 import argparse
+import itertools
+import contextlib
 import datetime as dt
 from decimal import Decimal
-from typing import List, Dict
-
-from rich.console import Console
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
 
+import wallet_watcher.adapter as adapter
+import wallet_watcher.backends as backends
 import wallet_watcher.constants as const
 import wallet_watcher.core as core
-import wallet_watcher.adapter as adapter
+import wallet_watcher.daemon as daemon
+import wallet_watcher.index as index
 import wallet_watcher.render as render
-from wallet_watcher._types import Expense, ExpenseField
+import wallet_watcher.undo as undo
+from wallet_watcher._types import Expense, ExpenseField, Period, SortKey
+from wallet_watcher.ledger import CsvLedger, Ledger
 
 
 def main() -> None:
     initialize_user_data()
     parser = initialize_parsers()
     parsed_args = parser.parse_args()
-    console = Console()
+    console = render.get_console(parsed_args.plain)
 
     if hasattr(parsed_args, "func"):
         parsed_args.func(parsed_args, console)
@@ -32,15 +39,38 @@ def main() -> None:
         console.print(
             "  [cyan]delete[/]    Remove expenses by ID, category, date, etc."
         )
-        console.print("  [cyan]edit[/]      Modify an existing expense\n")
+        console.print("  [cyan]edit[/]      Modify an existing expense")
+        console.print("  [cyan]import[/]    Add expenses in bulk from CSV or JSONL")
+        console.print("  [cyan]report[/]    Total expenses by day, week, month or year")
+        console.print("  [cyan]undo[/]      Revert recent adds, edits and deletions")
+        console.print(
+            "  [cyan]compact[/]   Fold pending edits and deletions into the ledger"
+        )
+        console.print(
+            "  [cyan]serve[/]     Keep the ledger in memory for fast commands"
+        )
+        console.print("  [cyan]index[/]     Rebuild or verify lookup indexes")
+        console.print(
+            "  [cyan]migrate[/]   Convert the ledger to another storage format\n"
+        )
         console.print("Run '[bold]wallet \\[command] --help[/]' for more info.")
 
 
 def initialize_parsers():
     parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--plain", action="store_true", help="Print plain text without colors or tables"
+    )
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument(
+        "--plain",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Print plain text without colors or tables",
+    )
     subparsers = parser.add_subparsers()
 
-    add_parser = subparsers.add_parser("add")
+    add_parser = subparsers.add_parser("add", parents=[output_parser])
     add_parser.set_defaults(func=handle_add)
     add_parser.add_argument(
         "amount", type=parse_amount, help="Amount in dollars (e.g. 25.99)"
@@ -67,7 +97,7 @@ def initialize_parsers():
         help="Expense description",
     )
 
-    delete_parser = subparsers.add_parser("delete")
+    delete_parser = subparsers.add_parser("delete", parents=[output_parser])
     delete_parser.set_defaults(func=handle_delete)
     delete_parser.add_argument(
         "-i",
@@ -124,7 +154,7 @@ def initialize_parsers():
         help="Delete by maximum amount range",
     )
 
-    edit_parser = subparsers.add_parser("edit")
+    edit_parser = subparsers.add_parser("edit", parents=[output_parser])
     edit_parser.set_defaults(func=handle_edit)
     edit_parser.add_argument(
         "-i", "--id", required=True, type=parse_id, help="ID of target expense"
@@ -150,7 +180,7 @@ def initialize_parsers():
         help="Modify description",
     )
 
-    list_parser = subparsers.add_parser("list")
+    list_parser = subparsers.add_parser("list", parents=[output_parser])
     list_parser.set_defaults(func=handle_list)
     list_parser.add_argument(
         "-i",
@@ -210,13 +240,119 @@ def initialize_parsers():
 
     list_parser.add_argument(
         "--sort-by",
-        choices=["date", "id", "amount"],
-        default="date",
-        help="Sort by date, id, or amount (default ascending)",
+        type=parse_sort_keys,
+        default=None,
+        help="Comma-separated fields to sort by: date, id, amount, category,"
+        " description; add :desc to reverse one (default date, ascending)",
     )
     list_parser.add_argument(
         "--desc", action="store_true", help="Sort in descending order"
     )
+    list_parser.add_argument(
+        "-n",
+        "--limit",
+        type=parse_positive_integer,
+        default=None,
+        help="Only show the first N entries after sorting",
+    )
+    position_group = list_parser.add_mutually_exclusive_group()
+    position_group.add_argument(
+        "--offset",
+        type=parse_non_negative_integer,
+        default=0,
+        help="Skip the first N entries after sorting",
+    )
+    position_group.add_argument(
+        "--page",
+        type=parse_positive_integer,
+        default=None,
+        help=f"Show page N of --limit entries (default {const.DEFAULT_PAGE_SIZE})",
+    )
+    list_parser.add_argument(
+        "--pager", action="store_true", help="Send the listing through $PAGER"
+    )
+    list_parser.add_argument(
+        "--summary", action="store_true", help="Show totals by category"
+    )
+    list_parser.add_argument(
+        "--format",
+        choices=["table"] + render.EXPORT_FORMATS,
+        default="table",
+        help="Write rows as csv, jsonl or tsv instead of a table"
+        " (ledger order unless --sort-by or --desc is given)",
+    )
+
+    import_parser = subparsers.add_parser("import", parents=[output_parser])
+    import_parser.set_defaults(func=handle_import)
+    import_parser.add_argument(
+        "file",
+        nargs="?",
+        default="-",
+        help="CSV or JSONL file to import (default '-' reads stdin)",
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default=None,
+        help="Input format (default from the file extension, csv for stdin)",
+    )
+
+    report_parser = subparsers.add_parser("report", parents=[output_parser])
+    report_parser.set_defaults(func=handle_report)
+    report_parser.add_argument(
+        "--by",
+        choices=["day", "week", "month", "year"],
+        default="month",
+        help="Period to group totals by (default month)",
+    )
+    report_parser.add_argument(
+        "-c",
+        "--category",
+        nargs="+",
+        action="extend",
+        type=parse_category,
+        default=None,
+        help="Only include one or more categories",
+    )
+    report_parser.add_argument(
+        "--min-date", type=parse_date, default=None, help="Filter by minimum date range"
+    )
+    report_parser.add_argument(
+        "--max-date", type=parse_date, default=None, help="Filter by maximum date range"
+    )
+
+    undo_parser = subparsers.add_parser("undo", parents=[output_parser])
+    undo_parser.set_defaults(func=handle_undo)
+    undo_parser.add_argument(
+        "-n",
+        "--steps",
+        type=parse_positive_integer,
+        default=1,
+        help="Number of operations to undo (default 1)",
+    )
+
+    compact_parser = subparsers.add_parser("compact", parents=[output_parser])
+    compact_parser.set_defaults(func=handle_compact)
+
+    serve_parser = subparsers.add_parser("serve", parents=[output_parser])
+    serve_parser.set_defaults(func=handle_serve)
+
+    index_parser = subparsers.add_parser("index", parents=[output_parser])
+    index_parser.set_defaults(func=handle_index)
+    index_parser.add_argument(
+        "action",
+        choices=["rebuild", "verify"],
+        help="Rebuild all indexes or verify them against the ledger",
+    )
+
+    migrate_parser = subparsers.add_parser("migrate", parents=[output_parser])
+    migrate_parser.set_defaults(func=handle_migrate)
+    migrate_parser.add_argument(
+        "--to",
+        required=True,
+        choices=list(backends.BACKENDS),
+        help="Storage format to convert the ledger to",
+    )
 
     return parser
 
@@ -260,13 +396,7 @@ def handle_delete(args, console):
     strategies = generate_strategy_list(args)
     combined_strategy = core.combine_filters_any(*strategies)
 
-    user_data_path = get_user_data_path()
-    original_data = adapter.convert_csv_to_expenses(load_csv(user_data_path))
-    modified_data, deleted_expenses = core.delete_expenses(
-        original_data, combined_strategy
-    )
-    modified_csv = adapter.convert_expenses_to_csv(modified_data)
-    save_csv(user_data_path, modified_csv)
+    deleted_expenses = get_ledger().delete(combined_strategy)
 
     num_deleted = len(deleted_expenses)
     deleted_amount = core.calculate_total(deleted_expenses)["total"]
@@ -281,8 +411,10 @@ def handle_delete(args, console):
     console.print()
     console.print(f"[bold red]🗑️ {num_deleted} expense(s) deleted successfully![/]")
     console.print()
-    console.print(render.render_table(deleted_expenses, title="Deleted Expenses"))
-    console.print(f"[bold white]Total Removed:[/] [bold red]${deleted_amount:.2f}[/]")
+    console.print(render.render_table(deleted_expenses, "Deleted Expenses", args.plain))
+    console.print(
+        f"[bold white]Total Removed:[/] [bold red]{render.format_amount(deleted_amount)}[/]"
+    )
     console.print()
 
 
@@ -290,45 +422,117 @@ def handle_list(args, console):
     strategies = generate_strategy_list(args)
     combined_strategy = core.combine_filters_all(*strategies)
 
-    key_map = {
-        "date": lambda x: x.date,
-        "amount": lambda x: x.amount,
-        "id": lambda x: x.id,
-    }
+    limit = args.limit
+    offset = args.offset
+    if args.page is not None:
+        limit = limit or const.DEFAULT_PAGE_SIZE
+        offset = (args.page - 1) * limit
+
+    sort_keys = args.sort_by
+    if sort_keys is None and (args.format == "table" or args.desc):
+        sort_keys = [SortKey(ExpenseField.DATE)]
+
+    if args.format != "table":
+        if sort_keys is None:
+            records = itertools.islice(
+                open_local_ledger().iter_query_records(combined_strategy),
+                offset,
+                None if limit is None else offset + limit,
+            )
+        else:
+            expenses, _ = get_ledger().list_expenses(
+                combined_strategy, sort_keys, args.desc, limit, offset
+            )
+            records = map(adapter.convert_expense_to_csv_record, expenses)
+        write_output(records, args.format)
+        return
 
-    user_data_path = get_user_data_path()
-    original_data = adapter.convert_csv_to_expenses(load_csv(user_data_path))
-    filtered_data = core.filter_expenses(original_data, combined_strategy)
+    ledger = get_ledger()
+    sorted_data, totals = ledger.list_expenses(
+        combined_strategy,
+        sort_field=sort_keys,
+        reverse=args.desc,
+        limit=limit,
+        offset=offset,
+    )
+    total_entries = ledger.count()
 
-    if not filtered_data:
+    if not sorted_data:
         console.print()
-        console.print("[bold yellow]⚠️ No expenses matched the given filters.[/]")
-        console.print(args)
+        if totals["count"]:
+            console.print(
+                f"[bold yellow]⚠️ Only {totals['count']} expenses matched;"
+                " nothing to show at this position.[/]"
+            )
+        else:
+            console.print("[bold yellow]⚠️ No expenses matched the given filters.[/]")
+            console.print(args)
         console.print()
         return
 
-    sorted_data = sorted(filtered_data, key=key_map[args.sort_by], reverse=args.desc)
-    expense_summary = core.calculate_total(sorted_data)
-    total_expenses = expense_summary["total"]
+    total_expenses = totals["total"]
 
-    console.print(render.render_table(sorted_data))
-    console.print(
-        f"[bold white]Filtered Total:[/] [bold green]${total_expenses:.2f}[/]"
-    )
-    console.print(
-        f"[bold white]Entries:[/] [bold yellow]{len(sorted_data)}/{len(original_data)}[/]"
-    )
-    console.print()
+    if args.pager:
+        output_context = render.open_pager(args.plain)
+    else:
+        output_context = contextlib.nullcontext(console)
+
+    with output_context as output:
+        render.print_expenses(output, sorted_data, plain=args.plain)
+        output.print(
+            f"[bold white]Filtered Total:[/] [bold green]{render.format_amount(total_expenses)}[/]"
+        )
+        output.print(
+            f"[bold white]Entries:[/] [bold yellow]{totals['count']}/{total_entries}[/]"
+        )
+        if len(sorted_data) < totals["count"]:
+            output.print(
+                get_position_message(
+                    offset, len(sorted_data), totals["count"], args.page, limit
+                )
+            )
+        output.print()
+
+        if args.summary:
+            category_totals = sorted(totals["category"].items())
+            output.print(render.render_category_summary(category_totals, args.plain))
+            output.print()
+
+
+def write_output(records: Iterable[List[str]], output_format: str) -> None:
+    try:
+        render.write_records(sys.stdout, records, output_format)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+def get_position_message(
+    offset: int, shown: int, matched: int, page: int | None, page_size: int | None
+) -> str:
+    if page is not None and page_size is not None:
+        pages = -(-matched // page_size)
+        return (
+            f"[dim]Showing entries {offset + 1}-{offset + shown} of {matched}"
+            f" (page {page} of {pages}).[/]"
+        )
+    if offset:
+        return f"[dim]Showing entries {offset + 1}-{offset + shown} of {matched}.[/]"
+
+    return f"[dim]Showing the first {shown} entries.[/]"
 
 
 def handle_add(args, console):
-    user_data_path = get_user_data_path()
-    original_data = adapter.convert_csv_to_expenses(load_csv(user_data_path))
+    ledger = get_ledger()
     new_expense: Expense = core.add_expense(
-        original_data, args.amount, args.description, args.date, args.category
+        [],
+        args.amount,
+        args.description,
+        args.date,
+        args.category,
     )
-    new_csv_row: Dict[str, str] = adapter.convert_expense_to_csv_row(new_expense)
-    append_csv(user_data_path, new_csv_row)
+    new_expense = ledger.add(new_expense, assign_ids=True)
 
     console.print()
     console.print("[bold green]✅ Expense Added![/]")
@@ -337,26 +541,21 @@ def handle_add(args, console):
     console.print(f"[bold white]Category:[/]    [cyan]{new_expense.category}[/]")
     console.print(f"[bold white]Description:[/] {new_expense.description}")
     console.print(
-        f"[bold white]Amount:[/]      [bold green]${new_expense.amount:.2f}[/]"
+        f"[bold white]Amount:[/]      "
+        f"[bold green]{render.format_amount(new_expense.amount)}[/]"
     )
     console.print()
 
 
 def handle_edit(args, console):
-    user_data_path = get_user_data_path()
-    original_data = adapter.convert_csv_to_expenses(load_csv(user_data_path))
-
     try:
-        modified_data, changes = core.modify_expense(
-            original_data,
-            id=args.id,
+        changes = get_ledger().update(
+            args.id,
             new_amount=args.amount if args.amount else None,
             new_date=args.date if args.date else None,
             new_category=args.category if args.category else None,
             new_description=args.description if args.description else None,
         )
-        modified_csv = adapter.convert_expenses_to_csv(modified_data)
-        save_csv(user_data_path, modified_csv)
     except ValueError:
         console.print()
         console.print(f"[bold red]⚠️ No expenses found for id: [cyan]{args.id}[/][/]")
@@ -379,8 +578,8 @@ def handle_edit(args, console):
         style_new = "bold green" if field == "amount" else "bold cyan"
 
         if field == "amount":
-            old = f"${old}" if not str(old).startswith("$") else old
-            new = f"${new}" if not str(new).startswith("$") else new
+            old = render.format_amount(old)
+            new = render.format_amount(new)
 
         console.print(
             f"  [bold]{field.capitalize()}:[/] [{style_old}]{old}[/] ➜ [{style_new}]{new}[/]"
@@ -388,20 +587,241 @@ def handle_edit(args, console):
     console.print()
 
 
-def parse_amount(amount: str) -> Decimal:
-    parsed_amount: Decimal = Decimal("0")
+def handle_import(args, console):
+    input_format = args.format or get_import_format(args.file)
+    ledger = get_ledger()
+
+    start = time.perf_counter()
+    try:
+        with open_import_file(args.file) as import_file:
+            expenses = parse_import_records(
+                iter_import_records(import_file, input_format)
+            )
+    except (OSError, ValueError) as error:
+        console.print()
+        console.print(f"[bold red]⚠️ Import failed:[/] {error}")
+        console.print("[dim]Nothing was imported.[/]")
+        console.print()
+        return
+
+    imported = ledger.add_many(expenses, assign_ids=True)
+    elapsed = time.perf_counter() - start
+
+    console.print()
+    console.print(f"[bold green]✅ Imported {imported} expense(s)[/]")
+    console.print(
+        f"[bold white]Elapsed:[/] {elapsed:.3f}s "
+        f"([bold yellow]{imported / max(elapsed, 1e-9):,.0f}[/] rows/s)"
+    )
+    console.print()
+
+
+def handle_report(args, console):
+    periods = {
+        "day": Period.DAY,
+        "week": Period.WEEK,
+        "month": Period.MONTH,
+        "year": Period.YEAR,
+    }
+
+    strategies = []
+    if args.category is not None:
+        strategies.append(
+            core.filter_by_matching(ExpenseField.CATEGORY, *args.category)
+        )
+    if args.min_date is not None or args.max_date is not None:
+        strategies.append(
+            core.filter_by_range(ExpenseField.DATE, args.min_date, args.max_date)
+        )
+
+    report = get_ledger().report(
+        core.combine_filters_all(*strategies), periods[args.by]
+    )
+
+    if not report:
+        console.print()
+        console.print("[bold yellow]⚠️ No expenses matched the given filters.[/]")
+        console.print()
+        return
+
+    total_expenses = sum(totals["total"] for totals in report.values())
+
+    console.print(
+        render.render_period_report(report, f"Totals by {args.by}", args.plain)
+    )
+    console.print(
+        f"[bold white]Total:[/] [bold green]{render.format_amount(total_expenses)}[/]"
+    )
+    console.print()
+
+
+def handle_undo(args, console):
+    ledger = get_ledger()
+    titles = {
+        undo.ADD: "Removed Expenses",
+        undo.DELETE: "Restored Expenses",
+        undo.EDIT: "Reverted Expenses",
+    }
+
+    console.print()
+    for step in range(args.steps):
+        undone = ledger.undo()
+        if undone is None:
+            if not step:
+                console.print("[bold yellow]⚠️ Nothing to undo.[/]")
+                console.print()
+            return
+
+        operation, expenses = undone
+        console.print(f"[bold green]↩️ Undid {operation}[/]")
+        if expenses:
+            console.print(render.render_table(expenses, titles[operation], args.plain))
+        else:
+            console.print()
+
+
+def handle_compact(args, console):
+    ledger = get_ledger()
+    ledger.compact()
+
+    console.print()
+    console.print(f"[bold green]✅ Ledger compacted[/] ({ledger.count()} entries)")
+    console.print()
+
+
+def handle_serve(args, console):
+    import wallet_watcher.server as server
+
+    socket_path = get_socket_path()
+    console.print()
+    console.print(f"[bold green]🛰️ Serving ledger on[/] {socket_path}")
+    console.print(
+        "[dim]Other wallet commands now use this process. Ctrl-C stops it.[/]"
+    )
+    try:
+        server.serve(os.path.dirname(socket_path), socket_path, get_undo_depth())
+    except OSError as error:
+        console.print(f"[bold red]⚠️ {error}[/]")
+    except KeyboardInterrupt:
+        console.print("[bold white]Daemon stopped.[/]")
+    else:
+        console.print("[bold white]Daemon stopped.[/]")
+    console.print()
+
+
+def handle_index(args, console):
+    user_data_path = get_user_data_path()
+
+    console.print()
+    if not isinstance(open_local_ledger(), CsvLedger):
+        console.print("[bold yellow]⚠️ Indexes are only used by the csv format.[/]")
+    elif args.action == "rebuild":
+        for name, index_type in index.INDEX_TYPES.items():
+            entries = len(index.build_index(user_data_path, index_type))
+            console.print(f"[bold green]✅ Rebuilt {name} index[/] ({entries} entries)")
+    else:
+        for name, index_type in index.INDEX_TYPES.items():
+            status = index.verify_index(user_data_path, index_type)
+            style = "bold green" if status == "ok" else "bold yellow"
+            console.print(f"[bold white]{name.capitalize()}:[/] [{style}]{status}[/]")
+    console.print()
+
+
+def handle_migrate(args, console):
+    ledger = open_local_ledger()
+    source_backend = backends.get_backend_name(ledger.filepath)
+
+    console.print()
+    if source_backend == args.to:
+        console.print(f"[bold yellow]⚠️ Ledger is already stored as {args.to}.[/]")
+        console.print()
+        return
+
+    migrated_ledger = backends.migrate_ledger(ledger, args.to)
+    console.print(
+        f"[bold green]✅ Migrated ledger from {source_backend} to {args.to}[/]"
+        f" ({migrated_ledger.count()} entries)"
+    )
+    console.print(f"[dim]{migrated_ledger.filepath}[/]")
+    console.print()
+
+
+def get_import_format(filepath: str) -> str:
+    if os.path.splitext(filepath)[1].lower() in (".jsonl", ".ndjson"):
+        return "jsonl"
+
+    return "csv"
+
+
+def open_import_file(filepath: str):
+    if filepath == "-":
+        return contextlib.nullcontext(sys.stdin)
+
+    return open(filepath, "r", newline="")
+
+
+def iter_import_records(
+    import_file: TextIO, input_format: str
+) -> Iterator[Tuple[int, Dict]]:
+    if input_format == "csv":
+        csv_reader = csv.DictReader(import_file)
+        for record in csv_reader:
+            yield csv_reader.line_num, record
+        return
+
+    for line_number, line in enumerate(import_file, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f"line {line_number}: not valid JSON")
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        yield line_number, record
+
+
+def parse_import_records(records: Iterator[Tuple[int, Dict]]) -> List[Expense]:
+    expenses = []
+    for line_number, record in records:
+        try:
+            expenses.append(parse_import_record(record))
+        except (argparse.ArgumentTypeError, ValueError) as error:
+            raise ValueError(f"line {line_number}: {error}")
+
+    return expenses
+
+
+def parse_import_record(record: Dict) -> Expense:
+    amount = record.get("amount")
+    if amount is None or amount == "":
+        raise ValueError("missing amount")
+
+    date = record.get("date")
+    category = record.get("category")
+    description = record.get("description")
+
+    return core.add_expense(
+        [],
+        parse_amount(str(amount)),
+        parse_description(str(description)) if description else None,
+        parse_date(str(date)) if date else None,
+        parse_category(str(category)) if category else None,
+        id=0,
+    )
+
+
+def parse_amount(amount: str) -> int:
     try:
-        parsed_amount = Decimal(amount)
+        return adapter.decimal_to_cents(Decimal(amount))
     except Exception:
         raise argparse.ArgumentTypeError(f"'{amount}' is not a valid amount.")
 
-    return parsed_amount
-
 
 def parse_date(date: str) -> dt.date:
     parsed_date = dt.datetime.now()
     try:
-        parsed_date = dt.datetime.strptime(date, const.DATE_FORMAT_STRING).date()
+        parsed_date = adapter.parse_date(date)
     except Exception:
         raise argparse.ArgumentTypeError(
             f"'{date}' is not a valid date (Use YYYY-MM-DD)."
@@ -420,6 +840,49 @@ def parse_id(id: str) -> int:
     return parsed_id
 
 
+def parse_positive_integer(value: str) -> int:
+    parsed_value = 0
+    try:
+        parsed_value = int(value)
+    except Exception:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a valid number.")
+
+    if parsed_value < 1:
+        raise argparse.ArgumentTypeError(f"'{value}' must be at least 1.")
+
+    return parsed_value
+
+
+def parse_non_negative_integer(value: str) -> int:
+    try:
+        parsed_value = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a valid number.")
+
+    if parsed_value < 0:
+        raise argparse.ArgumentTypeError(f"'{value}' must not be negative.")
+
+    return parsed_value
+
+
+def parse_sort_keys(value: str) -> List[SortKey]:
+    fields = {name: field for field, name in const.FIELD_MAP.items()}
+    sort_keys = []
+    for item in value.split(","):
+        name, _, direction = item.strip().lower().partition(":")
+        if name not in fields:
+            raise argparse.ArgumentTypeError(
+                f"'{name}' is not a sortable field. Use one of: {', '.join(fields)}."
+            )
+        if direction not in ("", "asc", "desc"):
+            raise argparse.ArgumentTypeError(
+                f"'{direction}' is not a sort direction. Use asc or desc."
+            )
+        sort_keys.append(SortKey(fields[name], direction == "desc"))
+
+    return sort_keys
+
+
 def parse_category(category: str) -> str:
     if len(category) > 20:
         raise argparse.ArgumentTypeError(
@@ -438,8 +901,33 @@ def parse_description(description: str) -> str:
     return description
 
 
+def get_ledger() -> Ledger | daemon.RemoteLedger:
+    remote_ledger = daemon.connect(get_socket_path())
+    if remote_ledger is not None:
+        return remote_ledger
+
+    return open_local_ledger()
+
+
+def open_local_ledger() -> Ledger:
+    return backends.open_ledger(get_user_data_path(), undo_depth=get_undo_depth())
+
+
+def get_socket_path() -> str:
+    app_data_dir_path = os.path.join(get_os_data_path(), const.APP_DIRECTORY_NAME)
+    return os.path.join(app_data_dir_path, const.SOCKET_FILENAME)
+
+
+def get_undo_depth() -> int:
+    try:
+        return int(os.environ.get(const.ENV_UNDO_DEPTH, const.DEFAULT_UNDO_DEPTH))
+    except ValueError:
+        return const.DEFAULT_UNDO_DEPTH
+
+
 def get_user_data_path() -> str:
-    return os.path.join(get_os_data_path(), "wallet-watcher/finances.csv")
+    app_data_dir_path = os.path.join(get_os_data_path(), const.APP_DIRECTORY_NAME)
+    return backends.find_data_path(app_data_dir_path)
 
 
 def get_os_data_path() -> str:
@@ -462,30 +950,12 @@ def initialize_user_data() -> None:
     app_data_dir_path = os.path.join(get_os_data_path(), const.APP_DIRECTORY_NAME)
     os.makedirs(app_data_dir_path, mode=0o700, exist_ok=True)
 
-    user_data_path = os.path.join(app_data_dir_path, const.USER_DATA_FILENAME)
+    user_data_path = get_user_data_path()
     if not os.path.exists(user_data_path):
         with open(user_data_path, "w", newline="") as csvfile:
             csv_writer: csv.DictWriter = csv.DictWriter(csvfile, const.FIELD_NAMES)
             csv_writer.writeheader()
 
 
-def load_csv(filepath: str) -> List[Dict[str, str]]:
-    with open(filepath, "r", newline="") as csvfile:
-        return list(csv.DictReader(csvfile))
-
-
-def save_csv(filepath: str, data: List[Dict[str, str]]) -> None:
-    with open(filepath, "w", newline="") as csvfile:
-        csv_writer: csv.DictWriter = csv.DictWriter(csvfile, const.FIELD_NAMES)
-        csv_writer.writeheader()
-        csv_writer.writerows(data)
-
-
-def append_csv(filepath: str, data: Dict[str, str]) -> None:
-    with open(filepath, "a", newline="") as csvfile:
-        csv_writer: csv.DictWriter = csv.DictWriter(csvfile, const.FIELD_NAMES)
-        csv_writer.writerow(data)
-
-
 if __name__ == "__main__":
     main()
@@ -1,4 +1,6 @@
-from wallet_watcher._types import ExpenseField
+import operator
+
+from wallet_watcher._types import Comparator, ExpenseField
 
 FIELD_NAMES = ["id", "date", "category", "description", "amount"]
 
@@ -10,12 +12,39 @@ FIELD_MAP = {
     ExpenseField.DESCRIPTION: "description",
 }
 
+STORE_COLUMN_MAP = {
+    ExpenseField.AMOUNT: "cents",
+    ExpenseField.ID: "ids",
+    ExpenseField.CATEGORY: "category_codes",
+    ExpenseField.DATE: "days",
+    ExpenseField.DESCRIPTION: "description_codes",
+}
+
+COMPARATOR_OPERATORS = {
+    Comparator.LESS_THAN: operator.lt,
+    Comparator.LESS_THAN_EQUAL: operator.le,
+    Comparator.GREATER_THAN: operator.gt,
+    Comparator.GREATER_THAN_EQUAL: operator.ge,
+    Comparator.EQUAL: operator.eq,
+}
+
+COMPARATOR_SYMBOLS = {
+    Comparator.LESS_THAN: "<",
+    Comparator.LESS_THAN_EQUAL: "<=",
+    Comparator.GREATER_THAN: ">",
+    Comparator.GREATER_THAN_EQUAL: ">=",
+    Comparator.EQUAL: "==",
+}
+
 LINUX = "linux"
 MACOS = "darwin"
 WINDOWS = "win32"
 
 ENV_XDG_DATA_HOME = "XDG_DATA_HOME"
 ENV_LOCAL_APPDATA = "LOCALAPPDATA"
+ENV_UNDO_DEPTH = "WALLET_UNDO_DEPTH"
+ENV_NO_DAEMON = "WALLET_NO_DAEMON"
+ENV_WORKERS = "WALLET_WORKERS"
 
 LINUX_APPDATA_PATH = "~/.local/share"
 MACOS_APPDATA_PATH = "~/Library/Application Support"
@@ -23,6 +52,50 @@ WINDOWS_APPDATA_PATH = "~/AppData/Local"
 
 APP_DIRECTORY_NAME = "wallet-watcher/"
 USER_DATA_FILENAME = "finances.csv"
+BINARY_DATA_FILENAME = "finances.bin"
+SQLITE_DATA_FILENAME = "finances.db"
+SOCKET_FILENAME = "wallet.sock"
+LOCK_FILENAME = "wallet.lock"
+METADATA_SUFFIX = ".meta"
+DATE_INDEX_SUFFIX = ".dates"
+ID_INDEX_SUFFIX = ".ids"
+CATEGORY_INDEX_SUFFIX = ".categories"
+JOURNAL_SUFFIX = ".journal"
+UNDO_SUFFIX = ".undo"
+STRINGS_SUFFIX = ".strings"
+AGGREGATES_SUFFIX = ".totals"
+LEDGER_SUFFIXES = [
+    METADATA_SUFFIX,
+    DATE_INDEX_SUFFIX,
+    ID_INDEX_SUFFIX,
+    CATEGORY_INDEX_SUFFIX,
+    JOURNAL_SUFFIX,
+    STRINGS_SUFFIX,
+    AGGREGATES_SUFFIX,
+]
+
+METADATA_FIELDS = ["next_id", "generation", "epoch", "count", "signature"]
+JOURNAL_HEADER = "#epoch"
+COMPACTION_MIN_JOURNAL_BYTES = 64 * 1024
+COMPACTION_JOURNAL_RATIO = 0.25
+INDEX_MIN_TAIL_ENTRIES = 4096
+INDEX_TAIL_RATIO = 64
+DEFAULT_UNDO_DEPTH = 20
+SQL_MAX_MATCHING_VALUES = 500
+DAEMON_TIMEOUT_SECONDS = 30.0
+LOCK_RETRY_SECONDS = 0.01
+RENDER_SAMPLE_ROWS = 1000
+RENDER_CHUNK_ROWS = 1000
+DEFAULT_PAGE_SIZE = 50
+SORT_MIN_RUN_LENGTH = 32
+APPEND_ORDER_FIELDS = {ExpenseField.DATE, ExpenseField.ID}
+DEFAULT_PAGER = "less"
+DEFAULT_LESS_OPTIONS = "FRX"
+DAEMON_MAX_PENDING = 1024
+DAEMON_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+DAEMON_LATENCY_SAMPLES = 10_000
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+PARALLEL_CHUNKS_PER_WORKER = 4
 
 DATE_FORMAT_STRING = "%Y-%m-%d"
 
@@ -1,21 +1,56 @@
 import copy
+import math
+import heapq
+import operator
+import itertools
 import datetime as dt
-from typing import List, Union, Tuple, Dict
-from decimal import ROUND_HALF_EVEN, Decimal
-
-from wallet_watcher._types import Expense, FilterStrategy, Comparator, ExpenseField
-from wallet_watcher.constants import DEFAULT_CATEGORY, DEFAULT_DESCRIPTION, FIELD_MAP
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Union,
+    Tuple,
+    Dict,
+    TypeAlias,
+)
+
+from wallet_watcher._types import (
+    Expense,
+    FilterKind,
+    FilterSpec,
+    FilterStrategy,
+    Comparator,
+    ExpenseField,
+    Period,
+    SortKey,
+)
+from wallet_watcher.constants import (
+    COMPARATOR_OPERATORS,
+    COMPARATOR_SYMBOLS,
+    DEFAULT_CATEGORY,
+    DEFAULT_DESCRIPTION,
+    FIELD_MAP,
+    SORT_MIN_RUN_LENGTH,
+    STORE_COLUMN_MAP,
+)
+from wallet_watcher.store import ExpenseStore
+
+Expenses: TypeAlias = Union[List[Expense], ExpenseStore]
 
 
 def add_expense(
-    data: List[Expense],
-    expense_amount: Decimal,
+    data: Expenses,
+    expense_amount: int,
     description: str | None = None,
     date: dt.date | None = None,
     category: str | None = None,
+    id: int | None = None,
 ) -> Expense:
-    expense_amount = expense_amount.quantize(Decimal(".01"), rounding=ROUND_HALF_EVEN)
-    if expense_amount < Decimal("0.01"):
+    if expense_amount < 1:
         raise ValueError("Amount must be greater than 0.01")
 
     if not date:
@@ -24,19 +59,32 @@ def add_expense(
         category = DEFAULT_CATEGORY
     if not description:
         description = DEFAULT_DESCRIPTION
-    id = _get_next_id(data)
+    if id is None:
+        id = _get_next_id(data)
 
     return Expense(id, date, category, description, expense_amount)
 
 
 def delete_expenses(
-    data: List[Expense], filter_strategy: FilterStrategy
-) -> Tuple[List[Expense], List[Expense]]:
+    data: Expenses, filter_strategy: FilterStrategy
+) -> Tuple[Expenses, Expenses]:
+    if isinstance(data, ExpenseStore):
+        deleted_indices = select_indices(data, filter_strategy)
+        deleted_mask = bytearray(len(data))
+        for index in deleted_indices:
+            deleted_mask[index] = 1
+        kept_indices = [
+            index for index, deleted in enumerate(deleted_mask) if not deleted
+        ]
+
+        return data.take(kept_indices), data.take(deleted_indices)
+
+    predicate = compile_filter(filter_strategy)
     modified_data = []
     deleted_data = []
 
     for expense in data:
-        if not filter_strategy(expense):
+        if not predicate(expense):
             modified_data.append(expense)
         else:
             deleted_data.append(expense)
@@ -44,51 +92,198 @@ def delete_expenses(
     return modified_data, deleted_data
 
 
-def filter_expenses(
-    data: List[Expense], filter_strategy: FilterStrategy
+def filter_expenses(data: Expenses, filter_strategy: FilterStrategy) -> Expenses:
+    if isinstance(data, ExpenseStore):
+        return data.take(select_indices(data, filter_strategy))
+
+    predicate = compile_filter(filter_strategy)
+    return [expense for expense in data if predicate(expense)]
+
+
+def iter_filtered_expenses(
+    data: Iterable[Expense], filter_strategy: FilterStrategy
+) -> Iterator[Expense]:
+    return filter(compile_filter(filter_strategy), data)
+
+
+def sort_expenses(
+    data: Iterable[Expense],
+    key: Callable[[Expense], Any],
+    reverse: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
 ) -> List[Expense]:
-    return [expense for expense in data if filter_strategy(expense)]
+    if limit is None:
+        return sorted(data, key=key, reverse=reverse)[offset:]
+    if reverse:
+        return heapq.nlargest(offset + limit, data, key=key)[offset:]
+
+    return heapq.nsmallest(offset + limit, data, key=key)[offset:]
+
+
+def select_expenses(
+    data: Iterable[Expense], sort_key: SortKey | None = None, keep: int | None = None
+) -> Iterable[Expense]:
+    if keep == 0:
+        for _ in data:
+            pass
+        return []
+    if keep is None or sort_key is None:
+        return data
+
+    return sort_expenses(
+        data,
+        operator.attrgetter(FIELD_MAP[sort_key.field]),
+        sort_key.descending,
+        keep,
+    )
+
+
+def get_sort_keys(
+    sort_field: ExpenseField | Sequence[SortKey], reverse: bool = False
+) -> List[SortKey]:
+    if isinstance(sort_field, ExpenseField):
+        return [SortKey(sort_field, reverse)]
+
+    return [SortKey(key.field, key.descending != reverse) for key in sort_field]
+
+
+def sort_by_keys(
+    data: Expenses,
+    sort_keys: Sequence[SortKey],
+    limit: int | None = None,
+    offset: int = 0,
+) -> List[int]:
+    encoded = encode_sort_keys(data, sort_keys)
+    return sort_expenses(range(len(encoded)), encoded.__getitem__, False, limit, offset)
+
+
+def encode_sort_keys(data: Expenses, sort_keys: Sequence[SortKey]) -> List[int]:
+    # Each key becomes a non-negative offset within its column's range, and
+    # the offsets are packed into one integer per row, most significant first.
+    encoded: List[int] = [0] * len(data)
+    if not data:
+        return encoded
+
+    for sort_key in sort_keys:
+        column = _get_sort_column(data, sort_key.field)
+        low, high = min(column), max(column)
+        if sort_key.descending:
+            offsets = map(operator.sub, itertools.repeat(high), column)
+        else:
+            offsets = map(operator.sub, column, itertools.repeat(low))
+        scaled = map(operator.mul, encoded, itertools.repeat(high - low + 1))
+        encoded = list(map(operator.add, scaled, offsets))
+
+    return encoded
+
+
+def _get_sort_column(data: Expenses, field: ExpenseField) -> Sequence[int]:
+    if isinstance(data, ExpenseStore):
+        match field:
+            case ExpenseField.CATEGORY:
+                ranks = _rank_strings(data.categories)
+                return list(map(ranks.__getitem__, data.category_codes))
+            case ExpenseField.DESCRIPTION:
+                ranks = _rank_strings(data.descriptions)
+                return list(map(ranks.__getitem__, data.description_codes))
+
+        return getattr(data, STORE_COLUMN_MAP[field])
+
+    values = list(map(operator.attrgetter(FIELD_MAP[field]), data))
+    match field:
+        case ExpenseField.DATE:
+            return list(map(dt.date.toordinal, values))
+        case ExpenseField.CATEGORY | ExpenseField.DESCRIPTION:
+            ranks = {value: rank for rank, value in enumerate(sorted(set(values)))}
+            return list(map(ranks.__getitem__, values))
+
+    return values
+
+
+def _rank_strings(strings: List[str]) -> List[int]:
+    ranks = [0] * len(strings)
+    for rank, code in enumerate(sorted(range(len(strings)), key=strings.__getitem__)):
+        ranks[code] = rank
+
+    return ranks
+
+
+def select_from_runs(
+    keys: Sequence, reverse: bool, limit: int, offset: int = 0
+) -> List[int] | None:
+    starts = find_runs(keys)
+    if len(starts) * SORT_MIN_RUN_LENGTH > len(keys):
+        return None
+
+    return list(
+        itertools.islice(merge_runs(keys, starts, reverse), offset, offset + limit)
+    )
+
+
+def find_runs(keys: Sequence) -> List[int]:
+    descents = map(operator.lt, itertools.islice(keys, 1, None), keys)
+    return [0, *itertools.compress(itertools.count(1), descents)]
+
+
+def merge_runs(
+    keys: Sequence, starts: List[int], reverse: bool = False
+) -> Iterator[int]:
+    bounds = zip(starts, [*starts[1:], len(keys)])
+    if reverse:
+        runs = [_iter_run_descending(keys, start, end) for start, end in bounds]
+    else:
+        runs = [range(start, end) for start, end in bounds]
+
+    return heapq.merge(*runs, key=keys.__getitem__, reverse=reverse)
+
+
+def _iter_run_descending(keys: Sequence, start: int, end: int) -> Iterator[int]:
+    # Equal keys keep their stored order, matching sorted(..., reverse=True).
+    group_end = end
+    for index in range(end - 1, start - 1, -1):
+        if index == start or keys[index - 1] != keys[index]:
+            yield from range(index, group_end)
+            group_end = index
 
 
 def filter_by_matching(
-    field: ExpenseField, *values: Union[dt.date, Decimal, str, int]
+    field: ExpenseField, *values: Union[dt.date, str, int]
 ) -> FilterStrategy:
     value_set = set(values)
+    attribute = FIELD_MAP[field]
 
     def strategy(expense: Expense) -> bool:
-        return getattr(expense, FIELD_MAP[field]) in value_set
+        return getattr(expense, attribute) in value_set
 
+    strategy.spec = FilterSpec(FilterKind.MATCHING, field=field, values=values)
     return strategy
 
 
 def filter_by_comparison(
     field: ExpenseField,
     comparator: Comparator,
-    value: Union[dt.date, Decimal, None],
+    value: Union[dt.date, int, float, None],
 ) -> FilterStrategy:
+    attribute = FIELD_MAP[field]
+    compare = COMPARATOR_OPERATORS[comparator]
+
     def strategy(expense: Expense) -> bool:
-        match comparator:
-            case Comparator.LESS_THAN:
-                return getattr(expense, FIELD_MAP[field]) < value
-            case Comparator.LESS_THAN_EQUAL:
-                return getattr(expense, FIELD_MAP[field]) <= value
-            case Comparator.GREATER_THAN:
-                return getattr(expense, FIELD_MAP[field]) > value
-            case Comparator.GREATER_THAN_EQUAL:
-                return getattr(expense, FIELD_MAP[field]) >= value
-            case Comparator.EQUAL:
-                return getattr(expense, FIELD_MAP[field]) == value
+        return compare(getattr(expense, attribute), value)
 
+    strategy.spec = FilterSpec(
+        FilterKind.COMPARISON, field=field, comparator=comparator, values=(value,)
+    )
     return strategy
 
 
 def filter_by_range(
     field: ExpenseField,
-    start_value: Union[Union[dt.date, Decimal], None] = None,
-    end_value: Union[Union[dt.date, Decimal], None] = None,
+    start_value: Union[dt.date, int, None] = None,
+    end_value: Union[dt.date, int, None] = None,
 ):
     default_field_ranges = {
-        ExpenseField.AMOUNT: {"min": Decimal("-inf"), "max": Decimal("inf")},
+        ExpenseField.AMOUNT: {"min": -math.inf, "max": math.inf},
         ExpenseField.DATE: {"min": dt.date.min, "max": dt.date.max},
     }
 
@@ -105,50 +300,132 @@ def filter_by_range(
 
 def combine_filters_all(*filters: FilterStrategy) -> FilterStrategy:
     def strategy(expense: Expense) -> bool:
-        results = []
         for filter_strategy in filters:
             if not filter_strategy(expense):
-                results.append(False)
-            else:
-                results.append(True)
+                return False
 
-        return all(results)
+        return True
 
+    strategy.spec = FilterSpec(FilterKind.ALL, children=_get_child_specs(filters))
     return strategy
 
 
 def combine_filters_any(*filters: FilterStrategy) -> FilterStrategy:
     def strategy(expense: Expense) -> bool:
-        results = []
         for filter_strategy in filters:
-            if not filter_strategy(expense):
-                results.append(False)
-            else:
-                results.append(True)
+            if filter_strategy(expense):
+                return True
 
-        return any(results)
+        return False
 
+    strategy.spec = FilterSpec(FilterKind.ANY, children=_get_child_specs(filters))
     return strategy
 
 
+def rebuild_filter(spec: FilterSpec) -> FilterStrategy:
+    match spec.kind:
+        case FilterKind.MATCHING:
+            return filter_by_matching(spec.field, *spec.values)
+        case FilterKind.COMPARISON:
+            return filter_by_comparison(spec.field, spec.comparator, spec.values[0])
+        case FilterKind.ALL:
+            return combine_filters_all(*map(rebuild_filter, spec.children))
+        case FilterKind.ANY:
+            return combine_filters_any(*map(rebuild_filter, spec.children))
+
+
+def compile_filter(filter_strategy: FilterStrategy) -> FilterStrategy:
+    spec = getattr(filter_strategy, "spec", None)
+    if spec is None:
+        return filter_strategy
+
+    namespace: Dict = {}
+    expression = _compile_expression(
+        spec, namespace, _get_row_operand, lambda field, value: value
+    )
+
+    return eval(f"lambda expense: {expression}", namespace)
+
+
+def select_indices(data: ExpenseStore, filter_strategy: FilterStrategy) -> List[int]:
+    spec = getattr(filter_strategy, "spec", None)
+    if spec is None:
+        return [index for index, expense in enumerate(data) if filter_strategy(expense)]
+
+    columns: Dict[str, str] = {}
+
+    def get_operand(field: ExpenseField | None) -> str:
+        if field is None:
+            return "_store[index]"
+        column = STORE_COLUMN_MAP[field]
+        columns[column] = f"{column}_value"
+        return columns[column]
+
+    namespace: Dict = {"_store": data}
+    expression = _compile_expression(
+        spec, namespace, get_operand, partial(_encode_store_value, data)
+    )
+
+    for column in columns:
+        namespace[f"_{column}"] = getattr(data, column)
+
+    if not columns:
+        source = f"[index for index in range(len(_store)) if {expression}]"
+    elif len(columns) == 1:
+        column, value = next(iter(columns.items()))
+        source = f"[index for index, {value} in enumerate(_{column}) if {expression}]"
+    else:
+        values = ", ".join(columns.values())
+        arrays = ", ".join(f"_{column}" for column in columns)
+        source = (
+            f"[index for index, ({values}) in enumerate(zip({arrays}))"
+            f" if {expression}]"
+        )
+
+    return eval(source, namespace)
+
+
 def modify_expense(
-    data: List[Expense],
+    data: Expenses,
     id: int,
     new_date: dt.date | None = None,
     new_category: str | None = None,
     new_description: str | None = None,
-    new_amount: Decimal | None = None,
-) -> Tuple[List[Expense], Dict]:
-    data = [copy.copy(expense) for expense in data]
-
-    target_expense = None
-    for expense in data:
-        if expense.id == id:
-            target_expense = expense
+    new_amount: int | None = None,
+) -> Tuple[Expenses, Dict]:
+    if isinstance(data, ExpenseStore):
+        target_index = data.find_id(id)
+    else:
+        target_index = next(
+            (index for index in range(len(data) - 1, -1, -1) if data[index].id == id),
+            None,
+        )
 
-    if not target_expense:
+    if target_index is None:
         raise ValueError(f"No expense found with ID {id}")
 
+    modified_expense, changes = edit_expense(
+        data[target_index], new_date, new_category, new_description, new_amount
+    )
+
+    if isinstance(data, ExpenseStore):
+        data = data.copy()
+    else:
+        data = list(data)
+    data[target_index] = modified_expense
+
+    return data, changes
+
+
+def edit_expense(
+    expense: Expense,
+    new_date: dt.date | None = None,
+    new_category: str | None = None,
+    new_description: str | None = None,
+    new_amount: int | None = None,
+) -> Tuple[Expense, Dict]:
+    target_expense = copy.copy(expense)
+
     changes = {}
     if new_date is not None:
         changes["date"] = (target_expense.date, new_date)
@@ -160,17 +437,27 @@ def modify_expense(
         changes["description"] = (target_expense.description[:16], new_description[:16])
         target_expense.description = new_description
     if new_amount is not None:
-        if new_amount < Decimal("0.01"):
+        if new_amount < 1:
             raise ValueError("Amount must be greater than 0.01")
-        new_amount = Decimal(new_amount)
-        new_amount = new_amount.quantize(Decimal(".01"), rounding=ROUND_HALF_EVEN)
         changes["amount"] = (target_expense.amount, new_amount)
         target_expense.amount = new_amount
 
-    return data, changes
+    return target_expense, changes
+
 
+def calculate_total(data: Expenses) -> Dict:
+    if isinstance(data, ExpenseStore):
+        category_cents: Dict[int, int] = {}
+        for code, cents in zip(data.category_codes, data.cents):
+            category_cents[code] = category_cents.get(code, 0) + cents
+
+        return {
+            "total": sum(data.cents),
+            "category": {
+                data.categories[code]: cents for code, cents in category_cents.items()
+            },
+        }
 
-def calculate_total(data: List[Expense]) -> Dict:
     totals = {"total": 0, "category": {}}
 
     for expense in data:
@@ -182,5 +469,167 @@ def calculate_total(data: List[Expense]) -> Dict:
     return totals
 
 
-def _get_next_id(data: List[Expense]) -> int:
+def create_totals() -> Dict:
+    return {"total": 0, "category": {}, "count": 0}
+
+
+def accumulate_totals(data: Iterable[Expense], totals: Dict) -> Iterator[Expense]:
+    category_totals = totals["category"]
+    for expense in data:
+        totals["total"] += expense.amount
+        totals["count"] += 1
+        category_totals[expense.category] = (
+            category_totals.get(expense.category, 0) + expense.amount
+        )
+        yield expense
+
+
+def get_period_key(date: dt.date, period: Period) -> str:
+    match period:
+        case Period.DAY:
+            return date.isoformat()
+        case Period.WEEK:
+            year, week, _ = date.isocalendar()
+            return f"{year:04d}-W{week:02d}"
+        case Period.MONTH:
+            return f"{date.year:04d}-{date.month:02d}"
+        case Period.YEAR:
+            return f"{date.year:04d}"
+
+
+def group_totals(data: Iterable[Expense], period: Period) -> Dict[str, Dict]:
+    if isinstance(data, ExpenseStore):
+        rows: Iterable[Tuple] = zip(
+            data.days,
+            map(data.categories.__getitem__, data.category_codes),
+            data.cents,
+        )
+    else:
+        rows = ((expense.date, expense.category, expense.amount) for expense in data)
+
+    groups: Dict[str, Dict] = {}
+    period_keys: Dict[Any, str] = {}
+    for date, category, cents in rows:
+        period_key = period_keys.get(date)
+        if period_key is None:
+            if isinstance(date, int):
+                period_key = get_period_key(dt.date.fromordinal(date), period)
+            else:
+                period_key = get_period_key(date, period)
+            period_keys[date] = period_key
+
+        totals = groups.get(period_key)
+        if totals is None:
+            totals = groups[period_key] = create_totals()
+        totals["total"] += cents
+        totals["count"] += 1
+        totals["category"][category] = totals["category"].get(category, 0) + cents
+
+    return groups
+
+
+def _get_next_id(data: Expenses) -> int:
+    if isinstance(data, ExpenseStore):
+        return max(data.ids, default=0) + 1
+
     return max((expense.id for expense in data), default=0) + 1
+
+
+def _get_child_specs(filters) -> Tuple:
+    return tuple(
+        getattr(filter_strategy, "spec", filter_strategy) for filter_strategy in filters
+    )
+
+
+def _get_row_operand(field: ExpenseField | None) -> str:
+    if field is None:
+        return "expense"
+
+    return f"expense.{FIELD_MAP[field]}"
+
+
+def _compile_expression(
+    node: Union[FilterSpec, FilterStrategy],
+    namespace: Dict,
+    get_operand: Callable[[ExpenseField | None], str],
+    encode: Callable[[ExpenseField, Any], Any],
+) -> str:
+    if not isinstance(node, FilterSpec):
+        return f"{_bind_constant(namespace, node)}({get_operand(None)})"
+
+    match node.kind:
+        case FilterKind.MATCHING:
+            encoded_values = set()
+            for value in node.values:
+                encoded_value = encode(node.field, value)
+                if encoded_value is not None:
+                    encoded_values.add(encoded_value)
+
+            if not encoded_values:
+                return "False"
+            if len(encoded_values) == 1:
+                name = _bind_constant(namespace, encoded_values.pop())
+                return f"({get_operand(node.field)} == {name})"
+
+            name = _bind_constant(namespace, frozenset(encoded_values))
+            return f"({get_operand(node.field)} in {name})"
+        case FilterKind.COMPARISON:
+            value = node.values[0]
+            if _is_unbounded(node.comparator, value):
+                return "True"
+
+            name = _bind_constant(namespace, encode(node.field, value))
+            symbol = COMPARATOR_SYMBOLS[node.comparator]
+            return f"({get_operand(node.field)} {symbol} {name})"
+        case FilterKind.ALL:
+            expressions = []
+            for child in node.children:
+                expression = _compile_expression(child, namespace, get_operand, encode)
+                if expression == "False":
+                    return "False"
+                if expression != "True":
+                    expressions.append(expression)
+
+            if not expressions:
+                return "True"
+            return "(" + " and ".join(expressions) + ")"
+        case FilterKind.ANY:
+            expressions = []
+            for child in node.children:
+                expression = _compile_expression(child, namespace, get_operand, encode)
+                if expression == "True":
+                    return "True"
+                if expression != "False":
+                    expressions.append(expression)
+
+            if not expressions:
+                return "False"
+            return "(" + " or ".join(expressions) + ")"
+
+
+def _encode_store_value(data: ExpenseStore, field: ExpenseField, value: Any) -> Any:
+    match field:
+        case ExpenseField.DATE:
+            return value.toordinal()
+        case ExpenseField.CATEGORY:
+            return data.find_category(value)
+        case ExpenseField.DESCRIPTION:
+            return data.find_description(value)
+        case _:
+            return value
+
+
+def _is_unbounded(comparator: Comparator, value: Any) -> bool:
+    if comparator == Comparator.GREATER_THAN_EQUAL:
+        return value == dt.date.min or value == -math.inf
+    if comparator == Comparator.LESS_THAN_EQUAL:
+        return value == dt.date.max or value == math.inf
+
+    return False
+
+
+def _bind_constant(namespace: Dict, value: Any) -> str:
+    name = f"_constant{len(namespace)}"
+    namespace[name] = value
+
+    return name
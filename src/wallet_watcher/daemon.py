@@ -0,0 +1,515 @@
+import os
+import json
+import socket
+import dataclasses
+import datetime as dt
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.aggregates as aggregates
+import wallet_watcher.backends as backends
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+from wallet_watcher._types import (
+    Comparator,
+    Expense,
+    ExpenseField,
+    FilterKind,
+    FilterSpec,
+    FilterStrategy,
+    Period,
+    SortKey,
+)
+from wallet_watcher.ledger import Ledger
+from wallet_watcher.store import ExpenseStore
+
+METHODS = {
+    "add",
+    "add_many",
+    "delete",
+    "update",
+    "undo",
+    "compact",
+    "list_expenses",
+    "calculate_total",
+    "report",
+    "count",
+    "next_id",
+}
+
+READ_METHODS = {"list_expenses", "calculate_total", "report", "count", "next_id"}
+
+ENUMS = {enum.__name__: enum for enum in (Comparator, ExpenseField, FilterKind, Period)}
+
+
+class ResidentLedger:
+    def __init__(
+        self, directory: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+    ) -> None:
+        self.directory = directory
+        self.undo_depth = undo_depth
+        self.ledger: Ledger | None = None
+        self._store: ExpenseStore | None = None
+        self._signature: List | None = None
+
+    def get_ledger(self) -> Ledger:
+        filepath = backends.find_data_path(self.directory)
+        if (
+            self.ledger is None
+            or self.ledger.filepath != filepath
+            or self.ledger.get_signature() != self._signature
+        ):
+            self.close()
+            self.ledger = backends.open_ledger(filepath, self.undo_depth)
+            self._signature = self.ledger.get_signature()
+
+        return self.ledger
+
+    def get_store(self) -> ExpenseStore:
+        ledger = self.get_ledger()
+        if self._store is None:
+            self._store = ledger.load_store()
+
+        return self._store
+
+    def close(self) -> None:
+        if self.ledger is not None:
+            self.ledger.close()
+        self.ledger = None
+        self._store = None
+
+    def count(self) -> int:
+        return self.get_ledger().count()
+
+    def next_id(self) -> int:
+        return self.get_ledger().next_id()
+
+    def list_expenses(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_field: ExpenseField | Sequence[SortKey] = ExpenseField.DATE,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Tuple[List[Expense], Dict]:
+        sort_keys = core.get_sort_keys(sort_field, reverse)
+        matched = self._filter(filter_strategy)
+        if len(sort_keys) > 1:
+            indices = core.sort_by_keys(matched, sort_keys, limit, offset)
+            return [matched[index] for index in indices], _get_totals(matched)
+
+        (sort_key,) = sort_keys
+        indices = None
+        if limit is not None and sort_key.field in const.APPEND_ORDER_FIELDS:
+            indices = core.select_from_runs(
+                getattr(matched, const.STORE_COLUMN_MAP[sort_key.field]),
+                sort_key.descending,
+                limit,
+                offset,
+            )
+        if indices is None:
+            indices = core.sort_expenses(
+                range(len(matched)),
+                _get_sort_key(matched, sort_key.field),
+                sort_key.descending,
+                limit,
+                offset,
+            )
+
+        return [matched[index] for index in indices], _get_totals(matched)
+
+    def calculate_total(self, filter_strategy: FilterStrategy) -> Dict:
+        return _get_totals(self._filter(filter_strategy))
+
+    def report(
+        self, filter_strategy: FilterStrategy, period: Period
+    ) -> Dict[str, Dict]:
+        return core.group_totals(self._filter(filter_strategy), period)
+
+    def add(self, expense: Expense, assign_ids: bool = True) -> Expense:
+        expense = self.get_ledger().add(expense, assign_ids)
+        if self._store is not None:
+            self._store.append(expense)
+        self._mark_written()
+
+        return expense
+
+    def add_many(self, expenses: Iterable[Expense], assign_ids: bool = True) -> int:
+        return len(self._append(expenses, False, assign_ids))
+
+    def add_batch(self, expenses: Iterable[Expense]) -> List[Expense]:
+        return self._append(expenses, True, True)
+
+    def delete(self, filter_strategy: FilterStrategy) -> List[Expense]:
+        deleted = self.get_ledger().delete(filter_strategy)
+        if deleted and self._store is not None:
+            self._store, _ = core.delete_expenses(self._store, filter_strategy)
+        self._mark_written()
+
+        return deleted
+
+    def update(
+        self,
+        id: int,
+        new_date: dt.date | None = None,
+        new_category: str | None = None,
+        new_description: str | None = None,
+        new_amount: int | None = None,
+    ) -> Dict:
+        changes = self.get_ledger().update(
+            id, new_date, new_category, new_description, new_amount
+        )
+        index = self._store.find_id(id) if self._store is not None else None
+        if changes and index is not None:
+            self._store[index], _ = core.edit_expense(
+                self._store[index], new_date, new_category, new_description, new_amount
+            )
+        self._mark_written()
+
+        return changes
+
+    def undo(self) -> Tuple[str, List[Expense]] | None:
+        undone = self.get_ledger().undo()
+        self._store = None
+        self._mark_written()
+
+        return undone
+
+    def compact(self) -> None:
+        self.get_ledger().compact()
+        self._store = None
+        self._mark_written()
+
+    def _append(
+        self, expenses: Iterable[Expense], undo_each: bool, assign_ids: bool
+    ) -> List[Expense]:
+        ledger = self.get_ledger()
+        added = list(expenses)
+        with ledger.locked():
+            if assign_ids:
+                next_id = ledger.next_id()
+                added = [
+                    dataclasses.replace(expense, id=next_id + offset)
+                    for offset, expense in enumerate(added)
+                ]
+            ledger.add_many(added, undo_each)
+        if self._store is not None:
+            for expense in added:
+                self._store.append(expense)
+        self._mark_written()
+
+        return added
+
+    def _filter(self, filter_strategy: FilterStrategy) -> ExpenseStore:
+        store = self.get_store()
+        if aggregates.is_unfiltered(getattr(filter_strategy, "spec", None)):
+            return store
+
+        return core.filter_expenses(store, filter_strategy)
+
+    def _mark_written(self) -> None:
+        if self.ledger is not None:
+            self._signature = self.ledger.get_signature()
+
+
+class RemoteLedger:
+    def __init__(self, connection: socket.socket) -> None:
+        self.connection = connection
+        self._file = connection.makefile("rwb")
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        self._file.write(
+            encode_message({"method": method, "args": args, "kwargs": kwargs})
+        )
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("The wallet daemon closed the connection")
+
+        response = decode_message(line)
+        if "error" in response:
+            if response["type"] == "ValueError":
+                raise ValueError(response["error"])
+            raise RuntimeError(response["error"])
+
+        return response["result"]
+
+    def close(self) -> None:
+        self._file.close()
+        self.connection.close()
+
+    def count(self) -> int:
+        return self.call("count")
+
+    def next_id(self) -> int:
+        return self.call("next_id")
+
+    def list_expenses(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_field: ExpenseField | Sequence[SortKey] = ExpenseField.DATE,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Tuple[List[Expense], Dict]:
+        expenses, totals = self.call(
+            "list_expenses", filter_strategy, sort_field, reverse, limit, offset
+        )
+        return expenses, totals
+
+    def calculate_total(self, filter_strategy: FilterStrategy) -> Dict:
+        return self.call("calculate_total", filter_strategy)
+
+    def report(
+        self, filter_strategy: FilterStrategy, period: Period
+    ) -> Dict[str, Dict]:
+        return self.call("report", filter_strategy, period)
+
+    def add(self, expense: Expense, assign_ids: bool = True) -> Expense:
+        if assign_ids:
+            return self.call("add", expense)
+        return self.call("add", expense, False)
+
+    def add_many(self, expenses: Iterable[Expense], assign_ids: bool = True) -> int:
+        return self.call("add_many", list(expenses), assign_ids)
+
+    def delete(self, filter_strategy: FilterStrategy) -> List[Expense]:
+        return self.call("delete", filter_strategy)
+
+    def update(
+        self,
+        id: int,
+        new_date: dt.date | None = None,
+        new_category: str | None = None,
+        new_description: str | None = None,
+        new_amount: int | None = None,
+    ) -> Dict:
+        return self.call(
+            "update", id, new_date, new_category, new_description, new_amount
+        )
+
+    def undo(self) -> Tuple[str, List[Expense]] | None:
+        undone = self.call("undo")
+        return tuple(undone) if undone is not None else None
+
+    def compact(self) -> None:
+        self.call("compact")
+
+    def stats(self) -> Dict:
+        return self.call("stats")
+
+
+def connect(socket_path: str) -> RemoteLedger | None:
+    if os.environ.get(const.ENV_NO_DAEMON) or not hasattr(socket, "AF_UNIX"):
+        return None
+    if not os.path.exists(socket_path):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(const.DAEMON_TIMEOUT_SECONDS)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+
+    return RemoteLedger(connection)
+
+
+@dataclass
+class Request:
+    method: str
+    args: List[Any] = dataclasses.field(default_factory=list)
+    kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    key: bytes = b""
+
+
+def parse_request(line: bytes, methods: Set[str] = METHODS) -> Request:
+    try:
+        message = decode_message(line)
+        method = message["method"]
+        args = message.get("args", [])
+        kwargs = message.get("kwargs", {})
+    except (ValueError, KeyError, TypeError, AttributeError) as error:
+        raise ValueError(f"Malformed request: {error}") from error
+
+    if method not in methods:
+        raise ValueError(f"Unknown method: {method}")
+
+    return Request(
+        method,
+        [_to_strategy(arg) for arg in args],
+        {name: _to_strategy(value) for name, value in kwargs.items()},
+        line.strip(),
+    )
+
+
+def handle_request(resident: ResidentLedger, line: bytes) -> bytes:
+    try:
+        request = parse_request(line)
+    except ValueError as error:
+        return encode_error(error)
+
+    return call_request(resident, request)
+
+
+def call_request(resident: ResidentLedger, request: Request) -> bytes:
+    try:
+        result = getattr(resident, request.method)(*request.args, **request.kwargs)
+    except Exception as error:
+        return encode_error(error)
+
+    return encode_message({"result": result})
+
+
+def execute_batch(resident: ResidentLedger, requests: List[Request]) -> List[bytes]:
+    # Requests in one batch come from different connections, so they are
+    # concurrent and may run in any order: adds go first as a single append.
+    responses: List[bytes] = [b""] * len(requests)
+    adds = [
+        position for position, request in enumerate(requests) if _is_single_add(request)
+    ]
+    if adds:
+        _flush_adds(resident, requests, adds, responses)
+
+    reads: Dict[bytes, bytes] = {}
+    for position, request in enumerate(requests):
+        if responses[position]:
+            continue
+
+        if request.method in READ_METHODS:
+            if request.key not in reads:
+                reads[request.key] = call_request(resident, request)
+            responses[position] = reads[request.key]
+        else:
+            reads.clear()
+            responses[position] = call_request(resident, request)
+
+    return responses
+
+
+def encode_error(error: Exception) -> bytes:
+    return encode_message({"error": str(error), "type": type(error).__name__})
+
+
+def encode_message(message: Dict) -> bytes:
+    encoded = json.dumps(message, default=_encode_value, separators=(",", ":"))
+    return encoded.encode() + b"\n"
+
+
+def decode_message(line: bytes) -> Any:
+    return json.loads(line, object_hook=_decode_value)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Expense):
+        return {
+            "$expense": [
+                value.id,
+                value.date.isoformat(),
+                value.category,
+                value.description,
+                value.amount,
+            ]
+        }
+    if isinstance(value, dt.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, Enum):
+        return {"$enum": [type(value).__name__, value.name]}
+    if isinstance(value, SortKey):
+        return {"$sort": [value.field, value.descending]}
+    if isinstance(value, FilterSpec):
+        return {
+            "$filter": [
+                value.kind,
+                value.field,
+                value.comparator,
+                list(value.values),
+                list(value.children),
+            ]
+        }
+    if hasattr(value, "spec"):
+        return value.spec
+
+    raise TypeError(f"Cannot send {type(value).__name__} to the wallet daemon")
+
+
+def _decode_value(data: Dict) -> Any:
+    if len(data) != 1:
+        return data
+
+    ((tag, value),) = data.items()
+    if tag == "$date" and isinstance(value, str):
+        return adapter.parse_date(value)
+    if not isinstance(value, list):
+        return data
+
+    match tag:
+        case "$expense":
+            id, date, category, description, amount = value
+            return Expense(id, adapter.parse_date(date), category, description, amount)
+        case "$enum":
+            enum_name, member_name = value
+            return ENUMS[enum_name][member_name]
+        case "$sort":
+            field, descending = value
+            return SortKey(field, descending)
+        case "$filter":
+            kind, field, comparator, values, children = value
+            return FilterSpec(kind, field, comparator, tuple(values), tuple(children))
+
+    return data
+
+
+def _is_single_add(request: Request) -> bool:
+    return (
+        request.method == "add"
+        and len(request.args) == 1
+        and not request.kwargs
+        and isinstance(request.args[0], Expense)
+    )
+
+
+def _flush_adds(
+    resident: ResidentLedger,
+    requests: List[Request],
+    adds: List[int],
+    responses: List[bytes],
+) -> None:
+    try:
+        added = resident.add_batch([requests[position].args[0] for position in adds])
+    except Exception as error:
+        for position in adds:
+            responses[position] = encode_error(error)
+    else:
+        for position, expense in zip(adds, added):
+            responses[position] = encode_message({"result": expense})
+
+
+def _to_strategy(value: Any) -> Any:
+    if not isinstance(value, FilterSpec):
+        return value
+
+    return core.rebuild_filter(value)
+
+
+def _get_totals(data: ExpenseStore) -> Dict:
+    totals = core.calculate_total(data)
+    totals["count"] = len(data)
+
+    return totals
+
+
+def _get_sort_key(data: ExpenseStore, field: ExpenseField) -> Callable[[int], Any]:
+    match field:
+        case ExpenseField.CATEGORY:
+            categories, codes = data.categories, data.category_codes
+            return lambda index: categories[codes[index]]
+        case ExpenseField.DESCRIPTION:
+            descriptions, codes = data.descriptions, data.description_codes
+            return lambda index: descriptions[codes[index]]
+
+    return getattr(data, const.STORE_COLUMN_MAP[field]).__getitem__
@@ -0,0 +1,312 @@
+import os
+import zlib
+import struct
+import datetime as dt
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Tuple
+
+import wallet_watcher.constants as const
+import wallet_watcher.storage as storage
+
+INDEX_HEADER = struct.Struct("<4sqqqq")
+INDEX_ENTRY = struct.Struct("<qq")
+INDEX_KEY = struct.Struct("<q")
+INDEX_MAGIC = b"WWX1"
+
+
+class SortedIndex(ABC):
+    # On disk: a header, then (key, offset) entries. The first sorted_entries
+    # are ordered and searched by bisection; later appends form a short
+    # unsorted tail that is merged into the sorted part once it grows.
+    suffix = ""
+
+    def __init__(
+        self,
+        generation: int,
+        size: int = 0,
+        path: str | None = None,
+        entries: int = 0,
+        sorted_entries: int = 0,
+    ):
+        self.generation = generation
+        self.size = size
+        self.path = path
+        self.entries = entries
+        self.sorted_entries = sorted_entries
+        self._pending: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return self.entries + len(self._pending)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and sorted(self.read_entries()) == sorted(
+            other.read_entries()
+        )
+
+    @staticmethod
+    @abstractmethod
+    def get_key(record: List[str]) -> int:
+        pass
+
+    def add(self, offset: int, record: List[str]) -> None:
+        self._pending.append((self.get_key(record), offset))
+
+    def find_keys(self, low: int, high: int) -> List[int]:
+        offsets = []
+        if self.path is not None and self.entries:
+            with open(self.path, "rb") as index_file:
+                start = self._bisect(index_file, low)
+                end = self._bisect(index_file, high, start)
+                index_file.seek(INDEX_HEADER.size + start * INDEX_ENTRY.size)
+                data = index_file.read((end - start) * INDEX_ENTRY.size)
+                offsets.extend(offset for _, offset in INDEX_ENTRY.iter_unpack(data))
+
+                index_file.seek(
+                    INDEX_HEADER.size + self.sorted_entries * INDEX_ENTRY.size
+                )
+                tail = index_file.read(
+                    (self.entries - self.sorted_entries) * INDEX_ENTRY.size
+                )
+                offsets.extend(
+                    offset
+                    for key, offset in INDEX_ENTRY.iter_unpack(tail)
+                    if low <= key < high
+                )
+
+        offsets.extend(offset for key, offset in self._pending if low <= key < high)
+        return offsets
+
+    def read_entries(self) -> List[Tuple[int, int]]:
+        entries = []
+        if self.path is not None:
+            with open(self.path, "rb") as index_file:
+                index_file.seek(INDEX_HEADER.size)
+                data = index_file.read(self.entries * INDEX_ENTRY.size)
+            entries = list(INDEX_ENTRY.iter_unpack(data))
+
+        return entries + self._pending
+
+    @classmethod
+    def read(cls, index_path: str) -> "SortedIndex | None":
+        try:
+            with open(index_path, "rb") as index_file:
+                header = index_file.read(INDEX_HEADER.size)
+                file_size = os.fstat(index_file.fileno()).st_size
+        except OSError:
+            return None
+
+        if len(header) != INDEX_HEADER.size:
+            return None
+        magic, generation, size, entries, sorted_entries = INDEX_HEADER.unpack(header)
+        if (
+            magic != INDEX_MAGIC
+            or not 0 <= sorted_entries <= entries
+            or file_size < INDEX_HEADER.size + entries * INDEX_ENTRY.size
+        ):
+            return None
+
+        return cls(generation, size, index_path, entries, sorted_entries)
+
+    def write(self, index_path: str) -> None:
+        entries = sorted(self.read_entries())
+        temp_path = storage.get_temp_path(index_path)
+        with open(temp_path, "wb") as index_file:
+            index_file.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC, self.generation, self.size, len(entries), len(entries)
+                )
+            )
+            index_file.writelines(INDEX_ENTRY.pack(*entry) for entry in entries)
+        os.replace(temp_path, index_path)
+
+        self.path = index_path
+        self.entries = self.sorted_entries = len(entries)
+        self._pending = []
+
+    def save(self, index_path: str) -> None:
+        tail = self.entries - self.sorted_entries + len(self._pending)
+        max_tail = max(
+            const.INDEX_MIN_TAIL_ENTRIES, self.sorted_entries // const.INDEX_TAIL_RATIO
+        )
+        if self.path != index_path or tail > max_tail:
+            self.write(index_path)
+            return
+
+        # Entries go in file order and the header is written last, so a
+        # concurrent or interrupted append leaves a consistent prefix.
+        pending = self._pending
+        with open(index_path, "r+b") as index_file:
+            extends_sorted = self.entries == self.sorted_entries and pending == sorted(
+                pending
+            )
+            if extends_sorted and pending and self.entries:
+                index_file.seek(
+                    INDEX_HEADER.size + (self.entries - 1) * INDEX_ENTRY.size
+                )
+                extends_sorted = pending[0] >= INDEX_ENTRY.unpack(
+                    index_file.read(INDEX_ENTRY.size)
+                )
+
+            index_file.seek(INDEX_HEADER.size + self.entries * INDEX_ENTRY.size)
+            index_file.writelines(INDEX_ENTRY.pack(*entry) for entry in pending)
+            index_file.flush()
+
+            self.entries += len(pending)
+            if extends_sorted:
+                self.sorted_entries = self.entries
+            index_file.seek(0)
+            index_file.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC,
+                    self.generation,
+                    self.size,
+                    self.entries,
+                    self.sorted_entries,
+                )
+            )
+        self._pending = []
+
+    def _bisect(self, index_file, key: int, low: int = 0) -> int:
+        high = self.sorted_entries
+        while low < high:
+            middle = (low + high) // 2
+            index_file.seek(INDEX_HEADER.size + middle * INDEX_ENTRY.size)
+            if INDEX_KEY.unpack(index_file.read(INDEX_KEY.size))[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+
+class DateIndex(SortedIndex):
+    suffix = const.DATE_INDEX_SUFFIX
+
+    @staticmethod
+    def get_key(record: List[str]) -> int:
+        return dt.date.fromisoformat(record[1]).toordinal()
+
+    def find_range(self, start: dt.date | None, end: dt.date | None) -> List[int]:
+        low = start.toordinal() if start is not None else 0
+        high = end.toordinal() + 1 if end is not None else dt.date.max.toordinal() + 1
+
+        return self.find_keys(low, high)
+
+    def find_dates(self, dates: Iterable[dt.date]) -> List[int]:
+        offsets = []
+        for date in set(dates):
+            offsets.extend(self.find_range(date, date))
+
+        return offsets
+
+
+class KeyIndex(SortedIndex):
+    @staticmethod
+    @abstractmethod
+    def encode(key) -> int:
+        pass
+
+    def find(self, keys: Iterable) -> List[int]:
+        offsets = []
+        for key in set(map(self.encode, keys)):
+            offsets.extend(self.find_keys(key, key + 1))
+
+        return offsets
+
+
+class IdIndex(KeyIndex):
+    suffix = const.ID_INDEX_SUFFIX
+
+    @staticmethod
+    def get_key(record: List[str]) -> int:
+        return int(record[0])
+
+    @staticmethod
+    def encode(key) -> int:
+        return int(key)
+
+
+class CategoryIndex(KeyIndex):
+    # Categories are stored by hash; a collision only adds candidates, which
+    # the query's own predicate filters out.
+    suffix = const.CATEGORY_INDEX_SUFFIX
+
+    @staticmethod
+    def get_key(record: List[str]) -> int:
+        return CategoryIndex.encode(record[2])
+
+    @staticmethod
+    def encode(key) -> int:
+        return zlib.crc32(str(key).encode())
+
+
+INDEX_TYPES = {"date": DateIndex, "id": IdIndex, "category": CategoryIndex}
+
+
+def get_index_path(filepath: str, index_type: type) -> str:
+    return filepath + index_type.suffix
+
+
+def load_date_index(filepath: str) -> DateIndex:
+    return load_index(filepath, DateIndex)
+
+
+def load_id_index(filepath: str) -> IdIndex:
+    return load_index(filepath, IdIndex)
+
+
+def load_category_index(filepath: str) -> CategoryIndex:
+    return load_index(filepath, CategoryIndex)
+
+
+def load_index(filepath: str, index_type: type):
+    metadata = storage.get_metadata(filepath)
+    file_size = os.path.getsize(filepath)
+    loaded_index = index_type.read(get_index_path(filepath, index_type))
+
+    if (
+        loaded_index is None
+        or loaded_index.generation != metadata["generation"]
+        or loaded_index.size > file_size
+    ):
+        return build_index(filepath, index_type)
+    if loaded_index.size < file_size:
+        _extend_index(filepath, loaded_index)
+
+    return loaded_index
+
+
+def build_index(filepath: str, index_type: type, persist: bool = True):
+    metadata = storage.get_metadata(filepath)
+    new_index = index_type(metadata["generation"])
+    _extend_index(filepath, new_index, persist)
+
+    return new_index
+
+
+def verify_index(filepath: str, index_type: type) -> str:
+    metadata = storage.get_metadata(filepath)
+    loaded_index = index_type.read(get_index_path(filepath, index_type))
+
+    if loaded_index is None:
+        return "missing"
+
+    file_size = os.path.getsize(filepath)
+    if loaded_index.generation != metadata["generation"]:
+        return "stale"
+    if loaded_index.size != file_size:
+        return "stale"
+    if loaded_index != build_index(filepath, index_type, persist=False):
+        return "corrupt"
+
+    return "ok"
+
+
+def _extend_index(filepath: str, target_index, persist: bool = True) -> None:
+    start_offset = target_index.size or None
+    for offset, record in storage.iter_records(filepath, start_offset):
+        target_index.add(offset, record)
+    target_index.size = os.path.getsize(filepath)
+
+    if persist:
+        target_index.save(get_index_path(filepath, type(target_index)))
@@ -0,0 +1,115 @@
+import os
+import csv
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import wallet_watcher.constants as const
+
+DELETE = "D"
+INSERT = "I"
+UPDATE = "U"
+
+COUNT_DELTAS = {DELETE: -1, INSERT: 1, UPDATE: 0}
+
+
+@dataclass
+class Journal:
+    epoch: int
+    overrides: Dict[int, Dict[str, str] | None] = field(default_factory=dict)
+    count_delta: int = 0
+    entries: int = 0
+
+
+def get_journal_path(filepath: str) -> str:
+    return filepath + const.JOURNAL_SUFFIX
+
+
+def load_journal(filepath: str, epoch: int) -> Journal:
+    journal = Journal(epoch)
+    try:
+        with open(get_journal_path(filepath), "r", newline="") as journal_file:
+            csv_reader = csv.reader(journal_file)
+            if next(csv_reader, None) != [const.JOURNAL_HEADER, str(epoch)]:
+                return journal
+
+            for record in csv_reader:
+                if not record or record[0] not in COUNT_DELTAS:
+                    continue
+
+                operation, id = record[0], int(record[1])
+                if operation == DELETE:
+                    journal.overrides[id] = None
+                else:
+                    journal.overrides[id] = dict(zip(const.FIELD_NAMES, record[1:]))
+                journal.count_delta += COUNT_DELTAS[operation]
+                journal.entries += 1
+    except OSError:
+        pass
+
+    return journal
+
+
+def append_journal(
+    filepath: str, journal: Journal, entries: List[Tuple[str, Dict[str, str]]]
+) -> None:
+    journal_path = get_journal_path(filepath)
+    mode = "a" if journal.entries and os.path.exists(journal_path) else "w"
+
+    with open(journal_path, mode, newline="") as journal_file:
+        csv_writer = csv.writer(journal_file)
+        if mode == "w":
+            csv_writer.writerow([const.JOURNAL_HEADER, journal.epoch])
+
+        for operation, row in entries:
+            if operation == DELETE:
+                csv_writer.writerow([operation, row["id"]])
+                journal.overrides[int(row["id"])] = None
+            else:
+                csv_writer.writerow(
+                    [operation] + [row[name] for name in const.FIELD_NAMES]
+                )
+                journal.overrides[int(row["id"])] = row
+            journal.count_delta += COUNT_DELTAS[operation]
+            journal.entries += 1
+
+
+def apply_overrides(
+    records: Iterable[List[str]],
+    overrides: Dict[int, Dict[str, str] | None],
+    seen_ids: Set[int],
+) -> Iterator[List[str]]:
+    for record in records:
+        id = int(record[0])
+        if id not in overrides:
+            yield record
+            continue
+
+        seen_ids.add(id)
+        if overrides[id] is not None:
+            yield _to_record(overrides[id])
+
+
+def iter_unseen_records(
+    overrides: Dict[int, Dict[str, str] | None], seen_ids: Set[int]
+) -> Iterator[List[str]]:
+    for id, row in overrides.items():
+        if id not in seen_ids and row is not None:
+            yield _to_record(row)
+
+
+def get_journal_size(filepath: str) -> int:
+    try:
+        return os.path.getsize(get_journal_path(filepath))
+    except OSError:
+        return 0
+
+
+def clear_journal(filepath: str) -> None:
+    try:
+        os.remove(get_journal_path(filepath))
+    except FileNotFoundError:
+        pass
+
+
+def _to_record(row: Dict[str, str]) -> List[str]:
+    return [row[name] for name in const.FIELD_NAMES]
@@ -0,0 +1,623 @@
+import os
+import dataclasses
+import datetime as dt
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.aggregates as aggregates
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.index as index
+import wallet_watcher.journal as journal
+import wallet_watcher.locking as locking
+import wallet_watcher.parallel as parallel
+import wallet_watcher.storage as storage
+import wallet_watcher.undo as undo
+from wallet_watcher._types import (
+    Comparator,
+    Expense,
+    ExpenseField,
+    FilterKind,
+    FilterSpec,
+    FilterStrategy,
+    Period,
+    SortKey,
+)
+from wallet_watcher.store import ExpenseStore
+
+
+class Ledger(ABC):
+    def __init__(
+        self, filepath: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+    ) -> None:
+        self.filepath = filepath
+        self.undo_depth = undo_depth
+        self._lock_held = False
+        self._cache_signature: List | None = None
+
+    @classmethod
+    @abstractmethod
+    def create(
+        cls,
+        filepath: str,
+        expenses: Iterable[Expense],
+        next_id: int = 1,
+        undo_depth: int = const.DEFAULT_UNDO_DEPTH,
+    ) -> "Ledger":
+        pass
+
+    @abstractmethod
+    def iter_expenses(self) -> Iterator[Expense]:
+        pass
+
+    @abstractmethod
+    def iter_query(self, filter_strategy: FilterStrategy) -> Iterator[Expense]:
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def next_id(self) -> int:
+        pass
+
+    def load(self) -> List[Expense]:
+        return list(self.iter_expenses())
+
+    def load_store(self) -> ExpenseStore:
+        return ExpenseStore.from_expenses(self.iter_expenses())
+
+    def close(self) -> None:
+        pass
+
+    def query(self, filter_strategy: FilterStrategy) -> List[Expense]:
+        return list(self.iter_query(filter_strategy))
+
+    def iter_query_records(
+        self, filter_strategy: FilterStrategy
+    ) -> Iterator[List[str]]:
+        return map(
+            adapter.convert_expense_to_csv_record, self.iter_query(filter_strategy)
+        )
+
+    def list_expenses(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_field: ExpenseField | Sequence[SortKey] = ExpenseField.DATE,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Tuple[List[Expense], Dict]:
+        sort_keys = core.get_sort_keys(sort_field, reverse)
+        keep = None
+        if limit is not None and len(sort_keys) == 1:
+            keep = offset + limit
+        expenses, totals = self._scan(filter_strategy, sort_keys[0], keep)
+
+        if len(sort_keys) == 1:
+            (sort_key,) = sort_keys
+            sorted_expenses = core.sort_expenses(
+                expenses,
+                key=attrgetter(const.FIELD_MAP[sort_key.field]),
+                reverse=sort_key.descending,
+                limit=limit,
+                offset=offset,
+            )
+        else:
+            expenses = list(expenses)
+            sorted_expenses = [
+                expenses[position]
+                for position in core.sort_by_keys(expenses, sort_keys, limit, offset)
+            ]
+
+        return sorted_expenses, totals
+
+    def calculate_total(self, filter_strategy: FilterStrategy) -> Dict:
+        totals = self._summarize(filter_strategy)
+        if totals is None:
+            _, totals = self._scan(filter_strategy, keep=0)
+
+        return totals
+
+    def report(
+        self, filter_strategy: FilterStrategy, period: Period
+    ) -> Dict[str, Dict]:
+        if period in aggregates.ROLLUP_PERIODS:
+            covered, categories = self._get_aggregate_scope(filter_strategy)
+            if covered:
+                return aggregates.rollup(self.get_aggregates(), period, categories)
+
+        return core.group_totals(self.iter_query(filter_strategy), period)
+
+    def get_aggregates(self) -> Dict:
+        materialized = self._load_aggregates()
+        if materialized is None:
+            signature = self.get_signature()
+            materialized = aggregates.build_aggregates(self.iter_expenses())
+            aggregates.write_aggregates(self.filepath, materialized, signature)
+
+        return materialized
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        if self._lock_held:
+            yield
+            return
+
+        with locking.file_lock(self.filepath):
+            self._lock_held = True
+            try:
+                if self._get_cache_signature() != self._cache_signature:
+                    self._drop_caches()
+                yield
+            finally:
+                self._cache_signature = self._get_cache_signature()
+                self._lock_held = False
+
+    def compact(self) -> None:
+        with self.locked():
+            materialized = self._load_aggregates()
+            self._compact()
+            self._save_aggregates(materialized)
+
+    def add(self, expense: Expense, assign_ids: bool = False) -> Expense:
+        with self.locked():
+            if assign_ids:
+                expense = dataclasses.replace(expense, id=self.next_id())
+
+            materialized = self._load_aggregates()
+            row = adapter.convert_expense_to_csv_row(expense)
+            self._append_rows([row])
+            self._save_aggregates(materialized, added=[expense])
+            self._push_undo(undo.ADD, [{"id": row["id"]}])
+
+        return expense
+
+    def add_many(
+        self,
+        expenses: Iterable[Expense],
+        undo_each: bool = False,
+        assign_ids: bool = False,
+    ) -> int:
+        added = list(expenses)
+        if not added:
+            return 0
+
+        with self.locked():
+            if assign_ids:
+                next_id = self.next_id()
+                added = [
+                    dataclasses.replace(expense, id=next_id + offset)
+                    for offset, expense in enumerate(added)
+                ]
+
+            materialized = self._load_aggregates()
+            rows = adapter.convert_expenses_to_csv(added)
+            self._append_rows(rows)
+            self._save_aggregates(materialized, added=added)
+            if undo_each:
+                undo.push_undo_entries(
+                    self.filepath,
+                    [undo.UndoEntry(undo.ADD, [{"id": row["id"]}]) for row in rows],
+                    self.undo_depth,
+                )
+            else:
+                self._push_undo(undo.ADD, [{"id": row["id"]} for row in rows])
+
+        return len(rows)
+
+    def delete(self, filter_strategy: FilterStrategy) -> List[Expense]:
+        with self.locked():
+            deleted_expenses = self.query(filter_strategy)
+            if deleted_expenses:
+                materialized = self._load_aggregates()
+                deleted_rows = adapter.convert_expenses_to_csv(deleted_expenses)
+                self._delete_rows(deleted_rows)
+                self._save_aggregates(materialized, removed=deleted_expenses)
+                self._push_undo(undo.DELETE, deleted_rows)
+
+        return deleted_expenses
+
+    def update(
+        self,
+        id: int,
+        new_date: dt.date | None = None,
+        new_category: str | None = None,
+        new_description: str | None = None,
+        new_amount: int | None = None,
+    ) -> Dict:
+        with self.locked():
+            matches = self.query(core.filter_by_matching(ExpenseField.ID, id))
+            if not matches:
+                raise ValueError(f"No expense found with ID {id}")
+
+            original = matches[-1]
+            modified, changes = core.edit_expense(
+                original, new_date, new_category, new_description, new_amount
+            )
+            if changes:
+                materialized = self._load_aggregates()
+                self._save_edit(modified, changes)
+                self._save_aggregates(materialized, [original], [modified])
+
+                original_row = adapter.convert_expense_to_csv_row(original)
+                previous_values = {name: original_row[name] for name in changes}
+                self._push_undo(undo.EDIT, [{"id": str(id), **previous_values}])
+
+        return changes
+
+    def undo(self) -> Tuple[str, List[Expense]] | None:
+        with self.locked():
+            return self._undo()
+
+    def _undo(self) -> Tuple[str, List[Expense]] | None:
+        entry = undo.pop_undo(self.filepath)
+        if entry is None:
+            return None
+
+        ids = [int(row["id"]) for row in entry.rows]
+        existing = {
+            expense.id: expense
+            for expense in self.query(core.filter_by_matching(ExpenseField.ID, *ids))
+        }
+
+        materialized = self._load_aggregates()
+        match entry.operation:
+            case undo.ADD:
+                removed = [existing[id] for id in ids if id in existing]
+                self._delete_rows(adapter.convert_expenses_to_csv(removed))
+                self._save_aggregates(materialized, removed=removed)
+                return entry.operation, removed
+            case undo.DELETE:
+                restored_rows = [
+                    row for row in entry.rows if int(row["id"]) not in existing
+                ]
+                restored = adapter.convert_csv_to_expenses(restored_rows)
+                self._insert_rows(restored_rows)
+                self._save_aggregates(materialized, added=restored)
+                return entry.operation, restored
+            case undo.EDIT:
+                replaced = []
+                restored = []
+                for row in entry.rows:
+                    if int(row["id"]) not in existing:
+                        continue
+
+                    current = existing[int(row["id"])]
+                    current_row = adapter.convert_expense_to_csv_row(current)
+                    expense = adapter.convert_csv_row_to_expense({**current_row, **row})
+                    self._save_edit(expense, row)
+                    replaced.append(current)
+                    restored.append(expense)
+                self._save_aggregates(materialized, replaced, restored)
+                return entry.operation, restored
+
+        return entry.operation, []
+
+    def _push_undo(self, operation: str, rows: List[Dict[str, str]]) -> None:
+        undo.push_undo(self.filepath, undo.UndoEntry(operation, rows), self.undo_depth)
+
+    def _scan(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_key: SortKey | None = None,
+        keep: int | None = None,
+    ) -> Tuple[Iterable[Expense], Dict]:
+        totals = self._summarize(filter_strategy)
+        expenses = self.iter_query(filter_strategy)
+        if totals is None:
+            totals = core.create_totals()
+            expenses = core.accumulate_totals(expenses, totals)
+
+        return core.select_expenses(expenses, sort_key, keep), totals
+
+    def _summarize(self, filter_strategy: FilterStrategy) -> Dict | None:
+        covered, categories = self._get_aggregate_scope(filter_strategy)
+        if not covered:
+            return None
+
+        return aggregates.summarize(self.get_aggregates(), categories)
+
+    def _get_aggregate_scope(
+        self, filter_strategy: FilterStrategy
+    ) -> Tuple[bool, Set[str] | None]:
+        spec = getattr(filter_strategy, "spec", None)
+        if aggregates.is_unfiltered(spec):
+            return True, None
+
+        categories = aggregates.find_matching_categories(spec)
+        return categories is not None, categories
+
+    def _load_aggregates(self) -> Dict | None:
+        return aggregates.load_aggregates(self.filepath, self.get_signature())
+
+    def _save_aggregates(
+        self,
+        materialized: Dict | None,
+        removed: Iterable[Expense] = (),
+        added: Iterable[Expense] = (),
+    ) -> None:
+        if materialized is None:
+            return
+
+        aggregates.apply_expenses(materialized, removed, -1)
+        aggregates.apply_expenses(materialized, added, 1)
+        aggregates.write_aggregates(self.filepath, materialized, self.get_signature())
+
+    def get_signature(self) -> List:
+        return storage.get_file_signature(self.filepath)
+
+    def _get_cache_signature(self) -> List | None:
+        try:
+            return self.get_signature()
+        except FileNotFoundError:
+            return None
+
+    def _drop_caches(self) -> None:
+        pass
+
+    @abstractmethod
+    def _compact(self) -> None:
+        pass
+
+    @abstractmethod
+    def _append_rows(self, rows: List[Dict[str, str]]) -> None:
+        pass
+
+    @abstractmethod
+    def _delete_rows(self, rows: List[Dict[str, str]]) -> None:
+        pass
+
+    @abstractmethod
+    def _insert_rows(self, rows: List[Dict[str, str]]) -> None:
+        pass
+
+    @abstractmethod
+    def _save_edit(self, expense: Expense, changes: Dict) -> None:
+        pass
+
+
+class CsvLedger(Ledger):
+    def __init__(
+        self, filepath: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+    ) -> None:
+        super().__init__(filepath, undo_depth)
+        self._indexes: Dict[type, object] = {}
+        self._journal: journal.Journal | None = None
+
+    @classmethod
+    def create(
+        cls,
+        filepath: str,
+        expenses: Iterable[Expense],
+        next_id: int = 1,
+        undo_depth: int = const.DEFAULT_UNDO_DEPTH,
+    ) -> "CsvLedger":
+        rows = map(adapter.convert_expense_to_csv_row, expenses)
+        storage.create_csv(filepath, rows, next_id)
+        return cls(filepath, undo_depth)
+
+    def iter_records(self) -> Iterator[List[str]]:
+        overrides = self._get_journal().overrides
+        if not overrides:
+            yield from storage.iter_fields(self.filepath)
+            return
+
+        seen_ids: Set[int] = set()
+        yield from journal.apply_overrides(
+            storage.iter_fields(self.filepath), overrides, seen_ids
+        )
+        yield from journal.iter_unseen_records(overrides, seen_ids)
+
+    def iter_query_records(
+        self, filter_strategy: FilterStrategy
+    ) -> Iterator[List[str]]:
+        if aggregates.is_unfiltered(getattr(filter_strategy, "spec", None)):
+            return self.iter_records()
+
+        return super().iter_query_records(filter_strategy)
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        for record in self.iter_records():
+            yield dict(zip(const.FIELD_NAMES, record))
+
+    def iter_expenses(self) -> Iterator[Expense]:
+        return map(adapter.convert_csv_record_to_expense, self.iter_records())
+
+    def load_store(self) -> ExpenseStore:
+        return ExpenseStore.from_records(self.iter_records())
+
+    def count(self) -> int:
+        metadata = storage.get_metadata(self.filepath)
+        return metadata["count"] + self._get_journal().count_delta
+
+    def next_id(self) -> int:
+        return storage.get_next_id(self.filepath)
+
+    def iter_query(self, filter_strategy: FilterStrategy) -> Iterator[Expense]:
+        predicate = core.compile_filter(filter_strategy)
+        spec = getattr(filter_strategy, "spec", None)
+        offsets = self._lookup_offsets(spec) if spec is not None else None
+
+        if offsets is None:
+            return filter(predicate, self.iter_expenses())
+
+        overrides = self._get_journal().overrides
+        candidates = [
+            row
+            for row in storage.read_records(self.filepath, sorted(offsets))
+            if int(row["id"]) not in overrides
+        ]
+        candidates.extend(row for row in overrides.values() if row is not None)
+
+        return filter(predicate, map(adapter.convert_csv_row_to_expense, candidates))
+
+    def _scan(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_key: SortKey | None = None,
+        keep: int | None = None,
+    ) -> Tuple[Iterable[Expense], Dict]:
+        spec = getattr(filter_strategy, "spec", None)
+        if (
+            spec is None
+            or not parallel.should_scan_in_parallel(self.filepath)
+            or self._lookup_offsets(spec) is not None
+        ):
+            return super()._scan(filter_strategy, sort_key, keep)
+
+        totals = self._summarize(filter_strategy)
+        scanned = parallel.scan_csv(
+            self.filepath, spec, self._get_journal().overrides, sort_key, keep
+        )
+        if scanned is None:
+            return super()._scan(filter_strategy, sort_key, keep)
+
+        expenses, scanned_totals = scanned
+        return expenses, scanned_totals if totals is None else totals
+
+    def _compact(self) -> None:
+        overrides = self._get_journal().overrides
+        if overrides:
+            storage.compact_records(self.filepath, overrides)
+        journal.clear_journal(self.filepath)
+
+        self._journal = None
+        self._indexes = {}
+
+    def _drop_caches(self) -> None:
+        self._journal = None
+        self._indexes = {}
+
+    def get_signature(self) -> List:
+        journal_path = journal.get_journal_path(self.filepath)
+        journal_signature = None
+        if os.path.exists(journal_path):
+            journal_signature = storage.get_file_signature(journal_path)
+
+        return [storage.get_file_signature(self.filepath), journal_signature]
+
+    def _save_edit(self, expense: Expense, changes: Dict) -> None:
+        row = adapter.convert_expense_to_csv_row(expense)
+        indexed_change = "date" in changes or "category" in changes
+
+        if not indexed_change and expense.id not in self._get_journal().overrides:
+            offsets = self._get_index(index.IdIndex).find([expense.id])
+            if len(offsets) == 1 and storage.overwrite_record(
+                self.filepath, offsets[0], row
+            ):
+                return
+
+        self._append_journal([(journal.UPDATE, row)])
+
+    def _append_rows(self, rows: List[Dict[str, str]]) -> None:
+        storage.append_csv_rows(self.filepath, rows)
+
+    def _delete_rows(self, rows: List[Dict[str, str]]) -> None:
+        self._append_journal([(journal.DELETE, row) for row in rows])
+
+    def _insert_rows(self, rows: List[Dict[str, str]]) -> None:
+        self._append_journal([(journal.INSERT, row) for row in rows])
+
+    def _append_journal(self, entries: List[Tuple[str, Dict[str, str]]]) -> None:
+        if not entries:
+            return
+
+        journal.append_journal(self.filepath, self._get_journal(), entries)
+
+        journal_size = journal.get_journal_size(self.filepath)
+        threshold = max(
+            const.COMPACTION_MIN_JOURNAL_BYTES,
+            os.path.getsize(self.filepath) * const.COMPACTION_JOURNAL_RATIO,
+        )
+        if journal_size > threshold:
+            self._compact()
+
+    def _get_journal(self) -> journal.Journal:
+        if self._journal is None:
+            epoch = storage.get_metadata(self.filepath)["epoch"]
+            self._journal = journal.load_journal(self.filepath, epoch)
+
+        return self._journal
+
+    def _get_index(self, index_type: type):
+        if index_type not in self._indexes:
+            self._indexes[index_type] = index.load_index(self.filepath, index_type)
+
+        return self._indexes[index_type]
+
+    def _lookup_offsets(self, spec) -> Set[int] | None:
+        if not isinstance(spec, FilterSpec):
+            return None
+
+        match spec.kind:
+            case FilterKind.MATCHING:
+                if spec.field == ExpenseField.ID:
+                    return set(self._get_index(index.IdIndex).find(spec.values))
+                if spec.field == ExpenseField.CATEGORY:
+                    return set(self._get_index(index.CategoryIndex).find(spec.values))
+                if spec.field == ExpenseField.DATE:
+                    date_index = self._get_index(index.DateIndex)
+                    return set(date_index.find_dates(spec.values))
+                return None
+            case FilterKind.COMPARISON:
+                return self._lookup_date_range([spec])
+            case FilterKind.ALL:
+                date_comparisons = [
+                    child for child in spec.children if _is_date_comparison(child)
+                ]
+                lookups = [
+                    self._lookup_offsets(child)
+                    for child in spec.children
+                    if not _is_date_comparison(child)
+                ]
+                if date_comparisons:
+                    lookups.append(self._lookup_date_range(date_comparisons))
+
+                lookups = [lookup for lookup in lookups if lookup is not None]
+                if not lookups:
+                    return None
+                return set.intersection(*lookups)
+            case FilterKind.ANY:
+                lookups = [self._lookup_offsets(child) for child in spec.children]
+                if any(lookup is None for lookup in lookups):
+                    return None
+                return set().union(*lookups)
+
+    def _lookup_date_range(self, comparisons: List[FilterSpec]) -> Set[int] | None:
+        start = dt.date.min
+        end = dt.date.max
+        for comparison in comparisons:
+            if not _is_date_comparison(comparison):
+                return None
+
+            value = comparison.values[0]
+            if comparison.comparator in (
+                Comparator.GREATER_THAN,
+                Comparator.GREATER_THAN_EQUAL,
+                Comparator.EQUAL,
+            ):
+                start = max(start, value)
+            if comparison.comparator in (
+                Comparator.LESS_THAN,
+                Comparator.LESS_THAN_EQUAL,
+                Comparator.EQUAL,
+            ):
+                end = min(end, value)
+
+        if start == dt.date.min and end == dt.date.max:
+            return None
+
+        return set(self._get_index(index.DateIndex).find_range(start, end))
+
+
+def _is_date_comparison(spec) -> bool:
+    return (
+        isinstance(spec, FilterSpec)
+        and spec.kind == FilterKind.COMPARISON
+        and spec.field == ExpenseField.DATE
+    )
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+import wallet_watcher.constants as const
+
+if sys.platform.startswith("win"):
+    import msvcrt
+else:
+    import fcntl
+
+
+def get_lock_path(filepath: str) -> str:
+    directory = os.path.dirname(os.path.abspath(filepath))
+    return os.path.join(directory, const.LOCK_FILENAME)
+
+
+@contextmanager
+def file_lock(filepath: str) -> Iterator[None]:
+    with open(get_lock_path(filepath), "a+b") as lock_file:
+        _acquire(lock_file)
+        try:
+            yield
+        finally:
+            _release(lock_file)
+
+
+def _acquire(lock_file: BinaryIO) -> None:
+    if sys.platform.startswith("win"):
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(const.LOCK_RETRY_SECONDS)
+
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+
+def _release(lock_file: BinaryIO) -> None:
+    if sys.platform.startswith("win"):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
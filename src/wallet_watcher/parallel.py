@@ -0,0 +1,136 @@
+import io
+import os
+import csv
+from functools import partial
+from typing import Dict, Iterable, List, Set, Tuple
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.journal as journal
+from wallet_watcher._types import Expense, FilterSpec, SortKey
+
+Overrides = Dict[int, Dict[str, str] | None]
+ChunkResult = Tuple[List[Tuple], Dict, Set[int], int]
+
+
+def get_worker_count() -> int:
+    return int(os.environ.get(const.ENV_WORKERS) or 0) or os.cpu_count() or 1
+
+
+def should_scan_in_parallel(filepath: str) -> bool:
+    return (
+        get_worker_count() > 1 and os.path.getsize(filepath) >= const.PARALLEL_MIN_BYTES
+    )
+
+
+def split_csv(filepath: str, chunks: int) -> List[Tuple[int, int]]:
+    with open(filepath, "rb") as csvfile:
+        csvfile.readline()
+        start = csvfile.tell()
+        size = os.fstat(csvfile.fileno()).st_size
+
+        bounds = [start]
+        for number in range(1, chunks):
+            csvfile.seek(max(start + (size - start) * number // chunks - 1, 0))
+            csvfile.readline()
+            position = csvfile.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+
+    return list(zip(bounds, [*bounds[1:], size]))
+
+
+def scan_csv(
+    filepath: str,
+    spec: FilterSpec,
+    overrides: Overrides,
+    sort_key: SortKey | None = None,
+    keep: int | None = None,
+    workers: int | None = None,
+) -> Tuple[List[Expense], Dict] | None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or get_worker_count()
+    chunks = split_csv(filepath, workers * const.PARALLEL_CHUNKS_PER_WORKER)
+    scan_chunk = partial(_scan_chunk, filepath, spec, overrides, sort_key, keep)
+
+    with ProcessPoolExecutor(min(workers, len(chunks))) as pool:
+        results = list(pool.map(scan_chunk, chunks))
+
+    # A chunk boundary inside a quoted field shows up as an odd running
+    # quote count; the caller then falls back to a sequential scan.
+    quotes = 0
+    for result in results:
+        if result is None:
+            return None
+        quotes += result[3]
+        if quotes % 2:
+            return None
+
+    expenses: List[Expense] = []
+    totals = core.create_totals()
+    seen_ids: Set[int] = set()
+    for rows, chunk_totals, chunk_seen_ids, _ in results:
+        expenses.extend(Expense(*row) for row in rows)
+        merge_totals(totals, chunk_totals)
+        seen_ids |= chunk_seen_ids
+
+    unseen = map(
+        adapter.convert_csv_record_to_expense,
+        journal.iter_unseen_records(overrides, seen_ids),
+    )
+    matched = filter(core.compile_filter(core.rebuild_filter(spec)), unseen)
+    expenses.extend(core.accumulate_totals(matched, totals))
+
+    return expenses, totals
+
+
+def merge_totals(totals: Dict, other: Dict) -> None:
+    totals["total"] += other["total"]
+    totals["count"] += other["count"]
+    category_totals = totals["category"]
+    for category, cents in other["category"].items():
+        category_totals[category] = category_totals.get(category, 0) + cents
+
+
+def _scan_chunk(
+    filepath: str,
+    spec: FilterSpec,
+    overrides: Overrides,
+    sort_key: SortKey | None,
+    keep: int | None,
+    chunk: Tuple[int, int],
+) -> ChunkResult | None:
+    start, end = chunk
+    with open(filepath, "rb") as csvfile:
+        csvfile.seek(start)
+        data = csvfile.read(end - start)
+
+    totals = core.create_totals()
+    seen_ids: Set[int] = set()
+    try:
+        records: Iterable[List[str]] = filter(
+            None, csv.reader(io.StringIO(data.decode(), newline=""))
+        )
+        if overrides:
+            records = journal.apply_overrides(records, overrides, seen_ids)
+
+        predicate = core.compile_filter(core.rebuild_filter(spec))
+        expenses = map(adapter.convert_csv_record_to_expense, records)
+        matched = core.accumulate_totals(filter(predicate, expenses), totals)
+        selected = list(core.select_expenses(matched, sort_key, keep))
+    except (ValueError, csv.Error):
+        return None
+
+    rows = [
+        (
+            expense.id,
+            expense.date,
+            expense.category,
+            expense.description,
+            expense.amount,
+        )
+        for expense in selected
+    ]
+    return rows, totals, seen_ids, data.count(b'"')
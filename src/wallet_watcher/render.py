@@ -1,39 +1,298 @@
-from rich import box
-from rich.table import Table
+import os
+import re
+import sys
+import csv
+import json
+from contextlib import contextmanager
 from wallet_watcher._types import Expense
-from typing import List
+from wallet_watcher.adapter import cents_to_decimal, format_cents, parse_cents
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, TextIO
+
+import wallet_watcher.constants as const
+
+MARKUP_PATTERN = re.compile(r"(\\*)\[([a-z#/@][^[]*?)]")
+EXPORT_FORMATS = ["csv", "jsonl", "tsv"]
+EXPENSE_COLUMNS = [
+    ("ID", "dim", "left"),
+    ("DATE", "white", "left"),
+    ("CATEGORY", "bold cyan", "left"),
+    ("DESCRIPTION", "white", "left"),
+    ("AMOUNT", "bold green", "right"),
+]
+
+
+class PlainTable:
+    def __init__(self, title: str = "", show_header: bool = True, **options) -> None:
+        self.title = title
+        self.show_header = show_header
+        self.headers: List[str] = []
+        self.justify: List[str] = []
+        self.widths: List[int | None] = []
+        self.rows: List[List[str]] = []
+
+    def add_column(
+        self,
+        header: str,
+        justify: str = "left",
+        width: int | None = None,
+        **options,
+    ) -> None:
+        self.headers.append(header)
+        self.justify.append(justify)
+        self.widths.append(width)
+
+    def add_row(self, *cells: str) -> None:
+        self.rows.append(list(cells))
+
+    def __str__(self) -> str:
+        widths = [
+            width if width is not None else max(len(cell) for cell in column)
+            for width, column in zip(self.widths, zip(self.headers, *self.rows))
+        ]
+
+        lines = [self.title] if self.title else []
+        for cells in [self.headers, *self.rows] if self.show_header else self.rows:
+            aligned = [
+                cell.rjust(width) if justify == "right" else cell.ljust(width)
+                for cell, width, justify in zip(cells, widths, self.justify)
+            ]
+            lines.append("  ".join(aligned).rstrip())
+
+        return "\n".join(lines)
+
+
+class PlainConsole:
+    def __init__(self, file: TextIO | None = None) -> None:
+        self.file = file
+
+    def print(self, *objects: Any) -> None:
+        print(
+            *(strip_markup(obj) if isinstance(obj, str) else obj for obj in objects),
+            file=self.file if self.file is not None else sys.stdout,
+        )
+
+
+def get_console(plain: bool = False):
+    if plain:
+        return PlainConsole()
+
+    from rich.console import Console
+
+    return Console()
+
+
+def strip_markup(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        backslashes, tag = match.groups()
+        if len(backslashes) % 2:
+            return backslashes[:-1] + f"[{tag}]"
+        return backslashes
+
+    return MARKUP_PATTERN.sub(replace, text)
+
+
+@contextmanager
+def open_pager(plain: bool = False) -> Iterator[Any]:
+    import shlex
+    import subprocess
+
+    command = shlex.split(os.environ.get("PAGER") or const.DEFAULT_PAGER)
+    environment = {"LESS": const.DEFAULT_LESS_OPTIONS, **os.environ}
+    try:
+        pager = subprocess.Popen(
+            command, stdin=subprocess.PIPE, env=environment, text=True
+        )
+    except OSError:
+        yield get_console(plain)
+        return
+
+    try:
+        if plain:
+            yield PlainConsole(pager.stdin)
+        else:
+            import shutil
+            from rich.console import Console
+
+            width = shutil.get_terminal_size().columns
+            yield Console(file=pager.stdin, force_terminal=True, width=width)
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        pager.wait()
 
 
 def render_table(
-    data: List[Expense],
+    data: Sequence[Expense],
     title: str = "",
+    plain: bool = False,
+    widths: List[int] | None = None,
+    show_header: bool = True,
+    show_edge: bool = True,
 ):
-    table = Table(title=title, box=box.SIMPLE_HEAVY)
+    if widths is None:
+        widths = measure_columns(data[: const.RENDER_SAMPLE_ROWS])
 
-    table.add_column("ID", style="dim", width=4)
-    table.add_column("DATE", style="white")
-    table.add_column("CATEGORY", style="bold cyan")
-    table.add_column("DESCRIPTION", style="white")
-    table.add_column("AMOUNT", style="bold green", justify="right")
+    table = _create_table(
+        plain, title, "SIMPLE_HEAVY", show_header=show_header, show_edge=show_edge
+    )
+    for (header, style, justify), width in zip(EXPENSE_COLUMNS, widths):
+        table.add_column(header, style=style, justify=justify, width=width)
 
     for expense in data:
-        table.add_row(
-            str(expense.id),
-            str(expense.date),
-            expense.category,
-            expense.description,
-            "$" + str(expense.amount),
-        )
+        table.add_row(*_format_expense(expense))
 
     return table
 
 
-def render_category_summary(data):
-    table = Table(title="By Category", title_style="bold underline white")
+def print_expenses(
+    console,
+    data: Sequence[Expense],
+    title: str = "",
+    plain: bool = False,
+    chunk_rows: int = const.RENDER_CHUNK_ROWS,
+) -> None:
+    widths = measure_columns(data[: const.RENDER_SAMPLE_ROWS])
+    if plain or len(data) <= chunk_rows:
+        for start in range(0, len(data), chunk_rows):
+            console.print(
+                render_table(
+                    data[start : start + chunk_rows],
+                    title if start == 0 else "",
+                    plain,
+                    widths,
+                    show_header=start == 0,
+                    show_edge=len(data) <= chunk_rows,
+                )
+            )
+        return
+
+    # rich spends most of a large listing laying out cells, so only the header
+    # goes through a Table and the rows are written pre-formatted to match it.
+    console.print(render_table([], title, plain, widths, show_edge=False))
+    row_format = _get_row_format(console, widths)
+    for start in range(0, len(data), chunk_rows):
+        console.file.write(
+            "".join(
+                row_format.format(*_format_expense(expense))
+                for expense in data[start : start + chunk_rows]
+            )
+        )
+
+
+def write_records(
+    file: TextIO, records: Iterable[Sequence[str]], output_format: str
+) -> None:
+    if output_format == "jsonl":
+        file.writelines(map(_format_json_line, records))
+        return
+
+    delimiter = "\t" if output_format == "tsv" else ","
+    writer = csv.writer(file, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(const.FIELD_NAMES)
+    writer.writerows(records)
+
+
+def measure_columns(sample: Sequence[Expense]) -> List[int]:
+    widths = [len(header) for header, _, _ in EXPENSE_COLUMNS]
+    for expense in sample:
+        for column, cell in enumerate(_format_expense(expense)):
+            widths[column] = max(widths[column], len(cell))
+
+    return widths
+
+
+def render_category_summary(data, plain: bool = False):
+    table = _create_table(plain, "By Category", title_style="bold underline white")
     table.add_column("Category", style="cyan", no_wrap=True)
     table.add_column("Total", style="bold green", justify="right")
 
     for category, total in data:
-        table.add_row(category, f"${total:.2f}")
+        table.add_row(category, format_amount(total))
+
+    return table
+
+
+def render_period_report(data: Dict[str, Dict], title: str = "", plain: bool = False):
+    categories = sorted(
+        {category for totals in data.values() for category in totals["category"]}
+    )
+
+    table = _create_table(plain, title, "SIMPLE_HEAVY")
+    table.add_column("PERIOD", style="white")
+    for category in categories:
+        table.add_column(category, style="cyan", justify="right")
+    table.add_column("ENTRIES", style="dim", justify="right")
+    table.add_column("TOTAL", style="bold green", justify="right")
+
+    for period, totals in sorted(data.items()):
+        category_totals = totals["category"]
+        table.add_row(
+            period,
+            *[
+                (
+                    format_amount(category_totals[category])
+                    if category in category_totals
+                    else "-"
+                )
+                for category in categories
+            ],
+            str(totals["count"]),
+            format_amount(totals["total"]),
+        )
 
     return table
+
+
+def format_amount(cents: int) -> str:
+    return f"${cents_to_decimal(cents):.2f}"
+
+
+def _format_expense(expense: Expense) -> List[str]:
+    return [
+        str(expense.id),
+        str(expense.date),
+        expense.category,
+        expense.description,
+        format_amount(expense.amount),
+    ]
+
+
+def _format_json_line(record: Sequence[str]) -> str:
+    id, date, category, description, amount = record
+    fields = json.dumps(
+        {"id": int(id), "date": date, "category": category, "description": description},
+        separators=(",", ":"),
+    )
+    # json has no exact decimal type, so the amount is spliced in as a
+    # canonical number literal rather than going through float.
+    return f'{fields[:-1]},"amount":{format_cents(parse_cents(amount))}}}\n'
+
+
+def _get_row_format(console, widths: List[int]) -> str:
+    from rich.text import Text
+
+    cells = []
+    for (_, style, justify), width in zip(EXPENSE_COLUMNS, widths):
+        with console.capture() as capture:
+            console.print(Text("x", style=style), end="")
+        prefix, _, suffix = capture.get().partition("x")
+        alignment = ">" if justify == "right" else "<"
+        cells.append(f"{prefix}{{:{alignment}{width}}}{suffix}")
+
+    return " " + "   ".join(cells) + " \n"
+
+
+def _create_table(plain: bool, title: str, box_name: str | None = None, **options):
+    if plain:
+        return PlainTable(title, **options)
+
+    from rich import box
+    from rich.table import Table
+
+    if box_name is not None:
+        options["box"] = getattr(box, box_name)
+    return Table(title=title, **options)
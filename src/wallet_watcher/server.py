@@ -0,0 +1,175 @@
+import os
+import time
+import signal
+import socket
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+import wallet_watcher.constants as const
+import wallet_watcher.daemon as daemon
+
+SERVER_METHODS = daemon.METHODS | {"stats"}
+
+
+class LatencyMetrics:
+    def __init__(self, samples: int = const.DAEMON_LATENCY_SAMPLES) -> None:
+        self.samples = samples
+        self._counts: Dict[str, int] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, method: str, seconds: float) -> None:
+        self._counts[method] = self._counts.get(method, 0) + 1
+        latencies = self._latencies.get(method)
+        if latencies is None:
+            latencies = self._latencies[method] = deque(maxlen=self.samples)
+        latencies.append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for method, latencies in self._latencies.items():
+            ordered = sorted(latencies)
+            summary[method] = {
+                "count": self._counts[method],
+                "mean_ms": 1000 * sum(ordered) / len(ordered),
+                "p50_ms": 1000 * _percentile(ordered, 0.50),
+                "p99_ms": 1000 * _percentile(ordered, 0.99),
+                "max_ms": 1000 * ordered[-1],
+            }
+
+        return summary
+
+
+class DaemonServer:
+    def __init__(
+        self,
+        resident: daemon.ResidentLedger,
+        max_pending: int = const.DAEMON_MAX_PENDING,
+    ) -> None:
+        self.resident = resident
+        self.metrics = LatencyMetrics()
+        self.batches = 0
+        self._pending: asyncio.Queue[Tuple[daemon.Request, asyncio.Future]] = (
+            asyncio.Queue(max_pending)
+        )
+
+    async def run(self, socket_path: str) -> None:
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopped.set)
+
+        await self.serve_until(socket_path, stopped)
+
+    async def serve_until(self, socket_path: str, stopped: asyncio.Event) -> None:
+        worker = asyncio.create_task(self.process_requests())
+        server = await asyncio.start_unix_server(
+            self.handle_client, socket_path, limit=const.DAEMON_MAX_MESSAGE_BYTES
+        )
+        os.chmod(socket_path, 0o600)
+
+        try:
+            async with server:
+                await stopped.wait()
+        finally:
+            worker.cancel()
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                line = await asyncio.wait_for(
+                    reader.readline(), const.DAEMON_TIMEOUT_SECONDS
+                )
+                if not line:
+                    break
+
+                writer.write(await self.submit(line))
+                await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def submit(self, line: bytes) -> bytes:
+        started = time.perf_counter()
+        try:
+            request = daemon.parse_request(line, SERVER_METHODS)
+        except ValueError as error:
+            return daemon.encode_error(error)
+
+        if request.method == "stats":
+            response = daemon.encode_message({"result": self.get_stats()})
+        else:
+            future = asyncio.get_running_loop().create_future()
+            await self._pending.put((request, future))
+            response = await future
+
+        self.metrics.record(request.method, time.perf_counter() - started)
+        return response
+
+    async def process_requests(self) -> None:
+        while True:
+            batch = [await self._pending.get()]
+            while not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+
+            responses = await asyncio.to_thread(
+                daemon.execute_batch,
+                self.resident,
+                [request for request, _ in batch],
+            )
+            self.batches += 1
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    def get_stats(self) -> Dict:
+        return {
+            "requests": self.metrics.summary(),
+            "batches": self.batches,
+            "pending": self._pending.qsize(),
+        }
+
+
+def serve(
+    directory: str, socket_path: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+) -> None:
+    claim_socket(socket_path)
+    resident = daemon.ResidentLedger(directory, undo_depth)
+
+    try:
+        resident.get_store()
+        asyncio.run(DaemonServer(resident).run(socket_path))
+    finally:
+        resident.close()
+        release_socket(socket_path)
+
+
+def claim_socket(socket_path: str) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    if not os.path.exists(socket_path):
+        return
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+    else:
+        raise OSError(f"A wallet daemon is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def release_socket(socket_path: str) -> None:
+    try:
+        os.remove(socket_path)
+    except FileNotFoundError:
+        pass
+
+
+def _percentile(ordered, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
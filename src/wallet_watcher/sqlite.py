@@ -0,0 +1,306 @@
+import sqlite3
+import datetime as dt
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+from wallet_watcher._types import (
+    Expense,
+    ExpenseField,
+    FilterKind,
+    FilterSpec,
+    FilterStrategy,
+    SortKey,
+)
+from wallet_watcher.ledger import Ledger
+
+SQL_COLUMNS = {
+    ExpenseField.ID: "id",
+    ExpenseField.DATE: "day",
+    ExpenseField.CATEGORY: "category",
+    ExpenseField.DESCRIPTION: "description",
+    ExpenseField.AMOUNT: "cents",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    position INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    cents INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS expenses_id ON expenses (id);
+CREATE INDEX IF NOT EXISTS expenses_day ON expenses (day);
+CREATE INDEX IF NOT EXISTS expenses_category ON expenses (category);
+CREATE INDEX IF NOT EXISTS expenses_cents ON expenses (cents);
+CREATE TABLE IF NOT EXISTS metadata (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+SELECT_COLUMNS = "id, day, category, description, cents"
+
+
+class SqliteLedger(Ledger):
+    def __init__(
+        self, filepath: str, undo_depth: int = const.DEFAULT_UNDO_DEPTH
+    ) -> None:
+        super().__init__(filepath, undo_depth)
+        self._connection: sqlite3.Connection | None = None
+
+    @classmethod
+    def create(
+        cls,
+        filepath: str,
+        expenses: Iterable[Expense],
+        next_id: int = 1,
+        undo_depth: int = const.DEFAULT_UNDO_DEPTH,
+    ) -> "SqliteLedger":
+        ledger = cls(filepath, undo_depth)
+        connection = ledger._connect()
+        with connection:
+            connection.execute("DELETE FROM expenses")
+            connection.executemany(
+                f"INSERT INTO expenses ({SELECT_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                map(_to_record, expenses),
+            )
+            max_id = connection.execute("SELECT MAX(id) FROM expenses").fetchone()[0]
+            _set_next_id(connection, max(next_id, (max_id or 0) + 1))
+
+        return ledger
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def iter_expenses(self) -> Iterator[Expense]:
+        cursor = self._connect().execute(
+            f"SELECT {SELECT_COLUMNS} FROM expenses ORDER BY position"
+        )
+        return map(_to_expense, cursor)
+
+    def iter_query(self, filter_strategy: FilterStrategy) -> Iterator[Expense]:
+        where, params, exact = translate_filter(filter_strategy)
+        cursor = self._connect().execute(
+            f"SELECT {SELECT_COLUMNS} FROM expenses WHERE {where} ORDER BY position",
+            params,
+        )
+
+        expenses = map(_to_expense, cursor)
+        if exact:
+            return expenses
+        return filter(core.compile_filter(filter_strategy), expenses)
+
+    def list_expenses(
+        self,
+        filter_strategy: FilterStrategy,
+        sort_field: ExpenseField | Sequence[SortKey] = ExpenseField.DATE,
+        reverse: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Tuple[List[Expense], Dict]:
+        where, params, exact = translate_filter(filter_strategy)
+        if not exact:
+            return super().list_expenses(
+                filter_strategy, sort_field, reverse, limit, offset
+            )
+
+        order = ", ".join(
+            f"{SQL_COLUMNS[sort_key.field]} {'DESC' if sort_key.descending else 'ASC'}"
+            for sort_key in core.get_sort_keys(sort_field, reverse)
+        )
+        cursor = self._connect().execute(
+            f"SELECT {SELECT_COLUMNS} FROM expenses WHERE {where}"
+            f" ORDER BY {order}, position"
+            " LIMIT ? OFFSET ?",
+            params + [-1 if limit is None else limit, offset],
+        )
+        expenses = list(map(_to_expense, cursor))
+
+        return expenses, self.calculate_total(filter_strategy)
+
+    def calculate_total(self, filter_strategy: FilterStrategy) -> Dict:
+        totals = self._summarize(filter_strategy)
+        if totals is not None:
+            return totals
+
+        where, params, exact = translate_filter(filter_strategy)
+        if not exact:
+            return super().calculate_total(filter_strategy)
+
+        cursor = self._connect().execute(
+            "SELECT category, SUM(cents), COUNT(*) FROM expenses"
+            f" WHERE {where} GROUP BY category",
+            params,
+        )
+
+        totals = core.create_totals()
+        for category, cents, count in cursor:
+            totals["category"][category] = cents
+            totals["count"] += count
+            totals["total"] += cents
+
+        return totals
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+
+    def next_id(self) -> int:
+        row = (
+            self._connect()
+            .execute("SELECT value FROM metadata WHERE name = 'next_id'")
+            .fetchone()
+        )
+        return row[0] if row is not None else 1
+
+    def _compact(self) -> None:
+        self._connect().execute("VACUUM")
+
+    def _append_rows(self, rows: List[Dict[str, str]]) -> None:
+        self._insert_rows(rows)
+
+    def _delete_rows(self, rows: List[Dict[str, str]]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM expenses WHERE id = ?", [(int(row["id"]),) for row in rows]
+            )
+
+    def _insert_rows(self, rows: List[Dict[str, str]]) -> None:
+        if not rows:
+            return
+
+        records = [_to_record(adapter.convert_csv_row_to_expense(row)) for row in rows]
+        with self._connect() as connection:
+            connection.executemany(
+                f"INSERT INTO expenses ({SELECT_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                records,
+            )
+            next_id = max(record[0] for record in records) + 1
+            _set_next_id(connection, max(self.next_id(), next_id))
+
+    def _save_edit(self, expense: Expense, changes: Dict) -> None:
+        id, day, category, description, cents = _to_record(expense)
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE expenses SET day = ?, category = ?, description = ?, cents = ?"
+                " WHERE position = (SELECT MAX(position) FROM expenses WHERE id = ?)",
+                (day, category, description, cents, id),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.filepath)
+            self._connection.executescript(SCHEMA)
+
+        return self._connection
+
+
+def translate_filter(filter_strategy: FilterStrategy) -> Tuple[str, List[Any], bool]:
+    translated = _translate(getattr(filter_strategy, "spec", filter_strategy))
+    if translated is None:
+        return "1", [], False
+
+    return translated
+
+
+def _translate(node) -> Tuple[str, List[Any], bool] | None:
+    if not isinstance(node, FilterSpec):
+        return None
+
+    match node.kind:
+        case FilterKind.MATCHING:
+            if len(node.values) > const.SQL_MAX_MATCHING_VALUES:
+                return None
+
+            values = []
+            for value in node.values:
+                encoded_value = _encode_value(node.field, value)
+                if encoded_value is not None and (
+                    node.field != ExpenseField.AMOUNT or isinstance(encoded_value, int)
+                ):
+                    values.append(encoded_value)
+
+            if not values:
+                return "0", [], True
+            placeholders = ", ".join("?" * len(values))
+            return f"{SQL_COLUMNS[node.field]} IN ({placeholders})", values, True
+        case FilterKind.COMPARISON:
+            symbol = const.COMPARATOR_SYMBOLS[node.comparator]
+            if symbol == "==":
+                symbol = "="
+            value = _encode_value(node.field, node.values[0])
+            return f"{SQL_COLUMNS[node.field]} {symbol} ?", [value], True
+        case FilterKind.ALL:
+            clauses: List[str] = []
+            params: List[Any] = []
+            exact = True
+            for child in node.children:
+                translated = _translate(child)
+                if translated is None:
+                    exact = False
+                    continue
+                clauses.append(translated[0])
+                params.extend(translated[1])
+                exact = exact and translated[2]
+
+            if not clauses:
+                return "1", [], exact
+            return "(" + " AND ".join(clauses) + ")", params, exact
+        case FilterKind.ANY:
+            clauses = []
+            params = []
+            exact = True
+            for child in node.children:
+                translated = _translate(child)
+                if translated is None:
+                    return None
+                clauses.append(translated[0])
+                params.extend(translated[1])
+                exact = exact and translated[2]
+
+            if not clauses:
+                return "0", [], True
+            return "(" + " OR ".join(clauses) + ")", params, exact
+
+    return None
+
+
+def _encode_value(field: ExpenseField, value: Any) -> Any:
+    match field:
+        case ExpenseField.DATE:
+            return value.toordinal()
+        case _:
+            return value
+
+
+def _to_record(expense: Expense) -> Tuple[int, int, str, str, int]:
+    return (
+        expense.id,
+        expense.date.toordinal(),
+        expense.category,
+        expense.description,
+        expense.amount,
+    )
+
+
+def _to_expense(record: Tuple) -> Expense:
+    id, day, category, description, cents = record
+    return Expense(
+        id,
+        dt.date.fromordinal(day),
+        category,
+        description,
+        cents,
+    )
+
+
+def _set_next_id(connection: sqlite3.Connection, next_id: int) -> None:
+    connection.execute(
+        "INSERT OR REPLACE INTO metadata (name, value) VALUES ('next_id', ?)",
+        (next_id,),
+    )
@@ -0,0 +1,290 @@
+import io
+import os
+import csv
+import json
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import wallet_watcher.constants as const
+
+
+def load_csv(filepath: str) -> List[Dict[str, str]]:
+    with open(filepath, "r", newline="") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def save_csv(filepath: str, data: List[Dict[str, str]]) -> None:
+    previous_metadata = load_metadata(filepath)
+
+    temp_path = get_temp_path(filepath)
+    with open(temp_path, "w", newline="") as csvfile:
+        csv_writer: csv.DictWriter = csv.DictWriter(csvfile, const.FIELD_NAMES)
+        csv_writer.writeheader()
+        csv_writer.writerows(data)
+    os.replace(temp_path, filepath)
+
+    next_id = max((int(row["id"]) for row in data), default=0) + 1
+    if previous_metadata is not None:
+        next_id = max(next_id, previous_metadata["next_id"])
+    _write_rewritten_metadata(filepath, next_id, len(data))
+
+
+def create_csv(filepath: str, data: Iterable[Dict[str, str]], next_id: int = 1) -> int:
+    count = 0
+    temp_path = get_temp_path(filepath)
+    with open(temp_path, "w", newline="") as csvfile:
+        csv_writer: csv.DictWriter = csv.DictWriter(csvfile, const.FIELD_NAMES)
+        csv_writer.writeheader()
+        for row in data:
+            csv_writer.writerow(row)
+            next_id = max(next_id, int(row["id"]) + 1)
+            count += 1
+    os.replace(temp_path, filepath)
+
+    _write_rewritten_metadata(filepath, next_id, count)
+
+    return count
+
+
+def append_csv(filepath: str, data: Dict[str, str]) -> None:
+    append_csv_rows(filepath, [data])
+
+
+def append_csv_rows(filepath: str, data: List[Dict[str, str]]) -> None:
+    if not data:
+        return
+
+    previous_metadata = load_metadata(filepath)
+
+    with open(filepath, "a", newline="") as csvfile:
+        csv.writer(csvfile).writerows(map(itemgetter(*const.FIELD_NAMES), data))
+
+    if previous_metadata is None:
+        rebuild_metadata(filepath)
+    else:
+        write_metadata(
+            filepath,
+            max(previous_metadata["next_id"], max(int(row["id"]) for row in data) + 1),
+            previous_metadata["generation"],
+            previous_metadata["epoch"],
+            previous_metadata["count"] + len(data),
+        )
+
+
+def iter_records(
+    filepath: str, start_offset: int | None = None
+) -> Iterator[Tuple[int, List[str]]]:
+    with open(filepath, "rb") as csvfile:
+        if start_offset is None:
+            _read_record(csvfile)
+        else:
+            csvfile.seek(start_offset)
+
+        while True:
+            offset = csvfile.tell()
+            record = _read_record(csvfile)
+            if record is None:
+                return
+            if record:
+                yield offset, record
+
+
+def iter_rows(filepath: str) -> Iterator[Dict[str, str]]:
+    with open(filepath, "r", newline="") as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def iter_fields(filepath: str) -> Iterator[List[str]]:
+    with open(filepath, "r", newline="") as csvfile:
+        csv_reader = csv.reader(csvfile)
+        next(csv_reader, None)
+        for record in csv_reader:
+            if record:
+                yield record
+
+
+def read_records(filepath: str, offsets: Iterable[int]) -> List[Dict[str, str]]:
+    rows = []
+    with open(filepath, "rb") as csvfile:
+        for offset in sorted(offsets):
+            csvfile.seek(offset)
+            rows.append(dict(zip(const.FIELD_NAMES, _read_record(csvfile))))
+
+    return rows
+
+
+def compact_records(filepath: str, overrides: Dict[int, Dict[str, str] | None]):
+    previous_metadata = get_metadata(filepath)
+    remaining = dict(overrides)
+    count = 0
+
+    temp_path = get_temp_path(filepath)
+    with open(filepath, "rb") as source, open(temp_path, "wb") as target:
+        target.write(source.readline())
+        while True:
+            offset = source.tell()
+            record = _read_record(source)
+            if record is None:
+                break
+            if not record:
+                continue
+
+            id = int(record[0])
+            if id not in overrides:
+                end = source.tell()
+                source.seek(offset)
+                target.write(source.read(end - offset))
+                count += 1
+            elif overrides[id] is not None:
+                target.write(encode_row(overrides[id]))
+                count += 1
+            remaining.pop(id, None)
+
+        for row in remaining.values():
+            if row is not None:
+                target.write(encode_row(row))
+                count += 1
+    os.replace(temp_path, filepath)
+
+    _write_rewritten_metadata(filepath, previous_metadata["next_id"], count)
+
+
+def overwrite_record(filepath: str, offset: int, data: Dict[str, str]) -> bool:
+    previous_metadata = get_metadata(filepath)
+    encoded_row = encode_row(data)
+
+    with open(filepath, "r+b") as csvfile:
+        csvfile.seek(offset)
+        if _read_record(csvfile) is None or csvfile.tell() - offset != len(encoded_row):
+            return False
+
+        csvfile.seek(offset)
+        csvfile.write(encoded_row)
+
+    write_metadata(
+        filepath,
+        previous_metadata["next_id"],
+        previous_metadata["generation"],
+        previous_metadata["epoch"],
+        previous_metadata["count"],
+    )
+
+    return True
+
+
+def encode_row(data: Dict[str, str]) -> bytes:
+    buffer = io.StringIO(newline="")
+    csv.DictWriter(buffer, const.FIELD_NAMES).writerow(data)
+
+    return buffer.getvalue().encode()
+
+
+def get_next_id(filepath: str) -> int:
+    return get_metadata(filepath)["next_id"]
+
+
+def get_metadata(filepath: str) -> Dict:
+    metadata = load_metadata(filepath)
+    if metadata is None:
+        metadata = rebuild_metadata(filepath)
+
+    return metadata
+
+
+def get_metadata_path(filepath: str) -> str:
+    return filepath + const.METADATA_SUFFIX
+
+
+def get_temp_path(filepath: str) -> str:
+    return f"{filepath}.{os.getpid()}.tmp"
+
+
+def get_file_signature(filepath: str) -> List[int]:
+    stat = os.stat(filepath)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_metadata(filepath: str) -> Dict | None:
+    metadata = _read_metadata_file(filepath)
+    if metadata is None or not all(name in metadata for name in const.METADATA_FIELDS):
+        return None
+    if metadata["signature"] != get_file_signature(filepath):
+        return None
+
+    return metadata
+
+
+def rebuild_metadata(filepath: str) -> Dict:
+    max_id = 0
+    count = 0
+    with open(filepath, "r", newline="") as csvfile:
+        csv_reader = csv.reader(csvfile)
+        next(csv_reader, None)
+        for row in csv_reader:
+            if row:
+                max_id = max(max_id, int(row[0]))
+                count += 1
+
+    previous_metadata = _read_metadata_file(filepath) or {}
+    return write_metadata(
+        filepath,
+        max(max_id + 1, previous_metadata.get("next_id", 1)),
+        previous_metadata.get("generation", 0) + 1,
+        previous_metadata.get("epoch", 0),
+        count,
+    )
+
+
+def write_metadata(
+    filepath: str, next_id: int, generation: int, epoch: int, count: int
+) -> Dict:
+    metadata = {
+        "next_id": next_id,
+        "generation": generation,
+        "epoch": epoch,
+        "count": count,
+        "signature": get_file_signature(filepath),
+    }
+
+    metadata_path = get_metadata_path(filepath)
+    temp_path = get_temp_path(metadata_path)
+    with open(temp_path, "w") as metadata_file:
+        json.dump(metadata, metadata_file)
+    os.replace(temp_path, metadata_path)
+
+    return metadata
+
+
+def _write_rewritten_metadata(filepath: str, next_id: int, count: int) -> Dict:
+    previous_metadata = _read_metadata_file(filepath) or {}
+    return write_metadata(
+        filepath,
+        next_id,
+        previous_metadata.get("generation", 0) + 1,
+        previous_metadata.get("epoch", 0) + 1,
+        count,
+    )
+
+
+def _read_metadata_file(filepath: str) -> Dict | None:
+    try:
+        with open(get_metadata_path(filepath), "r") as metadata_file:
+            metadata = json.load(metadata_file)
+    except (OSError, ValueError):
+        return None
+
+    return metadata if isinstance(metadata, dict) else None
+
+
+def _read_record(csvfile) -> List[str] | None:
+    line = csvfile.readline()
+    if not line:
+        return None
+
+    while line.count(b'"') % 2:
+        continuation = csvfile.readline()
+        if not continuation:
+            break
+        line += continuation
+
+    return next(csv.reader([line.decode()]), [])
@@ -0,0 +1,155 @@
+import datetime as dt
+from array import array
+from typing import Dict, Iterable, Iterator, List
+
+from wallet_watcher._types import Expense
+from wallet_watcher.adapter import parse_cents, parse_day
+
+
+class ExpenseStore:
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.days = array("i")
+        self.cents = array("q")
+        self.category_codes = array("I")
+        self.description_codes = array("I")
+        self.categories: List[str] = []
+        self.descriptions: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._description_lookup: Dict[str, int] = {}
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Expense]) -> "ExpenseStore":
+        store = cls()
+        for expense in expenses:
+            store.append(expense)
+
+        return store
+
+    @classmethod
+    def from_records(cls, records: Iterable[List[str]]) -> "ExpenseStore":
+        store = cls()
+        append_id = store.ids.append
+        append_day = store.days.append
+        append_cents = store.cents.append
+        append_category = store.category_codes.append
+        append_description = store.description_codes.append
+        category_lookup = store._category_lookup
+        description_lookup = store._description_lookup
+
+        for id, date, category, description, amount in records:
+            category_code = category_lookup.get(category)
+            if category_code is None:
+                category_code = store.encode_category(category)
+            description_code = description_lookup.get(description)
+            if description_code is None:
+                description_code = store.encode_description(description)
+
+            append_id(int(id))
+            append_day(parse_day(date))
+            append_cents(parse_cents(amount))
+            append_category(category_code)
+            append_description(description_code)
+
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Expense]:
+        for index in range(len(self.ids)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Expense:
+        return Expense(
+            self.ids[index],
+            dt.date.fromordinal(self.days[index]),
+            self.categories[self.category_codes[index]],
+            self.descriptions[self.description_codes[index]],
+            self.cents[index],
+        )
+
+    def __setitem__(self, index: int, expense: Expense) -> None:
+        self.ids[index] = expense.id
+        self.days[index] = expense.date.toordinal()
+        self.category_codes[index] = self.encode_category(expense.category)
+        self.description_codes[index] = self.encode_description(expense.description)
+        self.cents[index] = expense.amount
+
+    def append(self, expense: Expense) -> None:
+        self.append_row(
+            expense.id,
+            expense.date.toordinal(),
+            expense.category,
+            expense.description,
+            expense.amount,
+        )
+
+    def append_row(
+        self, id: int, day: int, category: str, description: str, cents: int
+    ) -> None:
+        self.ids.append(id)
+        self.days.append(day)
+        self.category_codes.append(self.encode_category(category))
+        self.description_codes.append(self.encode_description(description))
+        self.cents.append(cents)
+
+    def encode_category(self, category: str) -> int:
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_lookup[category] = code
+
+        return code
+
+    def encode_description(self, description: str) -> int:
+        code = self._description_lookup.get(description)
+        if code is None:
+            code = len(self.descriptions)
+            self.descriptions.append(description)
+            self._description_lookup[description] = code
+
+        return code
+
+    def find_category(self, category: str) -> int | None:
+        return self._category_lookup.get(category)
+
+    def find_description(self, description: str) -> int | None:
+        return self._description_lookup.get(description)
+
+    def find_id(self, id: int) -> int | None:
+        try:
+            return len(self.ids) - 1 - self.ids[::-1].index(id)
+        except ValueError:
+            return None
+
+    def take(self, indices: Iterable[int]) -> "ExpenseStore":
+        store = self._empty_like()
+        for index in indices:
+            store.ids.append(self.ids[index])
+            store.days.append(self.days[index])
+            store.cents.append(self.cents[index])
+            store.category_codes.append(self.category_codes[index])
+            store.description_codes.append(self.description_codes[index])
+
+        return store
+
+    def copy(self) -> "ExpenseStore":
+        store = self._empty_like()
+        store.ids = array("q", self.ids)
+        store.days = array("i", self.days)
+        store.cents = array("q", self.cents)
+        store.category_codes = array("I", self.category_codes)
+        store.description_codes = array("I", self.description_codes)
+
+        return store
+
+    def _empty_like(self) -> "ExpenseStore":
+        store = ExpenseStore()
+        store.categories = self.categories
+        store.descriptions = self.descriptions
+        store._category_lookup = self._category_lookup
+        store._description_lookup = self._description_lookup
+
+        return store
@@ -0,0 +1,96 @@
+import os
+import json
+from dataclasses import dataclass
+from typing import Dict, List
+
+import wallet_watcher.constants as const
+import wallet_watcher.storage as storage
+
+ADD = "add"
+DELETE = "delete"
+EDIT = "edit"
+
+
+@dataclass
+class UndoEntry:
+    operation: str
+    rows: List[Dict[str, str]]
+
+
+def get_undo_path(filepath: str) -> str:
+    return filepath + const.UNDO_SUFFIX
+
+
+def load_undo_log(filepath: str) -> List[UndoEntry]:
+    entries = []
+    for line in _read_lines(filepath):
+        entry = _decode_entry(line)
+        if entry is not None:
+            entries.append(entry)
+
+    return entries
+
+
+def push_undo(filepath: str, entry: UndoEntry, depth: int) -> None:
+    push_undo_entries(filepath, [entry], depth)
+
+
+def push_undo_entries(filepath: str, entries: List[UndoEntry], depth: int) -> None:
+    if depth <= 0 or not entries:
+        return
+
+    encoded_entries = [
+        json.dumps({"operation": entry.operation, "rows": entry.rows})
+        for entry in entries[-depth:]
+    ]
+    lines = _read_lines(filepath)
+    if len(lines) + len(encoded_entries) <= depth:
+        with open(get_undo_path(filepath), "a") as undo_file:
+            undo_file.write("\n".join(encoded_entries) + "\n")
+        return
+
+    kept = lines[len(lines) - depth + len(encoded_entries) :]
+    _write_lines(filepath, kept + encoded_entries)
+
+
+def pop_undo(filepath: str) -> UndoEntry | None:
+    lines = _read_lines(filepath)
+    while lines:
+        entry = _decode_entry(lines.pop())
+        if entry is not None:
+            _write_lines(filepath, lines)
+            return entry
+
+    _write_lines(filepath, lines)
+    return None
+
+
+def _read_lines(filepath: str) -> List[str]:
+    try:
+        with open(get_undo_path(filepath), "r") as undo_file:
+            return [line for line in undo_file.read().splitlines() if line]
+    except OSError:
+        return []
+
+
+def _write_lines(filepath: str, lines: List[str]) -> None:
+    undo_path = get_undo_path(filepath)
+    if not lines:
+        try:
+            os.remove(undo_path)
+        except FileNotFoundError:
+            pass
+        return
+
+    temp_path = storage.get_temp_path(undo_path)
+    with open(temp_path, "w") as undo_file:
+        undo_file.write("\n".join(lines) + "\n")
+    os.replace(temp_path, undo_path)
+
+
+def _decode_entry(line: str) -> UndoEntry | None:
+    try:
+        entry = json.loads(line)
+        return UndoEntry(entry["operation"], entry["rows"])
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,34 @@
+import datetime as dt
+
+import pytest
+
+from wallet_watcher._types import Expense
+
+
+@pytest.fixture
+def expense_list():
+    data = [
+        Expense(
+            1,
+            dt.datetime.fromisoformat("2025-06-01").date(),
+            "Food",
+            "Wendys",
+            1023,
+        ),
+        Expense(
+            2,
+            dt.datetime.fromisoformat("2025-06-01").date(),
+            "Gaming",
+            "League",
+            5000,
+        ),
+        Expense(
+            3,
+            dt.datetime.fromisoformat("2025-06-03").date(),
+            "School",
+            "Textbooks",
+            2050,
+        ),
+    ]
+
+    return data
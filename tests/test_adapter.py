@@ -1,6 +1,8 @@
 import datetime as dt
 from decimal import Decimal
 
+import pytest
+
 import wallet_watcher.adapter as adapter
 from wallet_watcher._types import Expense
 
@@ -19,7 +21,7 @@ def test_csv_to_expense():
         dt.datetime.fromisoformat("2025-06-01").date(),
         "Gaming",
         "CoD",
-        Decimal("59.99"),
+        5999,
     )
 
     assert expense == correct_expense
@@ -39,7 +41,7 @@ def test_csv_to_expense_2():
         dt.datetime.fromisoformat("2025-02-18").date(),
         "General",
         "N/A",
-        Decimal("1099.00"),
+        109900,
     )
 
     assert expense == correct_expense
@@ -51,7 +53,7 @@ def test_expense_to_csv():
         dt.datetime.fromisoformat("2025-11-05").date(),
         "Food",
         "McDonalds",
-        Decimal("20.2532"),
+        2025,
     )
     csv = adapter.convert_expense_to_csv_row(data)
     correct_csv = {
@@ -71,7 +73,7 @@ def test_expense_to_csv_2():
         dt.datetime.fromisoformat("1900-11-15").date(),
         "General",
         "N/A",
-        Decimal("2"),
+        200,
     )
     csv = adapter.convert_expense_to_csv_row(data)
     correct_csv = {
@@ -83,3 +85,65 @@ def test_expense_to_csv_2():
     }
 
     assert csv == correct_csv
+
+
+def test_csv_record_to_expense():
+    expense = adapter.convert_csv_record_to_expense(
+        ["7", "2025-06-01", "Gaming", "CoD", "59.99"]
+    )
+
+    assert expense == Expense(7, dt.date(2025, 6, 1), "Gaming", "CoD", 5999)
+
+
+def test_parse_date():
+    assert adapter.parse_date("2025-02-18") == dt.date(2025, 2, 18)
+    assert adapter.parse_day("2025-02-18") == dt.date(2025, 2, 18).toordinal()
+
+
+def test_parse_date_rejects_invalid():
+    with pytest.raises(ValueError):
+        adapter.parse_date("2025-02-30")
+
+
+@pytest.mark.parametrize(
+    "date",
+    ["2025-06-01", "2025-+1-01", "+025-01-01", "2025- 1-01", "2025-01-+1", "2025-1-01"],
+)
+def test_parse_date_matches_strptime(date):
+    try:
+        expected = dt.datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        with pytest.raises(ValueError):
+            adapter.parse_date(date)
+    else:
+        assert adapter.parse_date(date) == expected
+
+
+def test_parse_cents():
+    assert adapter.parse_cents("1099.00") == 109900
+    assert adapter.parse_cents("0.05") == 5
+    assert adapter.parse_cents("-1.50") == -150
+    assert adapter.parse_cents("2") == 200
+    assert adapter.parse_cents("2.5") == 250
+    assert adapter.parse_cents("1.005") == 100
+
+
+@pytest.mark.parametrize(
+    "amount",
+    ["1.5 ", " 1.50", "1.50\n", "+1.50", ".50", "1.", "1_0.50", "1.5e1", "-.50"],
+)
+def test_parse_cents_matches_decimal(amount):
+    assert adapter.parse_cents(amount) == adapter.decimal_to_cents(Decimal(amount))
+
+
+def test_decimal_to_cents_rounds_half_even():
+    assert adapter.decimal_to_cents(Decimal("3.335")) == 334
+    assert adapter.decimal_to_cents(Decimal("3.345")) == 334
+    assert adapter.decimal_to_cents(Decimal("-0.005")) == 0
+
+
+def test_format_cents():
+    assert adapter.format_cents(2025) == "20.25"
+    assert adapter.format_cents(5) == "0.05"
+    assert adapter.format_cents(-150) == "-1.50"
+    assert adapter.format_cents(0) == "0.00"
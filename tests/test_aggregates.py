@@ -0,0 +1,76 @@
+import wallet_watcher.aggregates as aggregates
+import wallet_watcher.core as core
+from wallet_watcher._types import ExpenseField, Period
+
+
+def test_build_aggregates(expense_list):
+    materialized = aggregates.build_aggregates(expense_list)
+
+    assert materialized == {
+        "total": 8073,
+        "count": 3,
+        "category": {"Food": [1023, 1], "Gaming": [5000, 1], "School": [2050, 1]},
+        "month": {
+            "2025-06": {
+                "Food": [1023, 1],
+                "Gaming": [5000, 1],
+                "School": [2050, 1],
+            },
+        },
+    }
+
+
+def test_apply_expenses_removes_empty_buckets(expense_list):
+    materialized = aggregates.build_aggregates(expense_list)
+
+    aggregates.apply_expenses(materialized, expense_list[2:], -1)
+
+    assert materialized["total"] == 6023
+    assert "School" not in materialized["category"]
+    assert "School" not in materialized["month"]["2025-06"]
+
+    aggregates.apply_expenses(materialized, expense_list[:2], -1)
+
+    assert materialized["month"] == {}
+
+
+def test_summarize_matches_calculate_total(expense_list):
+    materialized = aggregates.build_aggregates(expense_list)
+    expected = core.calculate_total(expense_list[:2])
+
+    summary = aggregates.summarize(materialized, {"Food", "Gaming", "Rent"})
+
+    assert summary["total"] == expected["total"]
+    assert summary["category"] == expected["category"]
+    assert summary["count"] == 2
+
+
+def test_rollup_matches_group_totals(expense_list):
+    materialized = aggregates.build_aggregates(expense_list)
+
+    for period in (Period.MONTH, Period.YEAR):
+        assert aggregates.rollup(materialized, period) == core.group_totals(
+            expense_list, period
+        )
+    assert aggregates.rollup(materialized, Period.YEAR, {"Food"}) == {
+        "2025": {"total": 1023, "category": {"Food": 1023}, "count": 1}
+    }
+
+
+def test_find_matching_categories():
+    food = core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming")
+    gaming = core.filter_by_matching(ExpenseField.CATEGORY, "Gaming")
+    amount = core.filter_by_range(ExpenseField.AMOUNT, 100)
+
+    assert aggregates.is_unfiltered(core.combine_filters_all().spec)
+    assert not aggregates.is_unfiltered(core.combine_filters_any().spec)
+    assert aggregates.find_matching_categories(
+        core.combine_filters_all(food, gaming).spec
+    ) == {"Gaming"}
+    assert aggregates.find_matching_categories(
+        core.combine_filters_any(food, gaming).spec
+    ) == {"Food", "Gaming"}
+    assert (
+        aggregates.find_matching_categories(core.combine_filters_all(food, amount).spec)
+        is None
+    )
@@ -0,0 +1,167 @@
+import datetime as dt
+import os
+
+import pytest
+
+import wallet_watcher.backends as backends
+import wallet_watcher.binary as binary
+import wallet_watcher.core as core
+from wallet_watcher._types import Expense, ExpenseField
+from wallet_watcher.ledger import CsvLedger
+
+
+def test_round_trip(ledger, expense_list):
+    assert ledger.load() == expense_list
+    assert list(ledger.load_store()) == expense_list
+    assert ledger.count() == 3
+    assert ledger.next_id() == 4
+    assert binary.read_strings(ledger.filepath)[0] == ["Food", "Gaming", "School"]
+
+
+def test_query_by_id_reads_only_matches(ledger, expense_list):
+    strategy = core.combine_filters_all(core.filter_by_matching(ExpenseField.ID, 3, 1))
+
+    assert ledger.query(strategy) == [expense_list[0], expense_list[2]]
+
+
+def test_query_by_columns(ledger, expense_list):
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 2000)
+
+    assert ledger.query(strategy) == expense_list[1:]
+
+
+def test_query_streams_chunks(ledger, expense_list, monkeypatch):
+    monkeypatch.setattr(binary, "QUERY_CHUNK_RECORDS", 2)
+    monkeypatch.setattr(ledger, "load_store", None)
+    strategy = core.filter_by_matching(ExpenseField.CATEGORY, "Food", "School")
+
+    assert ledger.query(strategy) == [expense_list[0], expense_list[2]]
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    assert ledger.query(strategy) == [expense_list[2]]
+    assert ledger.load() == expense_list[1:]
+
+
+def test_delete_and_undo_restore_position(ledger, expense_list):
+    size = os.path.getsize(ledger.filepath)
+    deleted = ledger.delete(core.filter_by_matching(ExpenseField.CATEGORY, "Gaming"))
+
+    assert deleted == [expense_list[1]]
+    assert os.path.getsize(ledger.filepath) == size
+    assert ledger.load() == [expense_list[0], expense_list[2]]
+    assert ledger.count() == 2
+
+    ledger.undo()
+
+    assert ledger.load() == expense_list
+    assert ledger.count() == 3
+
+
+def test_update_in_place(ledger):
+    changes = ledger.update(2, new_category="Games", new_amount=4500)
+
+    assert changes["category"] == ("Gaming", "Games")
+    assert ledger.load()[1] == Expense(2, dt.date(2025, 6, 1), "Games", "League", 4500)
+    assert "Games" in binary.read_strings(ledger.filepath)[0]
+
+
+def test_unsorted_ids(tmp_path, expense_list):
+    ledger = binary.BinaryLedger.create(
+        str(tmp_path / "finances.bin"), expense_list[::-1]
+    )
+
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 2))
+
+    assert [expense.id for expense in ledger.load()] == [3, 1]
+    assert ledger.query(core.filter_by_matching(ExpenseField.ID, 1)) == [
+        expense_list[0]
+    ]
+
+
+def test_compact_drops_deleted_records(ledger, expense_list):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    ledger.compact()
+
+    assert ledger.load() == expense_list[1:]
+    assert ledger.next_id() == 4
+    assert os.path.getsize(ledger.filepath) == (
+        binary.BINARY_HEADER.size + 2 * binary.BINARY_RECORD.size
+    )
+
+
+def test_interrupted_compact_keeps_strings_readable(ledger, expense_list, monkeypatch):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    replace = os.replace
+
+    def fail_on_ledger(source, target):
+        if target == ledger.filepath:
+            raise OSError("interrupted")
+        replace(source, target)
+
+    monkeypatch.setattr(os, "replace", fail_on_ledger)
+    with pytest.raises(OSError):
+        ledger.compact()
+    monkeypatch.undo()
+
+    assert binary.BinaryLedger(ledger.filepath).load() == expense_list[1:]
+    ledger.compact()
+    assert binary.BinaryLedger(ledger.filepath).load() == expense_list[1:]
+
+
+def test_aggregates_follow_writes(ledger):
+    ledger.get_aggregates()
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    ledger.update(3, new_amount=100)
+    ledger.compact()
+
+    assert ledger.calculate_total(core.combine_filters_all()) == {
+        "total": 5100,
+        "category": {"Gaming": 5000, "School": 100},
+        "count": 2,
+    }
+
+
+def test_add_many_tracks_sorted_ids(ledger, expense_list):
+    ledger.add_many([Expense(7, dt.date(2025, 7, 1), "Rent", "July", 90000)])
+
+    assert binary.read_header(ledger.filepath)[0] & binary.IDS_SORTED
+    assert ledger.next_id() == 8
+
+    ledger.add_many([Expense(5, dt.date(2025, 7, 2), "Rent", "Late", 100)])
+
+    assert not binary.read_header(ledger.filepath)[0] & binary.IDS_SORTED
+    assert [expense.id for expense in ledger.load()] == [1, 2, 3, 7, 5]
+    assert ledger.query(core.filter_by_matching(ExpenseField.ID, 5))[0].amount == 100
+
+
+def test_rejects_foreign_file(tmp_path):
+    filepath = tmp_path / "finances.bin"
+    filepath.write_bytes(b"id,date,category,description,amount\r\n")
+
+    with pytest.raises(ValueError):
+        binary.read_header(str(filepath))
+
+
+def test_migrate_between_backends(tmp_path, expense_list):
+    csv_ledger = CsvLedger.create(
+        str(tmp_path / "finances.csv"), expense_list, next_id=10
+    )
+    csv_ledger.delete(core.filter_by_matching(ExpenseField.ID, 2))
+
+    binary_ledger = backends.migrate_ledger(csv_ledger, "binary")
+
+    assert backends.find_data_path(str(tmp_path)) == binary_ledger.filepath
+    assert not os.path.exists(csv_ledger.filepath)
+    assert binary_ledger.load() == [expense_list[0], expense_list[2]]
+    assert binary_ledger.next_id() == 10
+
+    binary_ledger.undo()
+    restored = backends.migrate_ledger(binary_ledger, "csv")
+
+    assert isinstance(backends.open_ledger(restored.filepath), CsvLedger)
+    assert [expense.id for expense in restored.load()] == [1, 3, 2]
+    assert restored.next_id() == 10
+
+
+@pytest.fixture
+def ledger(tmp_path, expense_list):
+    return binary.BinaryLedger.create(str(tmp_path / "finances.bin"), expense_list)
@@ -0,0 +1,214 @@
+import argparse
+import datetime as dt
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import wallet_watcher.cli as cli
+import wallet_watcher.render as render
+from wallet_watcher._types import Expense, ExpenseField, SortKey
+
+HEAVY_MODULES = {"rich", "sqlite3", "mmap", "wallet_watcher.binary"}
+
+
+def test_strip_markup():
+    assert render.strip_markup("[bold white]Total:[/] [green]$5.00[/]") == (
+        "Total: $5.00"
+    )
+    assert render.strip_markup("wallet \\[command] [1, 2]") == "wallet [command] [1, 2]"
+
+
+def test_plain_table():
+    table = render.PlainTable("Title")
+    table.add_column("NAME")
+    table.add_column("TOTAL", justify="right")
+    table.add_row("Food", "$5.00")
+    table.add_row("Gaming", "$50.00")
+
+    assert str(table) == ("Title\nNAME     TOTAL\nFood     $5.00\nGaming  $50.00")
+
+
+def test_plain_table_with_fixed_widths():
+    table = render.PlainTable(show_header=False)
+    table.add_column("NAME", width=6)
+    table.add_column("TOTAL", justify="right", width=7)
+    table.add_row("Food", "$5.00")
+
+    assert str(table) == "Food      $5.00"
+
+
+def test_print_expenses_streams_rows_like_table():
+    from rich.console import Console
+
+    expenses = [
+        Expense(id, dt.date(2025, 6, id), "Food", "Lunch", id * 1050)
+        for id in range(1, 6)
+    ]
+    streamed = Console(file=io.StringIO(), width=80)
+    tabled = Console(file=io.StringIO(), width=80)
+
+    render.print_expenses(streamed, expenses, chunk_rows=2)
+    tabled.print(render.render_table(expenses, show_edge=False))
+
+    assert streamed.file.getvalue() == tabled.file.getvalue()
+
+
+def test_position_message():
+    assert cli.get_position_message(0, 5, 9, None, 5) == (
+        "[dim]Showing the first 5 entries.[/]"
+    )
+    assert cli.get_position_message(5, 4, 9, 2, 5) == (
+        "[dim]Showing entries 6-9 of 9 (page 2 of 2).[/]"
+    )
+
+
+def test_write_records_formats():
+    records = [["1", "2025-06-01", "Food", 'Tacos, "al pastor"', "12.50"]]
+    output = {}
+    for output_format in render.EXPORT_FORMATS:
+        output[output_format] = io.StringIO()
+        render.write_records(output[output_format], records, output_format)
+
+    assert output["csv"].getvalue() == (
+        "id,date,category,description,amount\n"
+        '1,2025-06-01,Food,"Tacos, ""al pastor""",12.50\n'
+    )
+    assert output["tsv"].getvalue().splitlines()[1] == (
+        '1\t2025-06-01\tFood\t"Tacos, ""al pastor"""\t12.50'
+    )
+    assert json.loads(output["jsonl"].getvalue()) == {
+        "id": 1,
+        "date": "2025-06-01",
+        "category": "Food",
+        "description": 'Tacos, "al pastor"',
+        "amount": 12.5,
+    }
+
+    output["jsonl"].seek(0)
+    expenses = cli.parse_import_records(
+        cli.iter_import_records(output["jsonl"], "jsonl")
+    )
+    assert expenses == [
+        Expense(0, dt.date(2025, 6, 1), "Food", 'Tacos, "al pastor"', 1250)
+    ]
+
+
+def test_write_records_normalizes_jsonl_fields():
+    records = [
+        ["007", "2025-06-01", "Food", "N/A", ".50"],
+        ["8", "2025-06-02", "Food", "N/A", "1."],
+        ["9", "2025-06-03", "Food", "N/A", "-3"],
+    ]
+    output = io.StringIO()
+    render.write_records(output, records, "jsonl")
+
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [7, 8, 9]
+    assert [line.rpartition(":")[2] for line in lines] == ["0.50}", "1.00}", "-3.00}"]
+
+
+def test_plain_add_skips_heavy_imports(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "wallet_watcher.cli"]
+        + ["--plain", "add", "5", "-c", "Food"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "XDG_DATA_HOME": str(tmp_path), "HOME": str(tmp_path)},
+        check=True,
+    )
+
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+    assert "Expense Added!" in result.stdout
+    assert "[bold" not in result.stdout
+    assert "wallet_watcher.ledger" in imported
+    assert not {
+        module
+        for module in imported
+        if module in HEAVY_MODULES or module.split(".")[0] in HEAVY_MODULES
+    }
+
+
+def test_parse_import_records():
+    csv_file = io.StringIO(
+        "date,category,description,amount\n" "2025-06-01,Food,Wendys,10.235\n" ",,,5\n"
+    )
+
+    expenses = cli.parse_import_records(cli.iter_import_records(csv_file, "csv"))
+
+    assert [(expense.id, expense.amount) for expense in expenses] == [
+        (0, 1024),
+        (0, 500),
+    ]
+    assert expenses[0].category == "Food"
+
+
+def test_parse_import_records_reports_line():
+    jsonl_file = io.StringIO('{"amount": 5}\n\n{"amount": "abc"}\n')
+
+    with pytest.raises(ValueError, match="line 3"):
+        cli.parse_import_records(cli.iter_import_records(jsonl_file, "jsonl"))
+
+
+def test_parse_sort_keys():
+    assert cli.parse_sort_keys("category, Amount:desc,date:asc") == [
+        SortKey(ExpenseField.CATEGORY),
+        SortKey(ExpenseField.AMOUNT, True),
+        SortKey(ExpenseField.DATE),
+    ]
+
+    for value in ("price", "amount:down", ""):
+        with pytest.raises(argparse.ArgumentTypeError):
+            cli.parse_sort_keys(value)
+
+
+def test_import_from_stdin(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-m", "wallet_watcher.cli", "--plain", "import"],
+        input="amount,category\n5,Food\n7.5,Gaming\n",
+        capture_output=True,
+        text=True,
+        env={**os.environ, "XDG_DATA_HOME": str(tmp_path), "HOME": str(tmp_path)},
+        check=True,
+    )
+
+    assert "Imported 2 expense(s)" in result.stdout
+    assert "rows/s" in result.stdout
+
+
+def test_list_pages_through_matches(tmp_path):
+    environment = {
+        **os.environ,
+        "XDG_DATA_HOME": str(tmp_path),
+        "HOME": str(tmp_path),
+        "WALLET_NO_DAEMON": "1",
+    }
+    subprocess.run(
+        [sys.executable, "-m", "wallet_watcher.cli", "--plain", "import"],
+        input="amount,category\n5,Food\n7.5,Gaming\n9,Food\n",
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-m", "wallet_watcher.cli", "--plain", "list"]
+        + ["--sort-by", "amount", "--limit", "1", "--page", "2"],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+
+    assert "Gaming" in result.stdout and "Food" not in result.stdout
+    assert "Filtered Total: $21.50" in result.stdout
+    assert "Showing entries 2-2 of 3 (page 2 of 3)." in result.stdout
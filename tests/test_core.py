@@ -2,16 +2,16 @@ import pytest
 import datetime as dt
 import wallet_watcher.core as core
 
-from wallet_watcher._types import Expense, ExpenseField, Comparator
+from wallet_watcher._types import Expense, ExpenseField, Comparator, Period, SortKey
 from wallet_watcher.constants import DEFAULT_CATEGORY, DEFAULT_DESCRIPTION
-from decimal import Decimal
+from wallet_watcher.store import ExpenseStore
 from typing import List
 
 
 def test_add_expense(expense_list):
     new_expense = core.add_expense(
         expense_list,
-        Decimal("5.00"),
+        500,
         "snack",
         dt.datetime.fromisoformat("2025-06-08").date(),
         "Food",
@@ -22,26 +22,26 @@ def test_add_expense(expense_list):
         dt.datetime.fromisoformat("2025-06-08").date(),
         "Food",
         "snack",
-        Decimal("5.00"),
+        500,
     )
 
 
 def test_add_expense_defaults(expense_list):
-    new_expense = core.add_expense(expense_list, Decimal("345"))
+    new_expense = core.add_expense(expense_list, 34500)
 
     assert new_expense == Expense(
         4,
         dt.datetime.today().date(),
         DEFAULT_CATEGORY,
         DEFAULT_DESCRIPTION,
-        Decimal("345"),
+        34500,
     )
 
 
 def test_add_expense_defaults_2(expense_list_2):
     new_expense = core.add_expense(
         expense_list_2,
-        Decimal("21"),
+        2100,
         date=dt.datetime.fromisoformat("2025-06-13").date(),
     )
 
@@ -50,13 +50,13 @@ def test_add_expense_defaults_2(expense_list_2):
         dt.datetime.fromisoformat("2025-06-13").date(),
         DEFAULT_CATEGORY,
         DEFAULT_DESCRIPTION,
-        Decimal("21"),
+        2100,
     )
 
 
 def test_add_expense_invalid_amount():
     with pytest.raises(ValueError) as excinfo:
-        core.add_expense([], Decimal("0.0009"))
+        core.add_expense([], 0)
 
     assert excinfo.type is ValueError
     assert "Amount must be greater than 0.01" in str(excinfo.value)
@@ -73,14 +73,14 @@ def test_delete_expenses_matching_id(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -98,7 +98,7 @@ def test_delete_expenses_matching_id_2(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -116,7 +116,7 @@ def test_delete_expenses_matching_category(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -136,7 +136,7 @@ def test_delete_expenses_matching_date(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -166,7 +166,7 @@ def test_delete_expenses_matching_combo(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -175,7 +175,7 @@ def test_delete_expenses_matching_combo(expense_list):
 
 # wallet delete --max-amount 20.50
 def test_delete_expenses_comparison_amount_max(expense_list):
-    strategy = core.filter_by_range(ExpenseField.AMOUNT, None, Decimal("20.50"))
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, None, 2050)
     new_data, _ = core.delete_expenses(expense_list, strategy)
     correct_data = [
         Expense(
@@ -183,7 +183,7 @@ def test_delete_expenses_comparison_amount_max(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
     ]
 
@@ -192,7 +192,7 @@ def test_delete_expenses_comparison_amount_max(expense_list):
 
 # wallet delete min-amount 20.50
 def test_delete_expenses_comparison_amount_min(expense_list):
-    strategy = core.filter_by_range(ExpenseField.AMOUNT, Decimal("20.50"), None)
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 2050, None)
     new_data, _ = core.delete_expenses(expense_list, strategy)
     correct_data: List[Expense] = [
         Expense(
@@ -200,7 +200,7 @@ def test_delete_expenses_comparison_amount_min(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
     ]
 
@@ -221,7 +221,7 @@ def test_delete_expenses_comparison_date_max(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -240,14 +240,14 @@ def test_delete_expenses_comparison_date_min(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
         Expense(
             2,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
     ]
 
@@ -262,7 +262,7 @@ def test_delete_expenses_comparison_combo(expense_list):
         dt.datetime.fromisoformat("2025-06-02").date(),
     )
     strategy2 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.GREATER_THAN_EQUAL, Decimal("20.00")
+        ExpenseField.AMOUNT, Comparator.GREATER_THAN_EQUAL, 2000
     )
     strategy = core.combine_filters_any(*[strategy1, strategy2])
     data, _ = core.delete_expenses(expense_list, strategy)
@@ -272,7 +272,7 @@ def test_delete_expenses_comparison_combo(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
     ]
 
@@ -289,14 +289,14 @@ def test_list_expenses_matching_id(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
         Expense(
             2,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
     ]
 
@@ -313,7 +313,7 @@ def test_list_expenses_matching_category(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
     ]
 
@@ -332,7 +332,7 @@ def test_list_expenses_matching_date(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -341,9 +341,7 @@ def test_list_expenses_matching_date(expense_list):
 
 # wallet list --amount 20.5 50
 def test_list_expenses_matching_amount(expense_list):
-    strategy = core.filter_by_matching(
-        ExpenseField.AMOUNT, Decimal("20.5"), Decimal("50")
-    )
+    strategy = core.filter_by_matching(ExpenseField.AMOUNT, 2050, 5000)
     data = core.filter_expenses(expense_list, strategy)
     correct_data = [
         Expense(
@@ -351,14 +349,14 @@ def test_list_expenses_matching_amount(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -369,7 +367,7 @@ def test_list_expenses_matching_amount(expense_list):
 def test_list_expenses_matching_combo(expense_list):
     strategy1 = core.filter_by_matching(ExpenseField.CATEGORY, *["Food", "Gaming"])
     strategy2 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, Decimal("20")
+        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, 2000
     )
     strategy = core.combine_filters_all(*[strategy1, strategy2])
     data = core.filter_expenses(expense_list, strategy)
@@ -379,7 +377,7 @@ def test_list_expenses_matching_combo(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
     ]
 
@@ -389,10 +387,10 @@ def test_list_expenses_matching_combo(expense_list):
 # wallet list --min-amount 20 --max-amount 20.5
 def test_list_expenses_comparison_amount(expense_list):
     strategy1 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.GREATER_THAN_EQUAL, Decimal("20")
+        ExpenseField.AMOUNT, Comparator.GREATER_THAN_EQUAL, 2000
     )
     strategy2 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, Decimal("20.5")
+        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, 2050
     )
     strategy = core.combine_filters_all(*[strategy1, strategy2])
     data = core.filter_expenses(expense_list, strategy)
@@ -402,7 +400,7 @@ def test_list_expenses_comparison_amount(expense_list):
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -429,14 +427,14 @@ def test_list_expenses_comparison_date(expense_list):
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
         Expense(
             2,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
     ]
 
@@ -458,7 +456,7 @@ def test_list_expenses_combo(expense_list_2):
     )
     strategy3 = core.filter_by_matching(ExpenseField.CATEGORY, *["Food", "Gaming"])
     strategy4 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, Decimal("6")
+        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, 600
     )
     strategy = core.combine_filters_all(*[strategy1, strategy2, strategy3, strategy4])
     data = core.filter_expenses(expense_list_2, strategy)
@@ -468,14 +466,14 @@ def test_list_expenses_combo(expense_list_2):
             dt.datetime.fromisoformat("2025-04-01").date(),
             "Food",
             "Arbys",
-            Decimal("5.23"),
+            523,
         ),
         Expense(
             9,
             dt.datetime.fromisoformat("2025-05-09").date(),
             "Gaming",
             "N/A",
-            Decimal("3"),
+            300,
         ),
     ]
 
@@ -499,7 +497,7 @@ def test_delete_expenses_combo(expense_list_2):
     strategy1_2 = core.combine_filters_all(strategy1, strategy2)
     strategy3 = core.filter_by_matching(ExpenseField.CATEGORY, *["General", "Gaming"])
     strategy4 = core.filter_by_comparison(
-        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, Decimal("1")
+        ExpenseField.AMOUNT, Comparator.LESS_THAN_EQUAL, 100
     )
     strategy = core.combine_filters_any(*[strategy1_2, strategy3, strategy4])
     data, _ = core.delete_expenses(expense_list_2, strategy)
@@ -509,7 +507,7 @@ def test_delete_expenses_combo(expense_list_2):
             dt.datetime.fromisoformat("2025-04-01").date(),
             "Food",
             "Arbys",
-            Decimal("5.23"),
+            523,
         ),
     ]
 
@@ -518,28 +516,28 @@ def test_delete_expenses_combo(expense_list_2):
 
 # wallet edit --id 1 --amount 100
 def test_modify_expenses_amount(expense_list):
-    data, _ = core.modify_expense(expense_list, 1, new_amount=Decimal("100"))
+    data, _ = core.modify_expense(expense_list, 1, new_amount=10000)
     correct_data = [
         Expense(
             1,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("100"),
+            10000,
         ),
         Expense(
             2,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
@@ -551,7 +549,7 @@ def test_modify_expenses_all(expense_list):
     data, _ = core.modify_expense(
         expense_list,
         1,
-        new_amount=Decimal("100"),
+        new_amount=10000,
         new_date=dt.datetime.fromisoformat("2025-06-02").date(),
         new_category="Gaming",
         new_description="N/A",
@@ -562,54 +560,197 @@ def test_modify_expenses_all(expense_list):
             dt.datetime.fromisoformat("2025-06-02").date(),
             "Gaming",
             "N/A",
-            Decimal("100"),
+            10000,
         ),
         Expense(
             2,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("20.50"),
+            2050,
         ),
     ]
 
     assert data == correct_data
 
 
-@pytest.fixture
-def expense_list():
-    data = [
-        Expense(
-            1,
-            dt.datetime.fromisoformat("2025-06-01").date(),
-            "Food",
-            "Wendys",
-            Decimal("10.23"),
-        ),
-        Expense(
-            2,
-            dt.datetime.fromisoformat("2025-06-01").date(),
-            "Gaming",
-            "League",
-            Decimal("50.00"),
-        ),
-        Expense(
-            3,
-            dt.datetime.fromisoformat("2025-06-03").date(),
-            "School",
-            "Textbooks",
-            Decimal("20.50"),
-        ),
+def test_modify_expenses_copies_only_target(expense_list):
+    original = list(expense_list)
+
+    data, changes = core.modify_expense(expense_list, 2, new_description="Dota")
+
+    assert changes == {"description": ("League", "Dota")}
+    assert data[1].description == "Dota"
+    assert expense_list == original
+    assert expense_list[1].description == "League"
+    assert data[0] is expense_list[0]
+    assert data[2] is expense_list[2]
+
+
+def test_edit_expense(expense_list):
+    expense, changes = core.edit_expense(
+        expense_list[0], new_amount=334, new_category="Snacks"
+    )
+
+    assert expense == Expense(
+        1,
+        dt.datetime.fromisoformat("2025-06-01").date(),
+        "Snacks",
+        "Wendys",
+        334,
+    )
+    assert changes == {
+        "category": ("Food", "Snacks"),
+        "amount": (1023, 334),
+    }
+    assert expense_list[0].category == "Food"
+
+
+def test_compile_filter_matches_strategy(expense_list_2):
+    strategy = core.combine_filters_any(
+        core.combine_filters_all(
+            core.filter_by_range(
+                ExpenseField.DATE, dt.date(2025, 5, 1), dt.date(2025, 5, 31)
+            ),
+            core.filter_by_matching(ExpenseField.CATEGORY, "Gaming"),
+        ),
+        core.filter_by_range(ExpenseField.AMOUNT, 1000),
+        core.filter_by_matching(ExpenseField.ID, 1),
+    )
+    predicate = core.compile_filter(strategy)
+
+    assert predicate is not strategy
+    assert [predicate(expense) for expense in expense_list_2] == [
+        strategy(expense) for expense in expense_list_2
+    ]
+    assert [expense.id for expense in expense_list_2 if predicate(expense)] == [
+        1,
+        9,
+        3,
+        8,
     ]
 
-    return data
+
+def test_compile_filter_short_circuits(expense_list):
+    calls = []
+
+    def tracking_strategy(expense):
+        calls.append(expense.id)
+        return True
+
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food"), tracking_strategy
+    )
+    data = core.filter_expenses(expense_list, strategy)
+
+    assert [expense.id for expense in data] == [1]
+    assert calls == [1]
+
+
+def test_compile_filter_without_filters(expense_list):
+    assert core.filter_expenses(expense_list, core.combine_filters_all()) == (
+        expense_list
+    )
+    assert core.filter_expenses(expense_list, core.combine_filters_any()) == []
+
+
+def test_iter_filtered_expenses_is_lazy(expense_list):
+    strategy = core.filter_by_matching(ExpenseField.CATEGORY, "Gaming", "School")
+    filtered = core.iter_filtered_expenses(iter(expense_list), strategy)
+
+    assert next(filtered).id == 2
+    assert [expense.id for expense in filtered] == [3]
+
+
+def test_sort_expenses_limit_matches_full_sort(expense_list_2):
+    def key(expense):
+        return expense.date
+
+    for reverse in (False, True):
+        assert core.sort_expenses(iter(expense_list_2), key, reverse, limit=3) == (
+            sorted(expense_list_2, key=key, reverse=reverse)[:3]
+        )
+        assert core.sort_expenses(expense_list_2, key, reverse, 2, offset=1) == (
+            sorted(expense_list_2, key=key, reverse=reverse)[1:3]
+        )
+
+
+def test_sort_by_keys_matches_tuple_sort(expense_list_2):
+    sort_keys = [
+        SortKey(ExpenseField.CATEGORY),
+        SortKey(ExpenseField.DATE, descending=True),
+        SortKey(ExpenseField.DESCRIPTION),
+    ]
+    expected = sorted(expense_list_2, key=lambda expense: expense.description)
+    expected.sort(key=lambda expense: expense.date, reverse=True)
+    expected.sort(key=lambda expense: expense.category)
+
+    for data in (expense_list_2, ExpenseStore.from_expenses(expense_list_2)):
+        positions = core.sort_by_keys(data, sort_keys)
+        assert [data[position] for position in positions] == expected
+        assert core.sort_by_keys(data, sort_keys, limit=2, offset=1) == (positions[1:3])
+
+    assert core.get_sort_keys(sort_keys[:2], reverse=True) == [
+        SortKey(ExpenseField.CATEGORY, descending=True),
+        SortKey(ExpenseField.DATE),
+    ]
+    assert core.sort_by_keys([], sort_keys) == []
+
+
+def test_select_from_runs_matches_stable_sort(monkeypatch):
+    days = [1, 2, 2, 3, 1, 4, 4, 5, 2, 2, 6] * 10
+    order = range(len(days))
+
+    assert core.find_runs(days[:11]) == [0, 4, 8]
+    assert core.select_from_runs(days, False, 5) is None
+
+    monkeypatch.setattr(core, "SORT_MIN_RUN_LENGTH", 1)
+    for reverse in (False, True):
+        for limit, offset in ((5, 0), (7, 30), (200, 0)):
+            assert core.select_from_runs(days, reverse, limit, offset) == (
+                sorted(order, key=days.__getitem__, reverse=reverse)[offset:][:limit]
+            )
+
+
+def test_accumulate_totals(expense_list):
+    totals = core.create_totals()
+    streamed = list(core.accumulate_totals(iter(expense_list), totals))
+
+    assert streamed == expense_list
+    assert totals["count"] == 3
+    assert totals["total"] == core.calculate_total(expense_list)["total"]
+    assert totals["category"] == core.calculate_total(expense_list)["category"]
+
+
+def test_get_period_key():
+    date = dt.date(2025, 12, 29)
+
+    assert core.get_period_key(date, Period.DAY) == "2025-12-29"
+    assert core.get_period_key(date, Period.WEEK) == "2026-W01"
+    assert core.get_period_key(date, Period.MONTH) == "2025-12"
+    assert core.get_period_key(date, Period.YEAR) == "2025"
+
+
+def test_group_totals(expense_list_2):
+    groups = core.group_totals(expense_list_2, Period.MONTH)
+
+    assert list(groups) == ["2025-04", "2025-05", "2025-06"]
+    assert groups["2025-05"] == {
+        "total": 400,
+        "category": {"General": 100, "Gaming": 300},
+        "count": 2,
+    }
+    assert groups["2025-06"]["total"] == 6223
+    assert core.group_totals(
+        ExpenseStore.from_expenses(expense_list_2), Period.WEEK
+    ) == (core.group_totals(expense_list_2, Period.WEEK))
 
 
 @pytest.fixture
@@ -620,42 +761,42 @@ def expense_list_2():
             dt.datetime.fromisoformat("2025-04-01").date(),
             "Food",
             "Arbys",
-            Decimal("5.23"),
+            523,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-05-09").date(),
             "General",
             "N/A",
-            Decimal("1"),
+            100,
         ),
         Expense(
             9,
             dt.datetime.fromisoformat("2025-05-09").date(),
             "Gaming",
             "N/A",
-            Decimal("3"),
+            300,
         ),
         Expense(
             3,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Food",
             "Wendys",
-            Decimal("10.23"),
+            1023,
         ),
         Expense(
             8,
             dt.datetime.fromisoformat("2025-06-01").date(),
             "Gaming",
             "League",
-            Decimal("50.00"),
+            5000,
         ),
         Expense(
             4,
             dt.datetime.fromisoformat("2025-06-03").date(),
             "School",
             "Textbooks",
-            Decimal("2"),
+            200,
         ),
     ]
 
@@ -0,0 +1,217 @@
+import asyncio
+import datetime as dt
+import math
+import threading
+import time
+
+import pytest
+
+import wallet_watcher.core as core
+import wallet_watcher.daemon as daemon
+import wallet_watcher.server as server
+from wallet_watcher._types import Expense, ExpenseField, Period, SortKey
+from wallet_watcher.ledger import CsvLedger
+
+
+def test_message_round_trip():
+    strategy = core.combine_filters_any(
+        core.filter_by_matching(ExpenseField.DATE, dt.date(2025, 6, 1)),
+        core.filter_by_range(ExpenseField.AMOUNT, 500),
+    )
+    expense = Expense(1, dt.date(2025, 6, 1), "Food", "Wendys", 1023)
+
+    decoded = daemon.decode_message(
+        daemon.encode_message(
+            {"args": [strategy, expense, Period.WEEK, SortKey(ExpenseField.ID, True)]}
+        )
+    )
+
+    assert decoded["args"] == [
+        strategy.spec,
+        expense,
+        Period.WEEK,
+        SortKey(ExpenseField.ID, True),
+    ]
+    assert decoded["args"][0].children[1].children[1].values == (math.inf,)
+    assert daemon.decode_message(daemon.encode_message({"$date": 5})) == {"$date": 5}
+
+
+def test_handle_request_reports_errors(resident):
+    response = daemon.decode_message(
+        daemon.handle_request(
+            resident, daemon.encode_message({"method": "update", "args": [99, None]})
+        )
+    )
+
+    assert response == {"error": "No expense found with ID 99", "type": "ValueError"}
+
+
+def test_resident_reads_match_ledger(resident, ledger):
+    strategies = [
+        core.combine_filters_all(),
+        core.filter_by_matching(ExpenseField.CATEGORY, "Gaming"),
+        core.filter_by_range(ExpenseField.DATE, dt.date(2025, 6, 1)),
+    ]
+
+    for strategy in strategies:
+        for field in (ExpenseField.AMOUNT, ExpenseField.CATEGORY):
+            assert resident.list_expenses(strategy, field, True, 2) == (
+                ledger.list_expenses(strategy, field, True, 2)
+            )
+        assert resident.report(strategy, Period.MONTH) == ledger.report(
+            strategy, Period.MONTH
+        )
+
+
+def test_resident_date_pages_match_ledger(resident, ledger):
+    ledger.add_many(
+        Expense(id, dt.date(2025, 7, 2 + id // 20 - (id % 50 == 0)), "Food", "", id)
+        for id in range(5, 400)
+    )
+    strategy = core.combine_filters_all()
+
+    sort_keys = [SortKey(ExpenseField.DATE, True), SortKey(ExpenseField.AMOUNT)]
+    for sort_field in (ExpenseField.DATE, ExpenseField.ID, sort_keys):
+        for reverse in (False, True):
+            assert resident.list_expenses(strategy, sort_field, reverse, 10, 35) == (
+                ledger.list_expenses(strategy, sort_field, reverse, 10, 35)
+            )
+
+
+def test_resident_writes_keep_store_in_sync(resident, ledger):
+    resident.get_store()
+    added = resident.add(core.add_expense([], 700, category="Gaming", id=1))
+    resident.update(2, new_amount=4000, new_description="Season pass")
+    resident.delete(core.filter_by_matching(ExpenseField.ID, 1))
+
+    assert added.id == 5
+    assert list(resident.get_store()) == CsvLedger(ledger.filepath).load()
+    assert resident.calculate_total(core.combine_filters_all())["count"] == 4
+
+
+def test_resident_reloads_after_external_write(resident, ledger):
+    resident.get_store()
+    CsvLedger(ledger.filepath).add(Expense(9, dt.date(2025, 7, 1), "Rent", "", 100))
+
+    assert resident.count() == 5
+    assert len(resident.get_store()) == 5
+
+
+def test_execute_batch_coalesces_requests(resident):
+    lines = [
+        daemon.encode_message({"method": "add", "args": [expense]})
+        for expense in (
+            core.add_expense([], 100, category="Food", id=1),
+            core.add_expense([], 200, category="Food", id=1),
+        )
+    ]
+    lines += [daemon.encode_message({"method": "calculate_total", "args": [None]})] * 2
+    lines.append(lines[0])
+    requests = [daemon.parse_request(line) for line in lines]
+    requests[2].args = requests[3].args = [core.combine_filters_all()]
+
+    responses = daemon.execute_batch(resident, requests)
+    results = [daemon.decode_message(response)["result"] for response in responses]
+
+    assert [results[0].id, results[1].id, results[4].id] == [5, 6, 7]
+    assert responses[2] is responses[3]
+    assert results[2]["count"] == 7
+    assert resident.undo()[1][0].id == 7
+    assert resident.undo()[1][0].id == 6
+
+
+def test_remote_ledger(socket_path):
+    remote = daemon.connect(socket_path)
+    expense = remote.add(core.add_expense([], 250, category="Food", id=1))
+    expenses, totals = remote.list_expenses(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food"),
+        ExpenseField.AMOUNT,
+    )
+    changes = remote.update(expense.id, new_date=dt.date(2025, 1, 1))
+    with pytest.raises(ValueError):
+        remote.update(99, new_amount=100)
+    operation, undone = remote.undo()
+    stats = remote.stats()
+    remote.close()
+
+    assert expense.id == 5
+    assert [expense.id for expense in expenses] == [5, 1]
+    assert totals["total"] == 1273
+    assert changes["date"][1] == dt.date(2025, 1, 1)
+    assert (operation, undone[0].date) == ("edit", expense.date)
+    assert stats["requests"]["update"]["count"] == 2
+
+
+def test_concurrent_adds_get_unique_ids(socket_path, resident):
+    def add_expenses(ids):
+        remote = daemon.connect(socket_path)
+        for _ in range(5):
+            ids.append(remote.add(core.add_expense([], 100, id=1)).id)
+        remote.close()
+
+    ids = []
+    threads = [threading.Thread(target=add_expenses, args=(ids,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ids) == list(range(5, 45))
+    assert resident.count() == 44
+    last_added = resident.get_ledger().load()[-1]
+    assert resident.undo()[1] == [last_added]
+    assert resident.count() == 43
+
+
+def test_connect_without_daemon(tmp_path):
+    socket_path = tmp_path / "wallet.sock"
+    assert daemon.connect(str(socket_path)) is None
+
+    socket_path.write_text("")
+    assert daemon.connect(str(socket_path)) is None
+
+
+@pytest.fixture
+def socket_path(tmp_path, resident):
+    socket_path = str(tmp_path / "wallet.sock")
+    daemon_server = server.DaemonServer(resident)
+    stopped = asyncio.Event()
+    loops = []
+
+    async def run_server():
+        loops.append(asyncio.get_running_loop())
+        await daemon_server.serve_until(socket_path, stopped)
+
+    thread = threading.Thread(target=asyncio.run, args=(run_server(),))
+    thread.start()
+
+    deadline = time.monotonic() + 5
+    while (remote := daemon.connect(socket_path)) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    remote.close()
+
+    yield socket_path
+
+    loops[0].call_soon_threadsafe(stopped.set)
+    thread.join()
+
+
+@pytest.fixture
+def resident(ledger, tmp_path):
+    resident = daemon.ResidentLedger(str(tmp_path))
+    yield resident
+    resident.close()
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return CsvLedger.create(
+        str(tmp_path / "finances.csv"),
+        [
+            Expense(1, dt.date(2025, 6, 1), "Food", "Wendys", 1023),
+            Expense(2, dt.date(2025, 6, 1), "Gaming", "League", 5000),
+            Expense(3, dt.date(2025, 5, 9), "General", "N/A", 100),
+            Expense(4, dt.date(2025, 6, 3), "Gaming", "Textbooks", 2050),
+        ],
+    )
@@ -0,0 +1,161 @@
+import datetime as dt
+import os
+
+import pytest
+
+import wallet_watcher.constants as const
+import wallet_watcher.index as index
+import wallet_watcher.storage as storage
+from wallet_watcher.constants import FIELD_NAMES
+
+
+def test_date_index_find_range(ledger_path):
+    date_index = index.load_date_index(ledger_path)
+    offsets = date_index.find_range(dt.date(2025, 5, 1), dt.date(2025, 6, 1))
+
+    assert len(date_index) == 4
+    assert _ids(ledger_path, offsets) == [1, 2, 3]
+
+
+def test_date_index_open_range(ledger_path):
+    date_index = index.load_date_index(ledger_path)
+
+    assert _ids(ledger_path, date_index.find_range(dt.date(2025, 6, 1), None)) == [
+        1,
+        2,
+        4,
+    ]
+    assert _ids(ledger_path, date_index.find_range(None, dt.date(2025, 5, 9))) == [3]
+
+
+def test_date_index_find_dates(ledger_path):
+    date_index = index.load_date_index(ledger_path)
+    offsets = date_index.find_dates([dt.date(2025, 6, 3), dt.date(2025, 5, 9)])
+
+    assert _ids(ledger_path, offsets) == [3, 4]
+    assert date_index.find_dates([dt.date(2024, 1, 1)]) == []
+
+
+def test_date_index_catches_up_after_append(ledger_path):
+    index.load_date_index(ledger_path)
+    storage.append_csv(ledger_path, _row(5, "2025-01-01"))
+
+    date_index = index.load_date_index(ledger_path)
+
+    assert len(date_index) == 5
+    assert _ids(ledger_path, date_index.find_range(None, dt.date(2025, 5, 9))) == [
+        3,
+        5,
+    ]
+
+
+def test_date_index_rebuilds_after_rewrite(ledger_path):
+    index.load_date_index(ledger_path)
+    storage.save_csv(ledger_path, [_row(2, "2025-06-01"), _row(4, "2025-06-03")])
+
+    date_index = index.load_date_index(ledger_path)
+
+    assert len(date_index) == 2
+    assert _ids(ledger_path, date_index.find_dates([dt.date(2025, 6, 3)])) == [4]
+
+
+def test_date_index_rebuilds_corrupt_file(ledger_path):
+    with open(index.get_index_path(ledger_path, index.DateIndex), "wb") as index_file:
+        index_file.write(b"garbage")
+
+    assert len(index.load_date_index(ledger_path)) == 4
+
+
+def test_id_index_find(ledger_path):
+    id_index = index.load_id_index(ledger_path)
+
+    assert len(id_index) == 4
+    assert _ids(ledger_path, id_index.find([4, 2, 99])) == [2, 4]
+
+
+def test_category_index_find(ledger_path):
+    category_index = index.load_category_index(ledger_path)
+    storage.append_csv(ledger_path, _row(5, "2025-01-01"))
+
+    category_index = index.load_category_index(ledger_path)
+
+    assert _ids(ledger_path, category_index.find(["Food"])) == [1, 5]
+    assert category_index.find(["Missing"]) == []
+
+
+def test_key_index_appends_in_place(ledger_path, monkeypatch):
+    monkeypatch.setattr(const, "INDEX_MIN_TAIL_ENTRIES", 2)
+    id_path = index.get_index_path(ledger_path, index.IdIndex)
+    category_path = index.get_index_path(ledger_path, index.CategoryIndex)
+    index.load_id_index(ledger_path)
+    index.load_category_index(ledger_path)
+    inodes = os.stat(id_path).st_ino, os.stat(category_path).st_ino
+
+    for id in (5, 6):
+        storage.append_csv(ledger_path, _row(id, "2025-01-01"))
+        id_index = index.load_id_index(ledger_path)
+        category_index = index.load_category_index(ledger_path)
+
+    assert (os.stat(id_path).st_ino, os.stat(category_path).st_ino) == inodes
+    assert id_index.sorted_entries == 6
+    assert category_index.entries - category_index.sorted_entries == 2
+    assert _ids(ledger_path, category_index.find(["Food"])) == [1, 5, 6]
+
+    storage.append_csv(ledger_path, _row(7, "2025-01-01"))
+    category_index = index.load_category_index(ledger_path)
+
+    assert category_index.sorted_entries == category_index.entries == 7
+    assert _ids(ledger_path, category_index.find(["Food"])) == [1, 5, 6, 7]
+    assert _ids(ledger_path, index.load_id_index(ledger_path).find([7, 1])) == [1, 7]
+
+
+def test_key_index_persists(ledger_path):
+    index.load_id_index(ledger_path)
+    path = index.get_index_path(ledger_path, index.IdIndex)
+
+    assert index.IdIndex.read(path) == index.build_index(
+        ledger_path, index.IdIndex, persist=False
+    )
+
+
+def test_verify_index(ledger_path):
+    assert index.verify_index(ledger_path, index.IdIndex) == "missing"
+
+    index.build_index(ledger_path, index.IdIndex)
+    assert index.verify_index(ledger_path, index.IdIndex) == "ok"
+
+    storage.append_csv(ledger_path, _row(5, "2025-01-01"))
+    assert index.verify_index(ledger_path, index.IdIndex) == "stale"
+
+    broken_index = index.load_id_index(ledger_path)
+    broken_index.add(0, ["6", "2025-01-01", "Food", "N/A", "1.00"])
+    broken_index.write(index.get_index_path(ledger_path, index.IdIndex))
+    assert index.verify_index(ledger_path, index.IdIndex) == "corrupt"
+
+
+def _ids(filepath, offsets):
+    return [int(row["id"]) for row in storage.read_records(filepath, offsets)]
+
+
+def _row(id, date):
+    return {
+        "id": str(id),
+        "date": date,
+        "category": "Food",
+        "description": "N/A",
+        "amount": "1.00",
+    }
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    filepath = str(tmp_path / "finances.csv")
+    with open(filepath, "w", newline="") as csvfile:
+        csvfile.write(",".join(FIELD_NAMES) + "\r\n")
+        csvfile.write("1,2025-06-01,Food,Wendys,10.23\r\n")
+        csvfile.write('2,2025-06-01,Gaming,"League, ""ranked""\nseason",50.00\r\n')
+        csvfile.write("3,2025-05-09,General,N/A,1.00\r\n")
+        csvfile.write("4,2025-06-03,School,Textbooks,20.50\r\n")
+
+    assert not os.path.exists(index.get_index_path(filepath, index.DateIndex))
+    return filepath
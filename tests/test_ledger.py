@@ -0,0 +1,252 @@
+import datetime as dt
+import os
+
+import pytest
+
+import wallet_watcher.adapter as adapter
+import wallet_watcher.aggregates as aggregates
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.journal as journal
+import wallet_watcher.storage as storage
+import wallet_watcher.undo as undo
+from wallet_watcher._types import Expense, ExpenseField, Period, SortKey
+from wallet_watcher.ledger import CsvLedger, Ledger
+
+
+def test_query_full_scan(ledger):
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 1000)
+
+    assert _ids(ledger.query(strategy)) == [1, 2, 4]
+    assert ledger.count() == 4
+
+
+def test_load_store_merges_journal(ledger):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    ledger.update(3, new_category="Misc")
+
+    store = ledger.load_store()
+
+    assert store.ids.tolist() == [2, 3, 4]
+    assert list(store) == ledger.load()
+
+
+def test_query_records_match_expenses(ledger):
+    ledger.update(3, new_category="Misc")
+
+    for strategy in (
+        core.combine_filters_all(),
+        core.filter_by_matching(ExpenseField.CATEGORY, "Misc"),
+    ):
+        assert list(ledger.iter_query_records(strategy)) == [
+            adapter.convert_expense_to_csv_record(expense)
+            for expense in ledger.query(strategy)
+        ]
+
+
+def test_query_uses_indexes(ledger):
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        core.filter_by_range(ExpenseField.DATE, dt.date(2025, 6, 1), None),
+    )
+
+    assert _ids(ledger.query(strategy)) == [1, 2]
+    assert os.path.exists(ledger.filepath + const.CATEGORY_INDEX_SUFFIX)
+    assert os.path.exists(ledger.filepath + const.DATE_INDEX_SUFFIX)
+
+
+def test_delete_appends_tombstones(ledger):
+    size = os.path.getsize(ledger.filepath)
+    strategy = core.combine_filters_any(
+        core.filter_by_matching(ExpenseField.ID, 1, 3),
+        core.filter_by_matching(ExpenseField.CATEGORY, "School"),
+    )
+
+    deleted = ledger.delete(strategy)
+
+    assert _ids(deleted) == [1, 3, 4]
+    assert os.path.getsize(ledger.filepath) == size
+    assert _ids(CsvLedger(ledger.filepath).load()) == [2]
+    assert CsvLedger(ledger.filepath).count() == 1
+
+
+def test_update_in_place(ledger, monkeypatch):
+    ledger.update(1, new_amount=1024)
+    monkeypatch.setattr(storage, "iter_fields", None)
+    changes = ledger.update(2, new_amount=6000)
+    monkeypatch.undo()
+
+    assert changes == {"amount": (5000, 6000)}
+    assert not os.path.exists(journal.get_journal_path(ledger.filepath))
+    assert CsvLedger(ledger.filepath).load()[1].amount == 6000
+
+
+def test_update_journals_indexed_fields(ledger):
+    ledger.update(2, new_date=dt.date(2024, 1, 1), new_description="Dota 2")
+
+    reopened = CsvLedger(ledger.filepath)
+    strategy = core.filter_by_range(ExpenseField.DATE, None, dt.date(2024, 12, 31))
+
+    assert os.path.exists(journal.get_journal_path(ledger.filepath))
+    assert reopened.query(strategy) == [
+        Expense(2, dt.date(2024, 1, 1), "Gaming", "Dota 2", 5000)
+    ]
+    assert _ids(reopened.load()) == [1, 2, 3, 4]
+
+
+def test_update_missing_id(ledger):
+    with pytest.raises(ValueError):
+        ledger.update(99, new_amount=100)
+
+
+def test_compact_folds_journal(ledger):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 3))
+    ledger.update(1, new_category="Snacks")
+    ledger.compact()
+
+    assert not os.path.exists(journal.get_journal_path(ledger.filepath))
+    assert [row["category"] for row in storage.load_csv(ledger.filepath)] == [
+        "Snacks",
+        "Gaming",
+        "School",
+    ]
+    assert CsvLedger(ledger.filepath).count() == 3
+
+
+def test_compacts_automatically(ledger, monkeypatch):
+    monkeypatch.setattr(const, "COMPACTION_MIN_JOURNAL_BYTES", 0)
+    monkeypatch.setattr(const, "COMPACTION_JOURNAL_RATIO", 0)
+
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+
+    assert not os.path.exists(journal.get_journal_path(ledger.filepath))
+    assert _ids(storage.load_csv(ledger.filepath)) == [2, 3, 4]
+
+
+def test_stale_journal_is_ignored(ledger):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    storage.save_csv(ledger.filepath, storage.load_csv(ledger.filepath))
+
+    assert _ids(CsvLedger(ledger.filepath).load()) == [1, 2, 3, 4]
+
+
+def test_add_after_delete_does_not_reuse_ids(ledger):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 4))
+    ledger.add(core.add_expense([], 100, id=ledger.next_id()))
+
+    assert _ids(CsvLedger(ledger.filepath).load()) == [1, 2, 3, 5]
+
+
+def test_undo_reverts_operations(ledger):
+    ledger.add(core.add_expense([], 500, id=ledger.next_id()))
+    ledger.delete(core.filter_by_matching(ExpenseField.CATEGORY, "Food", "School"))
+    ledger.update(2, new_category="Games", new_amount=4500)
+
+    assert ledger.undo()[0] == undo.EDIT
+    assert ledger.load()[0] == Expense(2, dt.date(2025, 6, 1), "Gaming", "League", 5000)
+
+    operation, restored = ledger.undo()
+    assert operation == undo.DELETE
+    assert _ids(restored) == [1, 4]
+    assert _ids(CsvLedger(ledger.filepath).load()) == [1, 2, 3, 4, 5]
+
+    assert ledger.undo()[0] == undo.ADD
+    assert _ids(CsvLedger(ledger.filepath).load()) == [1, 2, 3, 4]
+    assert ledger.count() == 4
+    assert ledger.undo() is None
+
+
+def test_undo_depth_is_bounded(ledger):
+    ledger.undo_depth = 1
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 2))
+
+    ledger.undo()
+
+    assert ledger.undo() is None
+    assert _ids(ledger.load()) == [2, 3, 4]
+
+
+def test_aggregates_follow_writes(ledger):
+    ledger.get_aggregates()
+    ledger.add(core.add_expense([], 500, id=ledger.next_id()))
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 1))
+    ledger.update(2, new_category="Games", new_amount=4500)
+    ledger.undo()
+
+    assert ledger.get_aggregates() == aggregates.build_aggregates(ledger.load())
+    assert ledger.calculate_total(core.combine_filters_all())["count"] == 4
+
+
+def test_aggregates_rebuilt_after_external_change(ledger):
+    ledger.get_aggregates()
+    with open(ledger.filepath, "a", newline="") as csvfile:
+        csvfile.write("5,2025-07-01,Food,Snack,2.00\r\n")
+
+    totals = ledger.calculate_total(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food")
+    )
+
+    assert totals["total"] == 1223
+
+
+def test_add_many_appends_in_one_step(ledger):
+    expenses = [
+        core.add_expense([], cents, category="Bulk", id=ledger.next_id() + offset)
+        for offset, cents in enumerate([100, 250, 300])
+    ]
+
+    assert ledger.add_many(expenses) == 3
+    assert _ids(ledger.load()) == [1, 2, 3, 4, 5, 6, 7]
+    assert ledger.next_id() == 8
+    assert ledger.get_aggregates()["category"]["Bulk"] == [650, 3]
+
+    ledger.undo()
+
+    assert _ids(ledger.load()) == [1, 2, 3, 4]
+    assert "Bulk" not in ledger.get_aggregates()["category"]
+
+
+def test_report_uses_rollups_when_covered(ledger):
+    scanned = core.group_totals(ledger.load(), Period.YEAR)
+
+    assert ledger.report(core.combine_filters_all(), Period.YEAR) == scanned
+    assert list(ledger.report(core.combine_filters_all(), Period.MONTH)) == [
+        "2025-06",
+        "2025-05",
+    ]
+
+    strategy = core.filter_by_range(ExpenseField.DATE, dt.date(2025, 6, 2))
+    assert ledger.report(strategy, Period.DAY) == {
+        "2025-06-03": {"total": 2050, "category": {"School": 2050}, "count": 1}
+    }
+
+
+def test_scan_keeps_top_rows(ledger):
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 1)
+    expenses, totals = ledger._scan(strategy, SortKey(ExpenseField.AMOUNT, True), 2)
+
+    assert _ids(expenses) == _ids(
+        ledger.list_expenses(strategy, ExpenseField.AMOUNT, True, 2)[0]
+    )
+    assert totals == ledger.calculate_total(strategy)
+    assert list(ledger._scan(strategy, keep=0)[0]) == []
+    with pytest.raises(TypeError):
+        Ledger(ledger.filepath)
+
+
+def _ids(data):
+    return [int(item["id"]) if isinstance(item, dict) else item.id for item in data]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    filepath = str(tmp_path / "finances.csv")
+    with open(filepath, "w", newline="") as csvfile:
+        csvfile.write(",".join(const.FIELD_NAMES) + "\r\n")
+        csvfile.write("1,2025-06-01,Food,Wendys,10.23\r\n")
+        csvfile.write("2,2025-06-01,Gaming,League,50.00\r\n")
+        csvfile.write("3,2025-05-09,General,N/A,1.00\r\n")
+        csvfile.write("4,2025-06-03,School,Textbooks,20.50\r\n")
+
+    return CsvLedger(filepath)
@@ -0,0 +1,66 @@
+import datetime as dt
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import wallet_watcher.backends as backends
+import wallet_watcher.core as core
+import wallet_watcher.locking as locking
+from wallet_watcher._types import Expense, ExpenseField
+
+WRITERS = 4
+WRITES = 20
+
+
+@pytest.mark.parametrize("backend", ["csv", "binary", "sqlite"])
+def test_parallel_writers_keep_ids_unique(tmp_path, backend):
+    filename, _ = backends.BACKENDS[backend]
+    filepath = str(tmp_path / filename)
+    backends.get_ledger_type(backend).create(filepath, [])
+
+    with ProcessPoolExecutor(WRITERS) as executor:
+        kept = sum(executor.map(_write_expenses, [filepath] * WRITERS, range(WRITERS)))
+
+    ledger = backends.open_ledger(filepath)
+    expenses = ledger.load()
+    ids = [expense.id for expense in expenses]
+
+    assert len(ids) == len(set(ids)) == kept == ledger.count()
+    assert ledger.next_id() == WRITERS * WRITES + 1
+    assert ledger.calculate_total(core.combine_filters_all())["count"] == kept
+    for writer in range(WRITERS):
+        descriptions = {
+            expense.description
+            for expense in expenses
+            if expense.category == f"Writer{writer}"
+        }
+        assert descriptions == {str(number) for number in range(WRITES) if number % 5}
+
+
+def test_lock_is_reentrant(tmp_path):
+    ledger = backends.get_ledger_type("csv").create(str(tmp_path / "finances.csv"), [])
+
+    with ledger.locked():
+        ledger.add(Expense(0, dt.date(2025, 6, 1), "Food", "Lunch", 900), True)
+
+    assert os.path.exists(locking.get_lock_path(ledger.filepath))
+    assert ledger.load()[0].id == 1
+
+
+def _write_expenses(filepath: str, writer: int) -> int:
+    ledger = backends.open_ledger(filepath)
+    ledger.get_aggregates()
+    kept = 0
+    for number in range(WRITES):
+        expense = ledger.add(
+            Expense(0, dt.date(2025, 6, 1), f"Writer{writer}", str(number), 100),
+            assign_ids=True,
+        )
+        if number % 5 == 0:
+            ledger.delete(core.filter_by_matching(ExpenseField.ID, expense.id))
+        else:
+            kept += 1
+    ledger.close()
+
+    return kept
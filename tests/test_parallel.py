@@ -0,0 +1,112 @@
+import datetime as dt
+
+import pytest
+
+import wallet_watcher.constants as const
+import wallet_watcher.core as core
+import wallet_watcher.parallel as parallel
+from wallet_watcher._types import Expense, ExpenseField, SortKey
+from wallet_watcher.ledger import CsvLedger
+
+CATEGORIES = ["Food", "Gaming", "School", "Rent"]
+
+
+def test_split_csv_tiles_file_at_line_starts(ledger):
+    chunks = parallel.split_csv(ledger.filepath, 7)
+    with open(ledger.filepath, "rb") as csvfile:
+        data = csvfile.read()
+
+    assert len(chunks) == 7
+    assert chunks[0][0] == data.index(b"\n") + 1
+    assert chunks[-1][1] == len(data)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start and data[start - 1 : start] == b"\n"
+
+
+def test_scan_matches_sequential_query(ledger):
+    ledger.delete(core.filter_by_matching(ExpenseField.ID, 3, 50))
+    ledger.update(7, new_category="Food", new_amount=12345)
+    ledger.undo()
+    ledger.update(8, new_amount=1)
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        core.filter_by_range(ExpenseField.AMOUNT, 100),
+    )
+
+    expenses, totals = parallel.scan_csv(
+        ledger.filepath, strategy.spec, ledger._get_journal().overrides, workers=2
+    )
+
+    assert expenses == ledger.query(strategy)
+    assert totals == ledger.calculate_total(strategy)
+
+
+def test_scan_keeps_top_rows_per_chunk(ledger):
+    sort_key = SortKey(ExpenseField.AMOUNT, True)
+    strategy = core.combine_filters_all()
+
+    expenses, totals = parallel.scan_csv(
+        ledger.filepath, strategy.spec, {}, sort_key, keep=3, workers=2
+    )
+
+    assert len(expenses) == 3 * 2 * const.PARALLEL_CHUNKS_PER_WORKER
+    assert totals["count"] == 100
+    assert core.sort_expenses(expenses, lambda expense: expense.amount, True, 3) == (
+        ledger.list_expenses(strategy, ExpenseField.AMOUNT, True, 3)[0]
+    )
+
+
+def test_scan_rejects_boundary_inside_quotes(tmp_path):
+    ledger = CsvLedger.create(
+        str(tmp_path / "finances.csv"),
+        [Expense(1, dt.date(2025, 6, 1), "Food", "line\n" * 200, 100)],
+    )
+
+    assert (
+        parallel.scan_csv(
+            ledger.filepath, core.combine_filters_all().spec, {}, workers=2
+        )
+        is None
+    )
+
+
+def test_ledger_uses_parallel_scan(ledger, monkeypatch):
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 150)
+    sort_keys = [SortKey(ExpenseField.CATEGORY), SortKey(ExpenseField.ID, True)]
+    expected = [
+        ledger.list_expenses(strategy, ExpenseField.AMOUNT, True, 5, 2),
+        ledger.list_expenses(strategy, sort_keys, limit=4),
+        ledger.calculate_total(strategy),
+    ]
+
+    monkeypatch.setenv(const.ENV_WORKERS, "2")
+    monkeypatch.setattr(const, "PARALLEL_MIN_BYTES", 0)
+    scans = []
+    scan_csv = parallel.scan_csv
+    monkeypatch.setattr(
+        parallel, "scan_csv", lambda *args: scans.append(args) or scan_csv(*args)
+    )
+
+    assert [
+        ledger.list_expenses(strategy, ExpenseField.AMOUNT, True, 5, 2),
+        ledger.list_expenses(strategy, sort_keys, limit=4),
+        ledger.calculate_total(strategy),
+    ] == expected
+    assert len(scans) == 3
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return CsvLedger.create(
+        str(tmp_path / "finances.csv"),
+        [
+            Expense(
+                id,
+                dt.date(2025, 1 + id % 12, 1 + id % 28),
+                CATEGORIES[id % len(CATEGORIES)],
+                f'Item "{id}", boxed' if id % 9 == 0 else "N/A",
+                id * 37 % 500,
+            )
+            for id in range(1, 101)
+        ],
+    )
@@ -0,0 +1,145 @@
+import datetime as dt
+
+import pytest
+
+import wallet_watcher.core as core
+import wallet_watcher.sqlite as sqlite
+from wallet_watcher._types import Expense, ExpenseField, SortKey
+from wallet_watcher.ledger import Ledger
+
+
+def test_translate_filter():
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "Gaming"),
+        core.filter_by_range(ExpenseField.AMOUNT, 500, 1050),
+    )
+
+    assert sqlite.translate_filter(strategy) == (
+        "(category IN (?, ?) AND (cents >= ? AND cents <= ?))",
+        ["Food", "Gaming", 500, 1050],
+        True,
+    )
+
+
+def test_translate_filter_with_callable():
+    def callable_strategy(expense):
+        return expense.id > 1
+
+    strategy = core.combine_filters_all(
+        core.filter_by_matching(ExpenseField.ID, 1, 2), callable_strategy
+    )
+
+    assert sqlite.translate_filter(strategy) == ("(id IN (?, ?))", [1, 2], False)
+    assert sqlite.translate_filter(core.combine_filters_any(callable_strategy)) == (
+        "1",
+        [],
+        False,
+    )
+
+
+def test_query_matches_core(ledger, expense_list):
+    def callable_strategy(expense):
+        return expense.description != "Arbys"
+
+    strategies = [
+        core.filter_by_range(ExpenseField.DATE, dt.date(2025, 5, 1), None),
+        core.combine_filters_any(
+            core.filter_by_matching(ExpenseField.ID, 3),
+            core.filter_by_range(ExpenseField.AMOUNT, 1000),
+        ),
+        core.combine_filters_all(
+            core.filter_by_matching(ExpenseField.AMOUNT, 523),
+            callable_strategy,
+        ),
+    ]
+
+    for strategy in strategies:
+        assert ledger.query(strategy) == core.filter_expenses(expense_list, strategy)
+
+
+def test_query_uses_index(ledger):
+    where, params, _ = sqlite.translate_filter(
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food")
+    )
+    plan = ledger._connect().execute(
+        f"EXPLAIN QUERY PLAN SELECT * FROM expenses WHERE {where}", params
+    )
+
+    assert "expenses_category" in " ".join(row[-1] for row in plan)
+
+
+def test_list_expenses_sorts_and_totals(ledger, expense_list):
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 200)
+
+    expenses, totals = ledger.list_expenses(
+        strategy, ExpenseField.AMOUNT, reverse=True, limit=2
+    )
+
+    assert [expense.id for expense in expenses] == [4, 5]
+    assert totals == {
+        "total": 7873,
+        "category": {
+            "Food": 523,
+            "Gaming": 5300,
+            "School": 2050,
+        },
+        "count": 4,
+    }
+
+
+def test_list_expenses_sorts_by_several_keys(ledger, expense_list):
+    sort_keys = [SortKey(ExpenseField.CATEGORY), SortKey(ExpenseField.AMOUNT, True)]
+
+    for strategy in (
+        core.combine_filters_all(),
+        core.filter_by_range(ExpenseField.AMOUNT, 200),
+    ):
+        expenses, _ = ledger.list_expenses(strategy, sort_keys, limit=3)
+        expected, _ = Ledger.list_expenses(ledger, strategy, sort_keys, limit=3)
+        assert expenses == expected
+
+    assert [expense.id for expense in expenses] == [1, 4, 2]
+
+
+def test_calculate_total_matches_core(ledger, expense_list):
+    strategy = core.filter_by_matching(ExpenseField.CATEGORY, "Gaming", "General")
+    expected = core.calculate_total(core.filter_expenses(expense_list, strategy))
+
+    totals = ledger.calculate_total(strategy)
+
+    assert totals["total"] == expected["total"]
+    assert totals["category"] == expected["category"]
+
+
+def test_delete_edit_and_undo(ledger, expense_list):
+    ledger.delete(core.filter_by_matching(ExpenseField.CATEGORY, "Gaming"))
+    ledger.update(1, new_amount=600)
+
+    assert ledger.count() == 3
+    assert ledger.load()[0].amount == 600
+
+    ledger.undo()
+    ledger.undo()
+
+    assert sorted(ledger.load(), key=lambda expense: expense.id) == sorted(
+        expense_list, key=lambda expense: expense.id
+    )
+    assert ledger.next_id() == 6
+
+
+@pytest.fixture
+def ledger(tmp_path, expense_list):
+    ledger = sqlite.SqliteLedger.create(str(tmp_path / "finances.db"), expense_list)
+    yield ledger
+    ledger.close()
+
+
+@pytest.fixture
+def expense_list():
+    return [
+        Expense(1, dt.date(2025, 4, 1), "Food", "Arbys", 523),
+        Expense(3, dt.date(2025, 5, 9), "General", "N/A", 100),
+        Expense(2, dt.date(2025, 5, 9), "Gaming", "N/A", 300),
+        Expense(4, dt.date(2025, 6, 1), "Gaming", "League", 5000),
+        Expense(5, dt.date(2025, 6, 3), "School", "Textbooks", 2050),
+    ]
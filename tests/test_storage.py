@@ -0,0 +1,151 @@
+import os
+
+import pytest
+
+import wallet_watcher.storage as storage
+from wallet_watcher.constants import FIELD_NAMES
+
+
+def test_get_next_id_empty_ledger(ledger_path):
+    assert storage.get_next_id(ledger_path) == 1
+    assert os.path.exists(storage.get_metadata_path(ledger_path))
+
+
+def test_get_next_id_rebuilds_missing_metadata(ledger_path):
+    _write_rows(
+        ledger_path, ["1,2025-06-01,Food,Wendys,10.23", "7,2025-06-02,A,B,1.00"]
+    )
+
+    assert storage.get_next_id(ledger_path) == 8
+    assert storage.load_metadata(ledger_path)["next_id"] == 8
+
+
+def test_append_updates_metadata(ledger_path):
+    storage.get_next_id(ledger_path)
+    storage.append_csv(ledger_path, _row(1))
+    storage.append_csv(ledger_path, _row(2))
+
+    assert storage.load_metadata(ledger_path)["next_id"] == 3
+    assert storage.get_next_id(ledger_path) == 3
+
+
+def test_get_next_id_repairs_stale_metadata(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    with open(ledger_path, "a", newline="") as csvfile:
+        csvfile.write("41,2025-06-01,Food,External,1.00\r\n")
+
+    assert storage.load_metadata(ledger_path) is None
+    assert storage.get_next_id(ledger_path) == 42
+
+
+def test_stale_metadata_keeps_high_water_mark(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    storage.append_csv(ledger_path, _row(2))
+    storage.save_csv(ledger_path, [_row(1)])
+    with open(ledger_path, "a", newline="") as csvfile:
+        csvfile.write("1,2025-06-01,Food,External,1.00\r\n")
+
+    assert storage.load_metadata(ledger_path) is None
+    assert storage.get_next_id(ledger_path) == 3
+
+
+def test_save_keeps_high_water_mark(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    storage.append_csv(ledger_path, _row(2))
+    storage.save_csv(ledger_path, [_row(1)])
+
+    assert storage.get_next_id(ledger_path) == 3
+
+
+def test_save_replaces_file_atomically(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    storage.save_csv(ledger_path, [_row(2)])
+
+    assert [row["id"] for row in storage.load_csv(ledger_path)] == ["2"]
+    assert not os.path.exists(storage.get_temp_path(ledger_path))
+
+
+def test_iter_records_handles_quoted_newlines(ledger_path):
+    _write_rows(
+        ledger_path, ['1,2025-06-01,Food,"a\nb, ""c""",1.00', "2,2025-06-02,A,B,2.00"]
+    )
+
+    records = list(storage.iter_records(ledger_path))
+
+    assert [record for _, record in records] == [
+        ["1", "2025-06-01", "Food", 'a\nb, "c"', "1.00"],
+        ["2", "2025-06-02", "A", "B", "2.00"],
+    ]
+    assert storage.read_records(ledger_path, [records[1][0]])[0]["id"] == "2"
+
+
+def test_compact_records(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    storage.append_csv(ledger_path, _row(2))
+    storage.append_csv(ledger_path, _row(3))
+    metadata = storage.get_metadata(ledger_path)
+
+    storage.compact_records(
+        ledger_path,
+        {1: None, 3: dict(_row(3), amount="2.50"), 7: _row(7), 8: None},
+    )
+
+    rows = storage.load_csv(ledger_path)
+    assert [row["id"] for row in rows] == ["2", "3", "7"]
+    assert rows[1]["amount"] == "2.50"
+
+    compacted_metadata = storage.get_metadata(ledger_path)
+    assert compacted_metadata["count"] == 3
+    assert compacted_metadata["epoch"] == metadata["epoch"] + 1
+    assert compacted_metadata["generation"] == metadata["generation"] + 1
+    assert storage.get_next_id(ledger_path) == 4
+
+
+def test_overwrite_record_in_place(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    storage.append_csv(ledger_path, _row(2))
+    offsets = [offset for offset, _ in storage.iter_records(ledger_path)]
+    generation = storage.get_metadata(ledger_path)["generation"]
+
+    assert storage.overwrite_record(
+        ledger_path, offsets[1], dict(_row(2), amount="99.99")
+    )
+
+    assert storage.load_csv(ledger_path)[1]["amount"] == "99.99"
+    assert storage.get_metadata(ledger_path)["generation"] == generation
+    assert storage.get_next_id(ledger_path) == 3
+
+
+def test_overwrite_record_rejects_length_change(ledger_path):
+    storage.append_csv(ledger_path, _row(1))
+    offset = next(storage.iter_records(ledger_path))[0]
+
+    assert not storage.overwrite_record(
+        ledger_path, offset, dict(_row(1), amount="100.23")
+    )
+    assert storage.load_csv(ledger_path)[0]["amount"] == "10.23"
+
+
+def _row(id):
+    return {
+        "id": str(id),
+        "date": "2025-06-01",
+        "category": "Food",
+        "description": "Wendys",
+        "amount": "10.23",
+    }
+
+
+def _write_rows(filepath, rows):
+    with open(filepath, "w", newline="") as csvfile:
+        csvfile.write(",".join(FIELD_NAMES) + "\r\n")
+        for row in rows:
+            csvfile.write(row + "\r\n")
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    filepath = str(tmp_path / "finances.csv")
+    _write_rows(filepath, [])
+
+    return filepath
@@ -0,0 +1,137 @@
+import dataclasses
+import datetime as dt
+
+import pytest
+
+import wallet_watcher.core as core
+from wallet_watcher._types import ExpenseField
+from wallet_watcher.binary import BinaryLedger
+from wallet_watcher.sqlite import SqliteLedger
+from wallet_watcher.store import ExpenseStore
+
+
+def test_store_round_trip(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+
+    assert len(store) == 3
+    assert list(store) == expense_list
+    assert store.categories == ["Food", "Gaming", "School"]
+
+
+def test_store_from_records(expense_list):
+    records = [
+        ["1", "2025-06-01", "Food", "Wendys", "10.23"],
+        ["2", "2025-06-01", "Gaming", "League", "50.00"],
+        ["3", "2025-06-03", "School", "Textbooks", "20.50"],
+    ]
+
+    store = ExpenseStore.from_records(records)
+
+    assert list(store) == expense_list
+    assert store.cents.tolist() == [1023, 5000, 2050]
+
+
+def test_store_filter_matches_list(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+    strategy = core.filter_by_range(ExpenseField.AMOUNT, 1000, 3000)
+
+    filtered = core.filter_expenses(store, strategy)
+
+    assert isinstance(filtered, ExpenseStore)
+    assert list(filtered) == core.filter_expenses(expense_list, strategy)
+
+
+def test_store_delete_matches_list(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+    strategy = core.filter_by_matching(ExpenseField.CATEGORY, "Food", "School")
+
+    kept, deleted = core.delete_expenses(store, strategy)
+    kept_list, deleted_list = core.delete_expenses(expense_list, strategy)
+
+    assert list(kept) == kept_list
+    assert list(deleted) == deleted_list
+
+
+def test_store_calculate_total(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+
+    totals = core.calculate_total(store)
+
+    assert totals == core.calculate_total(expense_list)
+    assert totals["category"]["Gaming"] == 5000
+
+
+def test_store_modify_expense_copies(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+
+    modified, changes = core.modify_expense(
+        store, 2, new_amount=100, new_category="Travel"
+    )
+
+    assert changes == {
+        "category": ("Gaming", "Travel"),
+        "amount": (5000, 100),
+    }
+    assert modified[1].amount == 100
+    assert modified[1].category == "Travel"
+    assert store[1] == expense_list[1]
+
+
+@pytest.mark.parametrize(
+    "ledger_type, name",
+    [(BinaryLedger, "finances.bin"), (SqliteLedger, "finances.db")],
+)
+def test_store_modify_expense_edits_last_duplicate(
+    tmp_path, expense_list, ledger_type, name
+):
+    expense_list.append(dataclasses.replace(expense_list[0], description="Refund"))
+    ledger = ledger_type.create(str(tmp_path / name), expense_list)
+    store = ExpenseStore.from_expenses(expense_list)
+
+    modified, _ = core.modify_expense(store, 1, new_amount=100)
+    ledger.update(1, new_amount=100)
+
+    assert store.find_id(1) == 3
+    assert list(modified) == core.modify_expense(expense_list, 1, new_amount=100)[0]
+    assert list(modified) == ledger.load()
+
+
+def test_store_modify_expense_missing_id(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+
+    with pytest.raises(ValueError):
+        core.modify_expense(store, 99, new_amount=100)
+
+
+def test_store_next_id(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+
+    assert core.add_expense(store, 100).id == 4
+
+
+def test_store_select_indices_encodes_values(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+    strategy = core.combine_filters_all(
+        core.filter_by_range(ExpenseField.AMOUNT, 1022),
+        core.filter_by_matching(ExpenseField.CATEGORY, "Food", "School", "Missing"),
+        core.filter_by_range(ExpenseField.DATE, None, dt.date(2025, 6, 1)),
+    )
+
+    assert core.select_indices(store, strategy) == [0]
+
+
+def test_store_select_indices_no_match(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+    strategy = core.filter_by_matching(ExpenseField.AMOUNT, 1022)
+
+    assert core.select_indices(store, strategy) == []
+
+
+def test_store_select_indices_callable_fallback(expense_list):
+    store = ExpenseStore.from_expenses(expense_list)
+    strategy = core.combine_filters_any(
+        core.filter_by_matching(ExpenseField.ID, 1),
+        lambda expense: expense.description == "Textbooks",
+    )
+
+    assert core.select_indices(store, strategy) == [0, 2]
@@ -0,0 +1,59 @@
+import pytest
+
+import wallet_watcher.undo as undo
+
+
+def test_push_and_pop(filepath):
+    undo.push_undo(filepath, undo.UndoEntry(undo.ADD, [{"id": "1"}]), 5)
+    undo.push_undo(filepath, undo.UndoEntry(undo.EDIT, [{"id": "1", "amount": "2"}]), 5)
+
+    assert undo.pop_undo(filepath) == undo.UndoEntry(
+        undo.EDIT, [{"id": "1", "amount": "2"}]
+    )
+    assert undo.pop_undo(filepath) == undo.UndoEntry(undo.ADD, [{"id": "1"}])
+    assert undo.pop_undo(filepath) is None
+
+
+def test_evicts_oldest_entries(filepath):
+    for id in range(1, 6):
+        undo.push_undo(filepath, undo.UndoEntry(undo.ADD, [{"id": str(id)}]), 3)
+
+    assert [entry.rows[0]["id"] for entry in undo.load_undo_log(filepath)] == [
+        "3",
+        "4",
+        "5",
+    ]
+
+
+def test_push_entries_evicts_in_one_write(filepath):
+    undo.push_undo(filepath, undo.UndoEntry(undo.ADD, [{"id": "1"}]), 3)
+    undo.push_undo_entries(
+        filepath,
+        [undo.UndoEntry(undo.ADD, [{"id": str(id)}]) for id in range(2, 5)],
+        3,
+    )
+
+    assert [entry.rows[0]["id"] for entry in undo.load_undo_log(filepath)] == [
+        "2",
+        "3",
+        "4",
+    ]
+
+
+def test_zero_depth_disables_log(filepath):
+    undo.push_undo(filepath, undo.UndoEntry(undo.ADD, [{"id": "1"}]), 0)
+
+    assert undo.pop_undo(filepath) is None
+
+
+def test_skips_corrupt_entries(filepath):
+    undo.push_undo(filepath, undo.UndoEntry(undo.ADD, [{"id": "1"}]), 5)
+    with open(undo.get_undo_path(filepath), "a") as undo_file:
+        undo_file.write("{not json\n")
+
+    assert undo.pop_undo(filepath) == undo.UndoEntry(undo.ADD, [{"id": "1"}])
+
+
+@pytest.fixture
+def filepath(tmp_path):
+    return str(tmp_path / "finances.csv")